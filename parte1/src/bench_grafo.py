@@ -0,0 +1,62 @@
+import random
+import time
+from solve import Grafo
+
+
+class GrafoLista:
+    # Versão anterior do Grafo: vizinhos em lista de (vizinho, logradouro) e
+    # teste de aresta repetida refazendo a lista de vizinhos a cada inserção.
+    def __init__(self):
+        self.adj = {}
+
+    def adicionar_aresta(self, u, v, logradouro=None):
+        if u not in self.adj:
+            self.adj[u] = []
+        if v not in self.adj:
+            self.adj[v] = []
+        if v not in [x[0] for x in self.adj[u]]:
+            self.adj[u].append((v, logradouro))
+        if u not in [x[0] for x in self.adj[v]]:
+            self.adj[v].append((u, logradouro))
+
+    def tamanho(self):
+        return sum(len(viz) for viz in self.adj.values()) // 2
+
+
+def arestas_sinteticas(num_arestas, grau_medio, seed=42):
+    # Arestas aleatórias com o grau médio fixo; ~1% delas repetidas para
+    # exercitar o teste de aresta já existente.
+    rng = random.Random(seed)
+    num_nodes = max(2, 2 * num_arestas // grau_medio)
+    nodes = [f"B{i}" for i in range(num_nodes)]
+    arestas = [(rng.choice(nodes), rng.choice(nodes), f"Rua {i}") for i in range(num_arestas)]
+    arestas += rng.sample(arestas, num_arestas // 100)
+    return arestas
+
+
+def carregar(classe, arestas):
+    start_time = time.perf_counter()
+    grafo = classe()
+    for u, v, logradouro in arestas:
+        grafo.adicionar_aresta(u, v, logradouro)
+    return time.perf_counter() - start_time, grafo.tamanho()
+
+
+def main():
+    tamanhos = [100_000, 300_000, 1_000_000]
+    graus = [4, 50]
+
+    print("Carga de arestas no Grafo (segundos).")
+    print(f"{'E':>9} {'grau':>5} | {'dict':>7} | {'lista':>7}")
+    for num_arestas in tamanhos:
+        for grau_medio in graus:
+            arestas = arestas_sinteticas(num_arestas, grau_medio)
+            novo, tamanho = carregar(Grafo, arestas)
+            antigo, tamanho_antigo = carregar(GrafoLista, arestas)
+            assert tamanho == tamanho_antigo
+
+            print(f"{num_arestas:>9} {grau_medio:>5} | {novo:>7.3f} | {antigo:>7.3f}")
+
+
+if __name__ == '__main__':
+    main()
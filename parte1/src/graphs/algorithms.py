@@ -1,26 +1,25 @@
+import argparse
 import pandas as pd
 import heapq
 import json
-import re
-
-def normalize_name(name):
-    return re.sub(r'\s+', ' ', str(name).strip().title())
+from nomes import canonizar, canonizar_coluna
+from parallel import imap_processos
 
 def load_graph(path):
     df = pd.read_csv(path)
+    origens = canonizar_coluna(df['bairro_origem'])
+    destinos = canonizar_coluna(df['bairro_destino'])
+    pesos = df['peso'].astype(float) if 'peso' in df.columns else [1.0] * len(df)
+    ruas = df['logradouro'].astype(str).str.strip() if 'logradouro' in df.columns else [''] * len(df)
+
     adj = {}
-    for _, row in df.iterrows():
-        u = normalize_name(row['bairro_origem'])
-        v = normalize_name(row['bairro_destino'])
-        w = float(row['peso']) if 'peso' in df.columns else 1.0
-        log = str(row['logradouro']).strip() if 'logradouro' in df.columns else ''
-        
+    for u, v, w, log in zip(origens, destinos, pesos, ruas):
         adj.setdefault(u, []).append((v, w, log))
         adj.setdefault(v, []).append((u, w, log))
     return adj
 
-def dijkstra(adj, src, dst):
-    src, dst = normalize_name(src), normalize_name(dst)
+def dijkstra(adj, src, dst, stats=None):
+    src, dst = canonizar(src), canonizar(dst)
     if src not in adj or dst not in adj:
         return float('inf'), [], [], []
 
@@ -30,17 +29,214 @@ def dijkstra(adj, src, dst):
     prev_weight = {n: None for n in adj}  
     dist[src] = 0
     pq = [(0, src)]
+    settled = 0
+
+    while pq:
+        d, u = heapq.heappop(pq)
+        if d > dist[u]: continue
+        settled += 1
+        if u == dst: break
+        for v, w, log in adj[u]:
+            nd = d + w
+            if nd < dist[v]:
+                dist[v], prev[v], prev_street[v], prev_weight[v] = nd, u, log, w
+                heapq.heappush(pq, (nd, v))
+
+    if stats is not None:
+        stats['settled'] = settled
+    if dist[dst] == float('inf'):
+        return float('inf'), [], [], []
+
+    path, streets, weights, cur = [], [], [], dst
+    while cur:
+        path.append(cur)
+        if prev_street[cur]:
+            streets.append(prev_street[cur])
+            weights.append(prev_weight[cur])
+        cur = prev[cur]
+    path.reverse()
+    streets.reverse()
+    weights.reverse()
+    return dist[dst], path, streets, weights
+
+def _caminho_ate(prev, cur):
+    # prev[v] = (u, rua, peso) da aresta que chegou em v; devolve o trecho
+    # da raiz da busca até cur, com a mesma regra do dijkstra para ruas vazias.
+    path, streets, weights = [cur], [], []
+    while prev.get(cur):
+        cur, log, w = prev[cur]
+        path.append(cur)
+        if log:
+            streets.append(log)
+            weights.append(w)
+    path.reverse()
+    streets.reverse()
+    weights.reverse()
+    return path, streets, weights
+
+def dijkstra_bidirecional(adj, src, dst, adj_reverso=None, stats=None):
+    # Uma busca sai da origem e outra do destino (sobre adj_reverso; o grafo
+    # de bairros é não direcionado, então por padrão é o próprio adj). Para
+    # quando a soma dos topos das duas filas não pode mais melhorar a melhor
+    # ligação encontrada entre elas.
+    src, dst = canonizar(src), canonizar(dst)
+    if src not in adj or dst not in adj:
+        return float('inf'), [], [], []
+    if adj_reverso is None:
+        adj_reverso = adj
+
+    dist = [{src: 0}, {dst: 0}]
+    prev = [{src: None}, {dst: None}]
+    settled = [set(), set()]
+    pq = [[(0, src)], [(0, dst)]]
+    grafos = [adj, adj_reverso]
+
+    melhor, meio = (0, src) if src == dst else (float('inf'), None)
+
+    while pq[0] and pq[1]:
+        if pq[0][0][0] + pq[1][0][0] >= melhor:
+            break
+        lado = 0 if pq[0][0][0] <= pq[1][0][0] else 1
+        d, u = heapq.heappop(pq[lado])
+        if u in settled[lado]: continue
+        settled[lado].add(u)
+
+        dist_lado, dist_outro = dist[lado], dist[1 - lado]
+        for v, w, log in grafos[lado][u]:
+            nd = d + w
+            if nd < dist_lado.get(v, float('inf')):
+                dist_lado[v] = nd
+                prev[lado][v] = (u, log, w)
+                heapq.heappush(pq[lado], (nd, v))
+            if v in dist_outro and dist_lado[v] + dist_outro[v] < melhor:
+                melhor, meio = dist_lado[v] + dist_outro[v], v
+
+    if stats is not None:
+        stats['settled'] = len(settled[0]) + len(settled[1])
+    if meio is None:
+        return float('inf'), [], [], []
+
+    # O custo é somado na ordem do caminho, como no dijkstra, para dar o
+    # mesmo float que ele daria para o mesmo caminho.
+    custo, cur = dist[0][meio], meio
+    while prev[1].get(cur):
+        cur, _, w = prev[1][cur]
+        custo += w
+
+    path, streets, weights = _caminho_ate(prev[0], meio)
+    volta, ruas_volta, pesos_volta = _caminho_ate(prev[1], meio)
+    path += volta[-2::-1]
+    streets += ruas_volta[::-1]
+    weights += pesos_volta[::-1]
+    return custo, path, streets, weights
 
+def heuristica_euclidiana(coordenadas, fator=1.0):
+    # coordenadas: {bairro: (x, y)}. A estimativa é a distância em linha reta
+    # vezes fator; só é admissível se nenhuma rua for mais curta que isso.
+    # Bairros sem coordenada recebem 0, o que mantém a heurística admissível.
+    def h(u, dst):
+        if u not in coordenadas or dst not in coordenadas:
+            return 0
+        (x1, y1), (x2, y2) = coordenadas[u], coordenadas[dst]
+        return fator * ((x1 - x2) ** 2 + (y1 - y2) ** 2) ** 0.5
+    return h
+
+def distancias(adj, src):
+    dist = {src: 0}
+    pq = [(0, src)]
     while pq:
         d, u = heapq.heappop(pq)
+        if d > dist[u]: continue
+        for v, w, _ in adj[u]:
+            nd = d + w
+            if nd < dist.get(v, float('inf')):
+                dist[v] = nd
+                heapq.heappush(pq, (nd, v))
+    return dist
+
+def escolher_marcos(adj, quantidade, inicio=None):
+    # Cada marco novo é o bairro mais distante dos marcos já escolhidos.
+    atual = inicio if inicio is not None else next(iter(adj))
+    marcos, mais_perto = [], {}
+    for _ in range(min(quantidade, len(adj))):
+        dist = distancias(adj, atual)
+        for n in adj:
+            mais_perto[n] = min(mais_perto.get(n, float('inf')), dist.get(n, float('inf')))
+        atual = max((n for n in adj if mais_perto[n] != float('inf')), key=lambda n: mais_perto[n])
+        if mais_perto[atual] == 0:
+            break
+        marcos.append(atual)
+    return marcos
+
+def heuristica_marcos(adj, marcos):
+    # Sem coordenadas dos bairros: pela desigualdade triangular,
+    # |d(L, dst) - d(L, u)| nunca passa do custo real de u até dst, para
+    # qualquer marco L (grafo não direcionado).
+    tabelas = [distancias(adj, marco) for marco in marcos]
+    def h(u, dst):
+        melhor = 0
+        for dist in tabelas:
+            if u in dist and dst in dist:
+                melhor = max(melhor, abs(dist[dst] - dist[u]))
+        return melhor
+    return h
+
+def a_estrela(adj, src, dst, heuristica=None, stats=None):
+    # heuristica(u, dst) deve ser admissível e consistente; sem ela a busca
+    # é o próprio Dijkstra.
+    src, dst = canonizar(src), canonizar(dst)
+    if src not in adj or dst not in adj:
+        return float('inf'), [], [], []
+    if heuristica is None:
+        heuristica = lambda u, dst: 0
+
+    dist = {src: 0}
+    prev = {src: None}
+    settled = set()
+    pq = [(heuristica(src, dst), src)]
+
+    while pq:
+        _, u = heapq.heappop(pq)
+        if u in settled: continue
+        settled.add(u)
         if u == dst: break
+        for v, w, log in adj[u]:
+            nd = dist[u] + w
+            if nd < dist.get(v, float('inf')):
+                dist[v] = nd
+                prev[v] = (u, log, w)
+                heapq.heappush(pq, (nd + heuristica(v, dst), v))
+
+    if stats is not None:
+        stats['settled'] = len(settled)
+    if dst not in dist:
+        return float('inf'), [], [], []
+
+    path, streets, weights = _caminho_ate(prev, dst)
+    return dist[dst], path, streets, weights
+
+def dijkstra_arvore(adj, src):
+    # Mesma busca do dijkstra, mas sem parar em um destino: devolve a árvore
+    # de caminhos mínimos de src para todos os bairros.
+    dist = {n: float('inf') for n in adj}
+    prev = {n: None for n in adj}
+    prev_street = {n: None for n in adj}
+    prev_weight = {n: None for n in adj}
+    dist[src] = 0
+    pq = [(0, src)]
+
+    while pq:
+        d, u = heapq.heappop(pq)
         if d > dist[u]: continue
         for v, w, log in adj[u]:
             nd = d + w
             if nd < dist[v]:
                 dist[v], prev[v], prev_street[v], prev_weight[v] = nd, u, log, w
                 heapq.heappush(pq, (nd, v))
+    return dist, prev, prev_street, prev_weight
 
+def caminho_da_origem(arvore, dst):
+    dist, prev, prev_street, prev_weight = arvore
     if dist[dst] == float('inf'):
         return float('inf'), [], [], []
 
@@ -56,21 +252,92 @@ def dijkstra(adj, src, dst):
     weights.reverse()
     return dist[dst], path, streets, weights
 
-def main():
-    adj = load_graph('../../data/adjacencias_bairros.csv')
+def caminho_ate_o_destino(arvore, src):
+    # Árvore montada a partir do destino sobre o grafo reverso: prev aponta
+    # para o próximo bairro do caminho. O custo é somado na ordem do caminho,
+    # como no dijkstra.
+    dist, prev, prev_street, prev_weight = arvore
+    if dist[src] == float('inf'):
+        return float('inf'), [], [], []
+
+    cost, path, streets, weights, cur = 0, [src], [], [], src
+    while prev[cur]:
+        cost += prev_weight[cur]
+        if prev_street[cur]:
+            streets.append(prev_street[cur])
+            weights.append(prev_weight[cur])
+        cur = prev[cur]
+        path.append(cur)
+    return cost, path, streets, weights
+
+def _caminhos_do_grupo(dados, grupo):
+    # Uma árvore para a raiz do grupo e os caminhos de todos os pares dela.
+    grafo, por_origem = dados
+    raiz, outros = grupo
+    arvore = dijkstra_arvore(grafo, raiz)
+    if por_origem:
+        return [((raiz, dst), caminho_da_origem(arvore, dst)) for dst in outros]
+    return [((src, raiz), caminho_ate_o_destino(arvore, src)) for src in outros]
+
+def matriz_distancias(adj, pares, adj_reverso=None, processos=None):
+    # Responde uma lista de pares (origem, destino) com uma busca por
+    # bairro distinto em vez de uma por par: agrupa pelas origens, ou pelos
+    # destinos (busca no grafo reverso; o de bairros é não direcionado)
+    # quando há menos destinos distintos. Com processos > 1 os grupos são
+    # divididos entre processos; a tabela sai igual.
+    pares = [(canonizar(src), canonizar(dst)) for src, dst in pares]
+    validos = [(src, dst) for src, dst in pares if src in adj and dst in adj]
+    tabela = {par: (float('inf'), [], [], []) for par in pares}
+
+    origens = {}
+    destinos = {}
+    for src, dst in validos:
+        origens.setdefault(src, {})[dst] = None
+        destinos.setdefault(dst, {})[src] = None
+
+    if len(origens) <= len(destinos):
+        dados, grupos = (adj, True), origens
+    else:
+        dados, grupos = (adj if adj_reverso is None else adj_reverso, False), destinos
+
+    grupos = [(raiz, list(outros)) for raiz, outros in grupos.items()]
+    for caminhos in imap_processos(_caminhos_do_grupo, dados, grupos, processos):
+        tabela.update(caminhos)
+    return tabela
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--processos', type=int, default=None,
+                        help='número de processos para as buscas do lote de endereços')
+    parser.add_argument('--ch', action='store_true',
+                        help='responde as consultas com a hierarquia de contração '
+                             '(construída e salva na primeira execução)')
+    args = parser.parse_args(argv)
+
+    csv_path = '../../data/adjacencias_bairros.csv'
+    adj = load_graph(csv_path)
+    consultar = lambda src, dst: dijkstra(adj, src, dst)
+    if args.ch:
+        from ch import carregar_ou_construir
+        consultar = carregar_ou_construir(csv_path).query
+
     df = pd.read_csv('../../data/enderecos.csv')
-    results = []
+    pares = list(zip(canonizar_coluna(df['bairro_origem']), canonizar_coluna(df['bairro_destino'])))
+    if args.ch:
+        tabela = {par: consultar(*par) for par in dict.fromkeys(pares)}
+    else:
+        tabela = matriz_distancias(adj, pares, processos=args.processos)
 
-    for _, r in df.iterrows():
-        bx, by = normalize_name(r['bairro_origem']), normalize_name(r['bairro_destino'])
-        cost, path, streets, weights = dijkstra(adj, bx, by)
+    results = []
+    for bx, by in pares:
+        cost, path, streets, weights = tabela[(bx, by)]
         cost_fmt = round(cost, 2) if cost != float('inf') else 'INF'
         results.append([bx, by, cost_fmt, '->'.join(path), '->'.join(streets)])
 
     out_df = pd.DataFrame(results, columns=['bairro_X','bairro_Y','custo','caminho','ruas'])
     out_df.to_csv('../../out/distancias_enderecos.csv', index=False)
 
-    cost, path, streets, weights = dijkstra(adj, 'Nova Descoberta', 'Boa Viagem')
+    cost, path, streets, weights = consultar('Nova Descoberta', 'Boa Viagem')
     with open('../../out/percurso_nova_descoberta_setubal.json','w',encoding='utf-8') as f:
         json.dump({
             'bairro_X': 'Nova Descoberta',
@@ -0,0 +1,57 @@
+import os
+import random
+import tempfile
+import time
+from algorithms import dijkstra, load_graph
+from bench_point_to_point import cidade_em_grade
+from ch import ContractionHierarchy
+
+
+def medir_consultas(consultar, consultas):
+    start_time = time.perf_counter()
+    for src, dst in consultas:
+        consultar(src, dst)
+    return (time.perf_counter() - start_time) / len(consultas) * 1e6
+
+
+def comparar(nome, adj, consultas):
+    start_time = time.perf_counter()
+    ch = ContractionHierarchy.build(adj)
+    construcao = time.perf_counter() - start_time
+
+    with tempfile.TemporaryDirectory() as pasta:
+        path = os.path.join(pasta, 'grafo.ch.json')
+        ch.save(path)
+        tamanho_kb = os.path.getsize(path) / 1024
+        start_time = time.perf_counter()
+        ch = ContractionHierarchy.load(path)
+        carga = time.perf_counter() - start_time
+
+    # Primeira passada com o cache de buscas vazio; a segunda mostra o
+    # regime de um lote grande, em que as pontas se repetem.
+    fria = medir_consultas(ch.query, consultas)
+    quente = medir_consultas(ch.query, consultas)
+    for src, dst in consultas:
+        assert abs(ch.query(src, dst)[0] - dijkstra(adj, src, dst)[0]) < 1e-9
+
+    atalhos = sum(1 for _, _, via in ch.arestas.values() if via is not None)
+    print(f"\n{nome}: {len(adj)} bairros, {len(ch.arestas)} arestas na hierarquia ({atalhos} atalhos)")
+    print(f"  construção: {construcao:.2f}s, arquivo: {tamanho_kb:.0f} KB, carga: {carga * 1000:.1f} ms")
+    print(f"  dijkstra: {medir_consultas(lambda s, t: dijkstra(adj, s, t), consultas):>9.1f} µs/consulta")
+    print(f"  CH:       {fria:>9.1f} µs/consulta (cache vazio), {quente:.1f} µs/consulta (cache cheio)")
+
+
+def main():
+    adj = load_graph('../../data/adjacencias_bairros.csv')
+    nos = sorted(adj)
+    comparar("Bairros do Recife (todos os pares)", adj, [(s, t) for s in nos for t in nos])
+
+    rng = random.Random(7)
+    for lado in (30, 60):
+        adj, _ = cidade_em_grade(lado)
+        nos = list(adj)
+        comparar(f"Grade {lado}x{lado}", adj, [(rng.choice(nos), rng.choice(nos)) for _ in range(200)])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+import random
+import time
+from algorithms import dijkstra, load_graph, matriz_distancias
+
+
+def enderecos_sinteticos(nos, linhas, seed=42):
+    rng = random.Random(seed)
+    return [(rng.choice(nos), rng.choice(nos)) for _ in range(linhas)]
+
+
+def main():
+    adj = load_graph('../../data/adjacencias_bairros.csv')
+    nos = sorted(adj)
+
+    print(f"Lotes de endereços sobre {len(nos)} bairros (segundos).")
+    print(f"{'linhas':>7} | {'por linha':>9} | {'matriz':>7} | {'buscas':>6}")
+    for linhas in (100, 1_000, 10_000, 100_000):
+        pares = enderecos_sinteticos(nos, linhas)
+
+        start_time = time.perf_counter()
+        por_linha = [dijkstra(adj, src, dst) for src, dst in pares]
+        tempo_por_linha = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        tabela = matriz_distancias(adj, pares)
+        tempo_matriz = time.perf_counter() - start_time
+
+        assert all(tabela[par][0] == r[0] for par, r in zip(pares, por_linha))
+        buscas = min(len({src for src, _ in pares}), len({dst for _, dst in pares}))
+        print(f"{linhas:>7} | {tempo_por_linha:>9.3f} | {tempo_matriz:>7.3f} | {buscas:>6}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+import random
+import time
+from algorithms import (
+    a_estrela, dijkstra, dijkstra_bidirecional, escolher_marcos, heuristica_euclidiana,
+    heuristica_marcos, load_graph,
+)
+
+
+def cidade_em_grade(lado, seed=42):
+    # Cruzamentos em grade com coordenadas; cada rua custa entre 1 e 1,5x a
+    # distância em linha reta, então a heurística euclidiana é admissível.
+    rng = random.Random(seed)
+    adj, coordenadas = {}, {}
+    for i in range(lado):
+        for j in range(lado):
+            u = f"B{i}-{j}"
+            coordenadas[u] = (i, j)
+            adj.setdefault(u, [])
+            for v in ([f"B{i}-{j + 1}"] if j + 1 < lado else []) + ([f"B{i + 1}-{j}"] if i + 1 < lado else []):
+                w = 1 + rng.random() / 2
+                log = f"Rua {u}/{v}"
+                adj[u].append((v, w, log))
+                adj.setdefault(v, []).append((u, w, log))
+    return adj, coordenadas
+
+
+def comparar(nome, adj, consultas, buscas):
+    print(f"\n{nome}: {len(adj)} bairros, {len(consultas)} consultas")
+    print(f"{'busca':>14} | {'nós fechados':>12} | {'tempo (ms)':>10}")
+    referencia = [dijkstra(adj, src, dst)[0] for src, dst in consultas]
+
+    for rotulo, busca in buscas:
+        fechados = 0
+        start_time = time.perf_counter()
+        for (src, dst), custo in zip(consultas, referencia):
+            stats = {}
+            resultado = busca(adj, src, dst, stats)
+            assert abs(resultado[0] - custo) < 1e-9
+            fechados += stats['settled']
+        elapsed = time.perf_counter() - start_time
+        print(f"{rotulo:>14} | {fechados / len(consultas):>12.1f} | {elapsed / len(consultas) * 1000:>10.3f}")
+
+
+def main():
+    rng = random.Random(7)
+
+    adj, coordenadas = cidade_em_grade(200)
+    nos = list(adj)
+    consultas = [(rng.choice(nos), rng.choice(nos)) for _ in range(50)]
+    h = heuristica_euclidiana(coordenadas)
+    marcos = heuristica_marcos(adj, escolher_marcos(adj, 8))
+    comparar("Grade 200x200", adj, consultas, [
+        ('dijkstra', dijkstra),
+        ('bidirecional', lambda adj, s, t, stats: dijkstra_bidirecional(adj, s, t, stats=stats)),
+        ('A* euclidiana', lambda adj, s, t, stats: a_estrela(adj, s, t, h, stats)),
+        ('A* marcos', lambda adj, s, t, stats: a_estrela(adj, s, t, marcos, stats)),
+    ])
+
+    # Não há tabela de coordenadas dos bairros, então no grafo real o A*
+    # usa só a heurística de marcos.
+    adj = load_graph('../../data/adjacencias_bairros.csv')
+    nos = sorted(adj)
+    consultas = [('Nova Descoberta', 'Boa Viagem')] + [(src, dst) for src in nos for dst in nos if src != dst]
+    marcos = heuristica_marcos(adj, escolher_marcos(adj, 4))
+    comparar("Bairros do Recife (todos os pares)", adj, consultas, [
+        ('dijkstra', dijkstra),
+        ('bidirecional', lambda adj, s, t, stats: dijkstra_bidirecional(adj, s, t, stats=stats)),
+        ('A* marcos', lambda adj, s, t, stats: a_estrela(adj, s, t, marcos, stats)),
+    ])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+import random
+import time
+from triangles import metricas_ego
+
+
+def densidade_por_pares(adj):
+    # Versão anterior do viz.py: testa cada par de vizinhos de cada nó.
+    densidade = {}
+    for bairro, vizinhos in adj.items():
+        k = len(vizinhos)
+        if k <= 1:
+            densidade[bairro] = 0
+        else:
+            links = sum(1 for u in vizinhos for v in vizinhos if u != v and v in adj.get(u, [])) / 2
+            densidade[bairro] = links / (k * (k - 1) / 2)
+    return densidade
+
+
+class GrafoOriginal:
+    # Grafo do solve.py antes do triangles.py, copiado sem alterações.
+    def __init__(self):
+        self.adj = {}
+
+    def adicionar_aresta(self, u, v, logradouro=None):
+        if u not in self.adj:
+            self.adj[u] = []
+        if v not in self.adj:
+            self.adj[v] = []
+        if v not in [x[0] for x in self.adj[u]]:
+            self.adj[u].append((v, logradouro))
+        if u not in [x[0] for x in self.adj[v]]:
+            self.adj[v].append((u, logradouro))
+
+    def vizinhos(self, u):
+        return [v for v, _ in self.adj.get(u, [])]
+
+    def grau(self, u):
+        return len(self.adj.get(u, []))
+
+    def ordem(self):
+        return len(self.adj)
+
+    def tamanho(self):
+        return sum(len(viz) for viz in self.adj.values()) // 2
+
+    def densidade(self):
+        V = self.ordem()
+        E = self.tamanho()
+        if V < 2:
+            return 0
+        return (2 * E) / (V * (V - 1))
+
+    def subgrafo(self, vertices):
+        sg = GrafoOriginal()
+        vertices_set = set(vertices)
+        for u in vertices_set:
+            if u in self.adj:
+                for v, logradouro in self.adj[u]:
+                    if v in vertices_set and u < v:
+                        sg.adicionar_aresta(u, v, logradouro)
+        return sg
+
+
+def grafo_original(adj):
+    grafo = GrafoOriginal()
+    for u, vizinhos in adj.items():
+        grafo.adj.setdefault(u, [])
+        for v in vizinhos:
+            grafo.adicionar_aresta(u, v)
+    return grafo
+
+
+def ego_por_subgrafo(grafo):
+    # Laço do solve.py original: um subgrafo ego montado por bairro.
+    resultados_ego = []
+    for bairro in sorted(grafo.adj.keys()):
+        vizinhos = grafo.vizinhos(bairro)
+        ego_vertices = [bairro] + vizinhos
+        sg_ego = grafo.subgrafo(ego_vertices)
+
+        resultados_ego.append({
+            "bairro": bairro,
+            "grau": grafo.grau(bairro),
+            "ordem_ego": sg_ego.ordem(),
+            "tamanho_ego": sg_ego.tamanho(),
+            "densidade_ego": round(sg_ego.densidade(), 4)
+        })
+    return resultados_ego
+
+
+def cidade_sintetica(num_nodes, centros=0, seed=42):
+    # Quadras em grade (cada bairro faz fronteira com até 4 vizinhos) com
+    # algumas diagonais, que é o que forma triângulos num mapa de bairros.
+    # Os "centros" são nós ligados a ~500 quadras da própria região, onde
+    # o grau alto faz diferença.
+    rng = random.Random(seed)
+    lado = int(num_nodes ** 0.5)
+    adj = {}
+
+    def ligar(u, v):
+        adj.setdefault(u, set()).add(v)
+        adj.setdefault(v, set()).add(u)
+
+    for i in range(lado):
+        for j in range(lado):
+            u = f"B{i}-{j}"
+            adj.setdefault(u, set())
+            if j + 1 < lado:
+                ligar(u, f"B{i}-{j + 1}")
+            if i + 1 < lado:
+                ligar(u, f"B{i + 1}-{j}")
+            if i + 1 < lado and j + 1 < lado and rng.random() < 0.5:
+                ligar(u, f"B{i + 1}-{j + 1}")
+
+    for c in range(centros):
+        i0, j0 = rng.randrange(lado - 30), rng.randrange(lado - 30)
+        for _ in range(500):
+            ligar(f"C{c}", f"B{i0 + rng.randrange(30)}-{j0 + rng.randrange(30)}")
+    return adj
+
+
+def medir(func, adj, repeticoes=3):
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        start_time = time.perf_counter()
+        func(adj)
+        melhor = min(melhor, time.perf_counter() - start_time)
+    return melhor
+
+
+def main():
+    casos = [(1_000, 0), (10_000, 0), (100_000, 0), (100_000, 100)]
+
+    print("Métricas ego para todos os nós (melhor de 3, em segundos).")
+    print("pares: densidade do viz.py original; subgrafos: laço ego do solve.py original.")
+    print(f"{'V':>7} {'E':>7} {'grau máx':>8} | {'triângulos':>10} | {'pares':>8} {'subgrafos':>10}")
+    for num_nodes, centros in casos:
+        adj = cidade_sintetica(num_nodes, centros)
+        arestas = sum(len(v) for v in adj.values()) // 2
+        grau_max = max(len(v) for v in adj.values())
+
+        novo = medir(metricas_ego, adj)
+        pares = medir(densidade_por_pares, adj)
+        grafo = grafo_original(adj)
+        subgrafos = medir(ego_por_subgrafo, grafo)
+
+        metricas = metricas_ego(adj)
+        for r in ego_por_subgrafo(grafo):
+            m = metricas[r['bairro']]
+            assert (m['ordem_ego'], m['tamanho_ego']) == (r['ordem_ego'], r['tamanho_ego'])
+            assert round(m['densidade_ego'], 4) == r['densidade_ego']
+
+        print(f"{len(adj):>7} {arestas:>7} {grau_max:>8} | {novo:>10.3f} | {pares:>8.3f} {subgrafos:>10.3f}")
+
+
+if __name__ == '__main__':
+    main()
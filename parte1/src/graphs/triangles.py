@@ -0,0 +1,69 @@
+def adjacencia_sem_lacos(adj):
+    # Aceita vizinhos como set, lista de nomes ou lista de (vizinho, logradouro),
+    # que são os formatos usados pelo viz.py e pelo Grafo do solve.py. Um set
+    # sem laço é usado como está (só para leitura), sem cópia.
+    vizinhos = {}
+    for u, lista in adj.items():
+        if lista and isinstance(next(iter(lista)), tuple):
+            conjunto = {v[0] for v in lista}
+            conjunto.discard(u)
+        elif isinstance(lista, (set, frozenset)) and u not in lista:
+            conjunto = lista
+        else:
+            conjunto = set(lista)
+            conjunto.discard(u)
+        vizinhos[u] = conjunto
+    return vizinhos
+
+
+def contar_triangulos(adj):
+    # Cada aresta é orientada do nó de menor grau para o de maior grau (no
+    # empate vale a ordem de inserção), então cada nó só guarda os vizinhos
+    # "acima" dele e cada triângulo u-v-w é encontrado uma única vez, a
+    # partir do seu nó mais baixo u. Em mapas de bairros quase todo nó tem
+    # poucos vizinhos acima, então o laço testa pertinência em vez de montar
+    # um set de interseção por aresta.
+    vizinhos = adjacencia_sem_lacos(adj)
+    posicao = {u: i for i, u in enumerate(sorted(vizinhos, key=lambda u: len(vizinhos[u])))}
+
+    acima = {}
+    for u, viz in vizinhos.items():
+        pu = posicao[u]
+        acima[u] = [v for v in viz if posicao[v] > pu]
+
+    triangulos = dict.fromkeys(vizinhos, 0)
+    for u, sucessores in acima.items():
+        if len(sucessores) < 2:
+            continue
+        conjunto = set(sucessores)
+        em_u = 0
+        for v in sucessores:
+            for w in acima[v]:
+                if w in conjunto:
+                    em_u += 1
+                    triangulos[v] += 1
+                    triangulos[w] += 1
+        triangulos[u] += em_u
+    return triangulos, vizinhos
+
+
+def metricas_ego(adj):
+    # Tudo sai da contagem de triângulos: a rede ego de u tem os k vizinhos
+    # mais u (se k > 0), as k arestas de u e uma aresta por triângulo em u.
+    triangulos, vizinhos = contar_triangulos(adj)
+
+    metricas = {}
+    for u, t in triangulos.items():
+        k = len(vizinhos[u])
+        ordem_ego = k + 1 if k > 0 else 0
+        tamanho_ego = k + t
+        pares = k * (k - 1) / 2
+        metricas[u] = {
+            'grau': k,
+            'triangulos': t,
+            'ordem_ego': ordem_ego,
+            'tamanho_ego': tamanho_ego,
+            'densidade_ego': (2 * tamanho_ego) / (ordem_ego * (ordem_ego - 1)) if ordem_ego >= 2 else 0,
+            'clustering': t / pares if k > 1 else 0,
+        }
+    return metricas
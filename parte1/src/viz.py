@@ -1,10 +1,13 @@
 import json
+import os
 import pandas as pd
 from pyvis.network import Network
 import matplotlib.pyplot as plt
 import streamlit as st
 import streamlit.components.v1 as components
 from io import BytesIO
+from graphs.nomes import canonizar_coluna
+from graphs.triangles import metricas_ego
 
 st.set_page_config(
     page_title="Grafo Recife", 
@@ -56,47 +59,56 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-@st.cache_data
-def load_data():
-    import unicodedata, re
+ADJACENCIAS_CSV = '../data/adjacencias_bairros.csv'
+BAIRROS_CSV = '../data/bairros_unique.csv'
+PERCURSO_JSON = '../out/percurso_nova_descoberta_setubal.json'
 
-    def normalizar_nome(nome):
-        if pd.isna(nome):
-            return ''
-        nome = str(nome).strip().lower()
-        nome = re.sub(r'\s+', ' ', nome)
-        nome = unicodedata.normalize('NFKD', nome).encode('ASCII', 'ignore').decode('utf-8')
-        return nome.title()
 
-    df_adj = pd.read_csv('../data/adjacencias_bairros.csv')
-    df_info = pd.read_csv('../data/bairros_unique.csv')
+def versao_dos_dados():
+    # mtime de cada arquivo lido por load_data; muda quando algum é regerado
+    # e entra na chave de todos os caches abaixo.
+    return tuple(os.path.getmtime(path) for path in (ADJACENCIAS_CSV, BAIRROS_CSV, PERCURSO_JSON))
+
+
+@st.cache_data(max_entries=1)
+def load_data(versao):
+    df_adj = pd.read_csv(ADJACENCIAS_CSV)
+    df_info = pd.read_csv(BAIRROS_CSV)
 
     for col in ['bairro_origem', 'bairro_destino']:
-        df_adj[col] = df_adj[col].apply(normalizar_nome)
-    df_info['bairro'] = df_info['bairro'].apply(normalizar_nome)
+        df_adj[col] = canonizar_coluna(df_adj[col])
+    df_info['bairro'] = canonizar_coluna(df_info['bairro'])
 
     adj = {}
-    for _, row in df_adj.iterrows():
-        u = normalizar_nome(row['bairro_origem'])
-        v = normalizar_nome(row['bairro_destino'])
+    for u, v in zip(df_adj['bairro_origem'], df_adj['bairro_destino']):
         adj.setdefault(u, set()).add(v)
         adj.setdefault(v, set()).add(u)
 
-    densidade = {}
+    # Fração dos pares de vizinhos ligados entre si, tirada de uma única
+    # contagem de triângulos do grafo inteiro.
+    ego = metricas_ego(adj)
+    densidade = {bairro: ego[bairro]['clustering'] for bairro in adj}
+
+    # Índice por bairro lido por todas as visualizações, em vez de filtrar
+    # o df_info (O(N) por consulta) a cada nó desenhado.
+    microrregioes = df_info.drop_duplicates('bairro').set_index('bairro')['microrregiao'].to_dict()
+
+    atributos = {}
     for bairro, vizinhos in adj.items():
-        k = len(vizinhos)
-        if k <= 1:
-            densidade[bairro] = 0
-        else:
-            links = sum(1 for u in vizinhos for v in vizinhos if u != v and v in adj.get(u, [])) / 2
-            densidade[bairro] = links / (k * (k - 1) / 2)
-
-    with open('../out/percurso_nova_descoberta_setubal.json', encoding='utf-8') as f:
+        atributos[bairro] = {
+            'microrregiao': microrregioes.get(bairro, "N/A"),
+            'grau': len(vizinhos),
+            'densidade_ego': densidade[bairro],
+            'vizinhos': sorted(vizinhos),
+        }
+
+    with open(PERCURSO_JSON, encoding='utf-8') as f:
         percurso = json.load(f)
 
-    return df_adj, df_info, adj, densidade, percurso
+    return df_adj, df_info, adj, atributos, percurso
 
-df_adj, df_info, adj, densidade, percurso = load_data()
+versao_dados = versao_dos_dados()
+df_adj, df_info, adj, atributos, percurso = load_data(versao_dados)
 
 caminho = percurso['caminho']
 ruas = percurso.get('ruas', [])
@@ -105,6 +117,101 @@ pesos = percurso.get('pesos', [])
 total_bairros = len(df_info)
 total_arestas = sum(len(v) for v in adj.values()) // 2
 
+# O HTML de cada visualização depende dos dados e dos parâmetros de estilo.
+# Os dados vão com _ (o Streamlit não faz hash deles) e a versao_dados entra
+# na chave no lugar deles, como no create_pyvis_html da parte 2.
+@st.cache_data(max_entries=32)
+def html_percurso(versao, _percurso, cor_nos, cor_arestas, espessura):
+    caminho = _percurso['caminho']
+    ruas = _percurso.get('ruas', [])
+    pesos = _percurso.get('pesos', [])
+
+    net = Network(height="600px", width="100%", directed=True, bgcolor="#ffffff", font_color="#333333")
+    net.barnes_hut()
+    
+    for bairro in caminho:
+        net.add_node(bairro, label=bairro, color=cor_nos, shape="ellipse", size=25)
+    
+    for i in range(len(caminho)-1):
+        origem = caminho[i]
+        destino = caminho[i+1]
+        rua = ruas[i] if ruas and i < len(ruas) else ""
+        peso = pesos[i] if pesos and i < len(pesos) else ""
+        label = f"{rua} - {peso}" if peso else rua
+        net.add_edge(origem, destino, label=label, color=cor_arestas, width=espessura)
+
+    return net.generate_html()
+
+
+@st.cache_data(max_entries=1)
+def html_grau_dos_bairros(versao, _atributos):
+    net = Network(height="700px", width="100%", directed=False, bgcolor="#ffffff")
+    net.barnes_hut()
+
+    max_degree = max(attr['grau'] for attr in _atributos.values())
+    for bairro, attr in _atributos.items():
+        grau = attr['grau']
+        micro = attr['microrregiao']
+        dens = attr['densidade_ego']
+        tooltip = f"Bairro: {bairro}; Grau: {grau}; Microrregião: {micro}; Densidade ego: {dens:.2f}"
+
+        intensity = int(255 * (grau / max_degree))
+        color_hex = f'rgb({100 + intensity}, {150}, {200 + intensity//2})'
+
+        net.add_node(bairro, label=bairro, title=tooltip, color=color_hex, size=20 + grau)
+
+    for u, attr in _atributos.items():
+        for v in attr['vizinhos']:
+            if u < v:
+                net.add_edge(u, v, color="rgba(100,100,100,0.3)")
+
+    return net.generate_html()
+
+
+@st.cache_data(max_entries=1)
+def html_top10(versao, _atributos, top10_bairros):
+    top_bairros = set(top10_bairros)
+    net_top10 = Network(height="600px", width="100%", directed=False, bgcolor="#ffffff")
+    
+    for bairro in top_bairros:
+        grau = _atributos[bairro]['grau']
+        net_top10.add_node(bairro, label=bairro, color="#FF6B6B", size=30, 
+                         title=f"Grau: {grau}")
+    
+    for u in top_bairros:
+        for v in _atributos[u]['vizinhos']:
+            if v in top_bairros and u < v:
+                net_top10.add_edge(u, v, color="#4ECDC4", width=3)
+
+    return net_top10.generate_html()
+
+
+@st.cache_data(max_entries=64)
+def html_ego(versao, _atributos, bairro_escolhido):
+    central = _atributos[bairro_escolhido]
+    grau_central = central['grau']
+    micro_central = central['microrregiao']
+    dens_central = central['densidade_ego']
+
+    net = Network(height="600px", width="100%", directed=False, bgcolor="#ffffff")
+    net.barnes_hut()
+
+    tooltip_central = f"Bairro: {bairro_escolhido}<br>Grau: {grau_central}<br>Microrregião: {micro_central}<br>Densidade ego: {dens_central:.2f}"
+    net.add_node(bairro_escolhido, label=bairro_escolhido, title=tooltip_central, 
+                color="#FF6B6B", size=40, font={'size': 20})
+
+    for v in central['vizinhos']:
+        attr = _atributos[v]
+        grau = attr['grau']
+        micro = attr['microrregiao']
+        dens = attr['densidade_ego']
+        tooltip = f"Bairro: {v}<br>Grau: {grau}<br>Microrregião: {micro}<br>Densidade ego: {dens:.2f}"
+        net.add_node(v, label=v, title=tooltip, color="#4ECDC4", size=25)
+        net.add_edge(bairro_escolhido, v, color="gray", width=2)
+
+    return net.generate_html()
+
+
 with st.sidebar:
     
     # Informações gerais
@@ -168,22 +275,7 @@ with col2:
         with col_info3:
             st.metric("Trechos", len(ruas))
 
-        net = Network(height="600px", width="100%", directed=True, bgcolor="#ffffff", font_color="#333333")
-        net.barnes_hut()
-        
-        for bairro in caminho:
-            net.add_node(bairro, label=bairro, color=cor_nos, shape="ellipse", size=25)
-        
-        for i in range(len(caminho)-1):
-            origem = caminho[i]
-            destino = caminho[i+1]
-            rua = ruas[i] if ruas and i < len(ruas) else ""
-            peso = pesos[i] if pesos and i < len(pesos) else ""
-            label = f"{rua} - {peso}" if peso else rua
-            net.add_edge(origem, destino, label=label, color=cor_arestas, width=espessura)
-
-        html = net.generate_html()
-        components.html(html, height=600, scrolling=True)
+        components.html(html_percurso(versao_dados, percurso, cor_nos, cor_arestas, espessura), height=600, scrolling=True)
 
     elif opcao == "Grau dos bairros":
         st.markdown('<h2 class="sub-header">📊 Grau dos Bairros</h2>', unsafe_allow_html=True)
@@ -196,29 +288,7 @@ with col2:
             - **Densidade ego**: Mede a conectividade entre os vizinhos diretos
             """)
 
-        net = Network(height="700px", width="100%", directed=False, bgcolor="#ffffff")
-        net.barnes_hut()
-
-        max_degree = max(len(v) for v in adj.values())
-        for bairro, vizinhos in adj.items():
-            grau = len(vizinhos)
-            micro = df_info.loc[df_info['bairro'] == bairro, 'microrregiao'].values[0] \
-                    if bairro in df_info['bairro'].values else "N/A"
-            dens = densidade.get(bairro, 0)
-            tooltip = f"Bairro: {bairro}; Grau: {grau}; Microrregião: {micro}; Densidade ego: {dens:.2f}"
-
-            intensity = int(255 * (grau / max_degree))
-            color_hex = f'rgb({100 + intensity}, {150}, {200 + intensity//2})'
-
-            net.add_node(bairro, label=bairro, title=tooltip, color=color_hex, size=20 + grau)
-
-        for u, vizinhos in adj.items():
-            for v in vizinhos:
-                if u < v:
-                    net.add_edge(u, v, color="rgba(100,100,100,0.3)")
-
-        html = net.generate_html()
-        components.html(html, height=700, scrolling=True)
+        components.html(html_grau_dos_bairros(versao_dados, atributos), height=700, scrolling=True)
 
     elif opcao == "Top 10 bairros por grau":
         st.markdown('<h2 class="sub-header">Top 10 Bairros Mais Conectados</h2>', unsafe_allow_html=True)
@@ -231,29 +301,14 @@ with col2:
                     'Posição': i+1, 
                     'Bairro': bairro, 
                     'Grau': len(vizinhos),
-                    'Microrregião': df_info.loc[df_info['bairro'] == bairro, 'microrregiao'].values[0] 
-                    if bairro in df_info['bairro'].values else "N/A"
+                    'Microrregião': atributos[bairro]['microrregiao']
                 }
                 for i, (bairro, vizinhos) in enumerate(top10)
             ]),
             width='stretch'
         )
 
-        top_bairros = set(b for b,_ in top10)
-        net_top10 = Network(height="600px", width="100%", directed=False, bgcolor="#ffffff")
-        
-        for bairro in top_bairros:
-            grau = len(adj[bairro])
-            net_top10.add_node(bairro, label=bairro, color="#FF6B6B", size=30, 
-                             title=f"Grau: {grau}")
-        
-        for u in top_bairros:
-            for v in adj[u]:
-                if v in top_bairros and u < v:
-                    net_top10.add_edge(u, v, color="#4ECDC4", width=3)
-
-        html = net_top10.generate_html()
-        components.html(html, height=600, scrolling=True)
+        components.html(html_top10(versao_dados, atributos, tuple(b for b, _ in top10)), height=600, scrolling=True)
 
     elif opcao == "Distribuição dos graus":
         st.markdown('<h2 class="sub-header">Distribuição dos Graus</h2>', unsafe_allow_html=True)
@@ -295,12 +350,12 @@ with col2:
             bairro_escolhido = st.selectbox("Selecione um bairro:", sorted(adj.keys()))
         
         if bairro_escolhido:
-            vizinhos = adj[bairro_escolhido]
+            central = atributos[bairro_escolhido]
+            vizinhos = central['vizinhos']
             
-            grau_central = len(vizinhos)
-            micro_central = df_info.loc[df_info['bairro'] == bairro_escolhido, 'microrregiao'].values[0] \
-                            if bairro_escolhido in df_info['bairro'].values else "N/A"
-            dens_central = densidade.get(bairro_escolhido, 0)
+            grau_central = central['grau']
+            micro_central = central['microrregiao']
+            dens_central = central['densidade_ego']
             
             col_stats = st.columns(4)
             with col_stats[0]:
@@ -312,21 +367,4 @@ with col2:
             with col_stats[3]:
                 st.metric("Vizinhos Diretos", len(vizinhos))
 
-            net = Network(height="600px", width="100%", directed=False, bgcolor="#ffffff")
-            net.barnes_hut()
-
-            tooltip_central = f"Bairro: {bairro_escolhido}<br>Grau: {grau_central}<br>Microrregião: {micro_central}<br>Densidade ego: {dens_central:.2f}"
-            net.add_node(bairro_escolhido, label=bairro_escolhido, title=tooltip_central, 
-                        color="#FF6B6B", size=40, font={'size': 20})
-
-            for v in vizinhos:
-                grau = len(adj[v])
-                micro = df_info.loc[df_info['bairro'] == v, 'microrregiao'].values[0] \
-                        if v in df_info['bairro'].values else "N/A"
-                dens = densidade.get(v, 0)
-                tooltip = f"Bairro: {v}<br>Grau: {grau}<br>Microrregião: {micro}<br>Densidade ego: {dens:.2f}"
-                net.add_node(v, label=v, title=tooltip, color="#4ECDC4", size=25)
-                net.add_edge(bairro_escolhido, v, color="gray", width=2)
-
-            html = net.generate_html()
-            components.html(html, height=600, scrolling=True)
+            components.html(html_ego(versao_dados, atributos, bairro_escolhido), height=600, scrolling=True)
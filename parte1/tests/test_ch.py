@@ -0,0 +1,322 @@
+import hashlib
+import heapq
+import json
+import os
+import tempfile
+import unittest
+
+def dijkstra(adj, src, dst, stats=None):
+    if src not in adj or dst not in adj:
+        return float('inf'), [], [], []
+
+    dist = {n: float('inf') for n in adj}
+    prev = {n: None for n in adj}
+    prev_street = {n: None for n in adj}
+    prev_weight = {n: None for n in adj}  
+    dist[src] = 0
+    pq = [(0, src)]
+    settled = 0
+
+    while pq:
+        d, u = heapq.heappop(pq)
+        if d > dist[u]: continue
+        settled += 1
+        if u == dst: break
+        for v, w, log in adj[u]:
+            nd = d + w
+            if nd < dist[v]:
+                dist[v], prev[v], prev_street[v], prev_weight[v] = nd, u, log, w
+                heapq.heappush(pq, (nd, v))
+
+    if stats is not None:
+        stats['settled'] = settled
+    if dist[dst] == float('inf'):
+        return float('inf'), [], [], []
+
+    path, streets, weights, cur = [], [], [], dst
+    while cur:
+        path.append(cur)
+        if prev_street[cur]:
+            streets.append(prev_street[cur])
+            weights.append(prev_weight[cur])
+        cur = prev[cur]
+    path.reverse()
+    streets.reverse()
+    weights.reverse()
+    return dist[dst], path, streets, weights
+
+VERSAO = 1
+MAX_FECHADOS_TESTEMUNHA = 100
+MAX_BUSCAS_EM_CACHE = 4096
+
+
+def caminho_ch(csv_path):
+    base, _ = os.path.splitext(csv_path)
+    return base + '.ch.json'
+
+
+def sha256_arquivo(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for bloco in iter(lambda: f.read(1 << 20), b''):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+def arestas_simples(adj):
+    # Entre dois bairros só interessa a rua mais curta; no empate fica a
+    # primeira da lista, que é a que o dijkstra escolheria.
+    arestas = {}
+    for u, lista in adj.items():
+        for v, w, log in lista:
+            if v != u and ((u, v) not in arestas or w < arestas[(u, v)][0]):
+                arestas[(u, v)] = (w, log)
+    return arestas
+
+
+def _testemunhas(viz, origem, evitar, limite, max_fechados=MAX_FECHADOS_TESTEMUNHA):
+    # Dijkstra local que não passa pelo nó sendo contraído e desiste de
+    # qualquer caminho mais caro que limite. Parar cedo (max_fechados) só
+    # pode criar atalhos desnecessários, nunca deixar faltar um.
+    dist = {origem: 0}
+    pq = [(0, origem)]
+    fechados = 0
+    while pq:
+        d, u = heapq.heappop(pq)
+        if d > dist[u]: continue
+        fechados += 1
+        if d > limite or fechados > max_fechados: break
+        for v, w in viz[u].items():
+            nd = d + w
+            if v != evitar and nd < dist.get(v, float('inf')):
+                dist[v] = nd
+                heapq.heappush(pq, (nd, v))
+    return dist
+
+
+def _atalhos(viz, v):
+    # Um atalho u-x é necessário quando u-v-x é o único caminho mínimo entre
+    # u e x no que ainda não foi contraído.
+    vizinhos = list(viz[v].items())
+    atalhos = []
+    for i, (u, wu) in enumerate(vizinhos):
+        alvos = [(x, wu + wx) for x, wx in vizinhos[i + 1:]]
+        if not alvos:
+            continue
+        dist = _testemunhas(viz, u, v, max(via for _, via in alvos))
+        atalhos.extend((u, x, via) for x, via in alvos if dist.get(x, float('inf')) > via)
+    return atalhos
+
+
+class ContractionHierarchy:
+    # Hierarquia de contração do grafo de bairros (não direcionado). Cada nó
+    # guarda só as arestas para nós contraídos depois dele; uma consulta é
+    # uma busca "para cima" a partir de cada ponta. Atalhos lembram o nó do
+    # meio, e são desfeitos recursivamente para devolver as ruas originais.
+    def __init__(self, ordem, arestas, sha256=None):
+        self.ordem = ordem
+        self.posicao = {u: i for i, u in enumerate(ordem)}
+        self.arestas = arestas
+        self.sha256 = sha256
+
+        self.acima = {u: [] for u in ordem}
+        for (baixo, alto), (w, _, _) in arestas.items():
+            self.acima[baixo].append((alto, w))
+
+        # A busca para cima de um bairro não depende da outra ponta, então
+        # em lotes de consultas ela é feita uma vez por bairro.
+        self.buscas = {}
+
+    @classmethod
+    def build(cls, adj, sha256=None):
+        originais = arestas_simples(adj)
+        viz = {u: {} for u in adj}
+        for (u, v), (w, _) in originais.items():
+            viz[u][v] = w
+        meio = {}
+        contraidos_em_volta = dict.fromkeys(adj, 0)
+        nivel = dict.fromkeys(adj, 0)
+
+        def prioridade(v):
+            # Diferença de arestas, vizinhos já contraídos e nível na
+            # hierarquia: espalha as contrações pelo grafo e mantém baixas
+            # as buscas "para cima" das consultas.
+            return len(_atalhos(viz, v)) - len(viz[v]) + contraidos_em_volta[v] + nivel[v]
+
+        # Fila com atualização preguiçosa: a prioridade de um nó só é
+        # recalculada quando ele chega ao topo.
+        pq = [(prioridade(v), v) for v in adj]
+        heapq.heapify(pq)
+        ordem, arestas = [], {}
+        while pq:
+            _, v = heapq.heappop(pq)
+            nova = prioridade(v)
+            if pq and nova > pq[0][0]:
+                heapq.heappush(pq, (nova, v))
+                continue
+
+            for u, x, w in _atalhos(viz, v):
+                if w < viz[u].get(x, float('inf')):
+                    viz[u][x] = viz[x][u] = w
+                    meio[(u, x)] = meio[(x, u)] = v
+
+            ordem.append(v)
+            for u, w in viz.pop(v).items():
+                del viz[u][v]
+                contraidos_em_volta[u] += 1
+                nivel[u] = max(nivel[u], nivel[v] + 1)
+                via = meio.get((v, u))
+                rua = originais[(v, u)][1] if via is None else None
+                arestas[(v, u)] = (w, rua, via)
+
+        return cls(ordem, arestas, sha256)
+
+    def save(self, path):
+        dados = {
+            'versao': VERSAO,
+            'sha256': self.sha256,
+            'ordem': self.ordem,
+            'arestas': [[baixo, alto, w, rua, via] for (baixo, alto), (w, rua, via) in self.arestas.items()],
+        }
+        # Mesmo esquema do snapshot da parte 2: nunca deixa um arquivo pela metade.
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(dados, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding='utf-8') as f:
+            dados = json.load(f)
+        if dados.get('versao') != VERSAO:
+            raise ValueError(f"'{path}' foi gerado por outra versão do ch.py")
+        arestas = {(baixo, alto): (w, rua, via) for baixo, alto, w, rua, via in dados['arestas']}
+        return cls(dados['ordem'], arestas, dados['sha256'])
+
+    def _busca_em_cache(self, origem):
+        if origem not in self.buscas:
+            if len(self.buscas) >= MAX_BUSCAS_EM_CACHE:
+                self.buscas.clear()
+            self.buscas[origem] = self._busca_para_cima(origem)
+        return self.buscas[origem]
+
+    def _busca_para_cima(self, origem):
+        # Busca só por arestas para nós mais altos. Um nó é "parado" (não
+        # expande) quando algum vizinho mais alto já alcançado chega nele
+        # mais barato: o caminho mínimo até ele não é o desta busca.
+        dist = {origem: 0}
+        prev = {origem: None}
+        pq = [(0, origem)]
+        while pq:
+            d, u = heapq.heappop(pq)
+            if d > dist[u]: continue
+            acima = self.acima[u]
+            if any(x in dist and dist[x] + w < d for x, w in acima):
+                continue
+            for v, w in acima:
+                nd = d + w
+                if nd < dist.get(v, float('inf')):
+                    dist[v], prev[v] = nd, u
+                    heapq.heappush(pq, (nd, v))
+        return dist, prev
+
+    def _desfazer(self, u, v, trechos):
+        # Acrescenta a trechos as arestas originais (destino, peso, rua) de u até v.
+        chave = (u, v) if self.posicao[u] < self.posicao[v] else (v, u)
+        w, rua, via = self.arestas[chave]
+        if via is None:
+            trechos.append((v, w, rua))
+        else:
+            self._desfazer(u, via, trechos)
+            self._desfazer(via, v, trechos)
+
+    def query(self, src, dst):
+        if src not in self.posicao or dst not in self.posicao:
+            return float('inf'), [], [], []
+
+        dist_ida, prev_ida = self._busca_em_cache(src)
+        dist_volta, prev_volta = self._busca_em_cache(dst)
+        melhor, topo = float('inf'), None
+        for u, d in dist_ida.items():
+            if u in dist_volta and d + dist_volta[u] < melhor:
+                melhor, topo = d + dist_volta[u], u
+        if topo is None:
+            return float('inf'), [], [], []
+
+        subida = [topo]
+        while prev_ida[subida[-1]] is not None:
+            subida.append(prev_ida[subida[-1]])
+        subida.reverse()
+        descida = [topo]
+        while prev_volta[descida[-1]] is not None:
+            descida.append(prev_volta[descida[-1]])
+        nos = subida + descida[1:]
+
+        trechos = []
+        for u, v in zip(nos, nos[1:]):
+            self._desfazer(u, v, trechos)
+
+        # Custo somado na ordem do caminho e ruas vazias puladas, como no dijkstra.
+        cost, path, streets, weights = 0, [src], [], []
+        for v, w, rua in trechos:
+            cost += w
+            path.append(v)
+            if rua:
+                streets.append(rua)
+                weights.append(w)
+        return cost, path, streets, weights
+
+
+class TestContractionHierarchy(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Grafo não direcionado com duas ruas paralelas (A-B), um caminho em
+        que B é o meio obrigatório (A-B-C) e um bairro isolado (Z).
+        """
+        ruas = [
+            ('A', 'B', 2, 'Rua A-B'), ('A', 'B', 1, 'Rua A-B curta'), ('B', 'C', 2, 'Rua B-C'),
+            ('C', 'D', 1, 'Rua C-D'), ('A', 'D', 6, 'Rua A-D'), ('D', 'E', 3, 'Rua D-E'),
+            ('B', 'E', 7, 'Rua B-E'), ('E', 'F', 1, ''),
+        ]
+        cls.adj = {'Z': []}
+        for u, v, w, log in ruas:
+            cls.adj.setdefault(u, []).append((v, w, log))
+            cls.adj.setdefault(v, []).append((u, w, log))
+        cls.ch = ContractionHierarchy.build(cls.adj)
+
+    def test_mesmo_resultado_que_dijkstra(self):
+        print("\nTestando: test_mesmo_resultado_que_dijkstra (todos os pares)")
+        for src in self.adj:
+            for dst in self.adj:
+                self.assertEqual(self.ch.query(src, dst), dijkstra(self.adj, src, dst))
+
+    def test_ruas_restauradas(self):
+        print("\nTestando: test_ruas_restauradas (A -> F)")
+        cost, path, streets, weights = self.ch.query('A', 'F')
+        self.assertEqual(cost, 8)
+        self.assertEqual(path, ['A', 'B', 'C', 'D', 'E', 'F'])
+        self.assertEqual(streets, ['Rua A-B curta', 'Rua B-C', 'Rua C-D', 'Rua D-E'])
+        self.assertEqual(weights, [1, 2, 1, 3])
+
+    def test_sem_caminho_e_no_invalido(self):
+        print("\nTestando: test_sem_caminho_e_no_invalido (A -> Z, A -> Y)")
+        self.assertEqual(self.ch.query('A', 'Z'), (float('inf'), [], [], []))
+        self.assertEqual(self.ch.query('A', 'Y'), (float('inf'), [], [], []))
+
+    def test_salvar_e_carregar(self):
+        print("\nTestando: test_salvar_e_carregar")
+        with tempfile.TemporaryDirectory() as pasta:
+            path = os.path.join(pasta, 'grafo.ch.json')
+            self.ch.save(path)
+            carregada = ContractionHierarchy.load(path)
+        self.assertEqual(carregada.ordem, self.ch.ordem)
+        for src in self.adj:
+            for dst in self.adj:
+                self.assertEqual(carregada.query(src, dst), self.ch.query(src, dst))
+
+
+if __name__ == '__main__':
+    print("--- Executando Testes de Unidade para a Hierarquia de Contração ---")
+    unittest.main()
@@ -33,6 +33,160 @@ def dijkstra(adj, src, dst):
     weights.reverse()
     return dist[dst], path, streets, weights
 
+def _caminho_ate(prev, cur):
+    # prev[v] = (u, rua, peso) da aresta que chegou em v; devolve o trecho
+    # da raiz da busca até cur, com a mesma regra do dijkstra para ruas vazias.
+    path, streets, weights = [cur], [], []
+    while prev.get(cur):
+        cur, log, w = prev[cur]
+        path.append(cur)
+        if log:
+            streets.append(log)
+            weights.append(w)
+    path.reverse()
+    streets.reverse()
+    weights.reverse()
+    return path, streets, weights
+
+def dijkstra_bidirecional(adj, src, dst, adj_reverso=None, stats=None):
+    # Uma busca sai da origem e outra do destino (sobre adj_reverso; o grafo
+    # de bairros é não direcionado, então por padrão é o próprio adj). Para
+    # quando a soma dos topos das duas filas não pode mais melhorar a melhor
+    # ligação encontrada entre elas.
+    if src not in adj or dst not in adj:
+        return float('inf'), [], [], []
+    if adj_reverso is None:
+        adj_reverso = adj
+
+    dist = [{src: 0}, {dst: 0}]
+    prev = [{src: None}, {dst: None}]
+    settled = [set(), set()]
+    pq = [[(0, src)], [(0, dst)]]
+    grafos = [adj, adj_reverso]
+
+    melhor, meio = (0, src) if src == dst else (float('inf'), None)
+
+    while pq[0] and pq[1]:
+        if pq[0][0][0] + pq[1][0][0] >= melhor:
+            break
+        lado = 0 if pq[0][0][0] <= pq[1][0][0] else 1
+        d, u = heapq.heappop(pq[lado])
+        if u in settled[lado]: continue
+        settled[lado].add(u)
+
+        dist_lado, dist_outro = dist[lado], dist[1 - lado]
+        for v, w, log in grafos[lado][u]:
+            nd = d + w
+            if nd < dist_lado.get(v, float('inf')):
+                dist_lado[v] = nd
+                prev[lado][v] = (u, log, w)
+                heapq.heappush(pq[lado], (nd, v))
+            if v in dist_outro and dist_lado[v] + dist_outro[v] < melhor:
+                melhor, meio = dist_lado[v] + dist_outro[v], v
+
+    if stats is not None:
+        stats['settled'] = len(settled[0]) + len(settled[1])
+    if meio is None:
+        return float('inf'), [], [], []
+
+    # O custo é somado na ordem do caminho, como no dijkstra, para dar o
+    # mesmo float que ele daria para o mesmo caminho.
+    custo, cur = dist[0][meio], meio
+    while prev[1].get(cur):
+        cur, _, w = prev[1][cur]
+        custo += w
+
+    path, streets, weights = _caminho_ate(prev[0], meio)
+    volta, ruas_volta, pesos_volta = _caminho_ate(prev[1], meio)
+    path += volta[-2::-1]
+    streets += ruas_volta[::-1]
+    weights += pesos_volta[::-1]
+    return custo, path, streets, weights
+
+def heuristica_euclidiana(coordenadas, fator=1.0):
+    # coordenadas: {bairro: (x, y)}. A estimativa é a distância em linha reta
+    # vezes fator; só é admissível se nenhuma rua for mais curta que isso.
+    # Bairros sem coordenada recebem 0, o que mantém a heurística admissível.
+    def h(u, dst):
+        if u not in coordenadas or dst not in coordenadas:
+            return 0
+        (x1, y1), (x2, y2) = coordenadas[u], coordenadas[dst]
+        return fator * ((x1 - x2) ** 2 + (y1 - y2) ** 2) ** 0.5
+    return h
+
+def distancias(adj, src):
+    dist = {src: 0}
+    pq = [(0, src)]
+    while pq:
+        d, u = heapq.heappop(pq)
+        if d > dist[u]: continue
+        for v, w, _ in adj[u]:
+            nd = d + w
+            if nd < dist.get(v, float('inf')):
+                dist[v] = nd
+                heapq.heappush(pq, (nd, v))
+    return dist
+
+def escolher_marcos(adj, quantidade, inicio=None):
+    # Cada marco novo é o bairro mais distante dos marcos já escolhidos.
+    atual = inicio if inicio is not None else next(iter(adj))
+    marcos, mais_perto = [], {}
+    for _ in range(min(quantidade, len(adj))):
+        dist = distancias(adj, atual)
+        for n in adj:
+            mais_perto[n] = min(mais_perto.get(n, float('inf')), dist.get(n, float('inf')))
+        atual = max((n for n in adj if mais_perto[n] != float('inf')), key=lambda n: mais_perto[n])
+        if mais_perto[atual] == 0:
+            break
+        marcos.append(atual)
+    return marcos
+
+def heuristica_marcos(adj, marcos):
+    # Sem coordenadas dos bairros: pela desigualdade triangular,
+    # |d(L, dst) - d(L, u)| nunca passa do custo real de u até dst, para
+    # qualquer marco L (grafo não direcionado).
+    tabelas = [distancias(adj, marco) for marco in marcos]
+    def h(u, dst):
+        melhor = 0
+        for dist in tabelas:
+            if u in dist and dst in dist:
+                melhor = max(melhor, abs(dist[dst] - dist[u]))
+        return melhor
+    return h
+
+def a_estrela(adj, src, dst, heuristica=None, stats=None):
+    # heuristica(u, dst) deve ser admissível e consistente; sem ela a busca
+    # é o próprio Dijkstra.
+    if src not in adj or dst not in adj:
+        return float('inf'), [], [], []
+    if heuristica is None:
+        heuristica = lambda u, dst: 0
+
+    dist = {src: 0}
+    prev = {src: None}
+    settled = set()
+    pq = [(heuristica(src, dst), src)]
+
+    while pq:
+        _, u = heapq.heappop(pq)
+        if u in settled: continue
+        settled.add(u)
+        if u == dst: break
+        for v, w, log in adj[u]:
+            nd = dist[u] + w
+            if nd < dist.get(v, float('inf')):
+                dist[v] = nd
+                prev[v] = (u, log, w)
+                heapq.heappush(pq, (nd + heuristica(v, dst), v))
+
+    if stats is not None:
+        stats['settled'] = len(settled)
+    if dst not in dist:
+        return float('inf'), [], [], []
+
+    path, streets, weights = _caminho_ate(prev, dst)
+    return dist[dst], path, streets, weights
+
 class TestDijkstra(unittest.TestCase):
 
     @classmethod
@@ -118,6 +272,62 @@ class TestDijkstra(unittest.TestCase):
         self.assertEqual(weights, [])
 
 
+class TestBuscasPontoAPonto(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Grafo não direcionado em grade 3x3 com coordenadas; cada rua custa
+        pelo menos a distância em linha reta entre os bairros.
+        """
+        cls.coordenadas = {f"B{i}{j}": (i, j) for i in range(3) for j in range(3)}
+        pesos = [1, 2, 1.5, 1, 3, 1, 1.2, 2, 1, 1, 1.1, 4]
+        cls.adj = {u: [] for u in cls.coordenadas}
+        arestas = [(f"B{i}{j}", f"B{i}{j + 1}") for i in range(3) for j in range(2)]
+        arestas += [(f"B{i}{j}", f"B{i + 1}{j}") for i in range(2) for j in range(3)]
+        for (u, v), w in zip(arestas, pesos):
+            cls.adj[u].append((v, w, f"Rua {u}-{v}"))
+            cls.adj[v].append((u, w, f"Rua {u}-{v}"))
+        cls.adj['Ilha'] = []
+
+    def test_mesmo_custo_que_dijkstra(self):
+        print("\nTestando: test_mesmo_custo_que_dijkstra (todos os pares)")
+        h = heuristica_euclidiana(self.coordenadas)
+        marcos = heuristica_marcos(self.adj, escolher_marcos(self.adj, 2, 'B00'))
+        for src in self.coordenadas:
+            for dst in self.coordenadas:
+                esperado = dijkstra(self.adj, src, dst)[0]
+                self.assertAlmostEqual(dijkstra_bidirecional(self.adj, src, dst)[0], esperado)
+                self.assertAlmostEqual(a_estrela(self.adj, src, dst, h)[0], esperado)
+                self.assertAlmostEqual(a_estrela(self.adj, src, dst, marcos)[0], esperado)
+
+    def test_caminho_consistente(self):
+        print("\nTestando: test_caminho_consistente (B00 -> B22)")
+        for busca in (dijkstra_bidirecional, a_estrela):
+            cost, path, streets, weights = busca(self.adj, 'B00', 'B22')
+            self.assertEqual(path[0], 'B00')
+            self.assertEqual(path[-1], 'B22')
+            self.assertEqual(len(streets), len(path) - 1)
+            self.assertAlmostEqual(sum(weights), cost)
+
+    def test_sem_caminho(self):
+        print("\nTestando: test_sem_caminho (B00 -> Ilha)")
+        self.assertEqual(dijkstra_bidirecional(self.adj, 'B00', 'Ilha'), (float('inf'), [], [], []))
+        self.assertEqual(a_estrela(self.adj, 'B00', 'Ilha'), (float('inf'), [], [], []))
+
+    def test_caminho_para_si(self):
+        print("\nTestando: test_caminho_para_si (B11 -> B11)")
+        self.assertEqual(dijkstra_bidirecional(self.adj, 'B11', 'B11'), (0, ['B11'], [], []))
+        self.assertEqual(a_estrela(self.adj, 'B11', 'B11'), (0, ['B11'], [], []))
+
+    def test_fecha_menos_nos(self):
+        print("\nTestando: test_fecha_menos_nos (A* euclidiana x sem heurística)")
+        sem, com = {}, {}
+        a_estrela(self.adj, 'B00', 'B02', stats=sem)
+        a_estrela(self.adj, 'B00', 'B02', heuristica_euclidiana(self.coordenadas), com)
+        self.assertLessEqual(com['settled'], sem['settled'])
+
+
 if __name__ == '__main__':
     print("--- Executando Testes de Unidade para Dijkstra (Versão Bairros) ---")
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,226 @@
+import heapq
+import multiprocessing
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+def dijkstra(adj, src, dst, stats=None):
+    if src not in adj or dst not in adj:
+        return float('inf'), [], [], []
+
+    dist = {n: float('inf') for n in adj}
+    prev = {n: None for n in adj}
+    prev_street = {n: None for n in adj}
+    prev_weight = {n: None for n in adj}  
+    dist[src] = 0
+    pq = [(0, src)]
+    settled = 0
+
+    while pq:
+        d, u = heapq.heappop(pq)
+        if d > dist[u]: continue
+        settled += 1
+        if u == dst: break
+        for v, w, log in adj[u]:
+            nd = d + w
+            if nd < dist[v]:
+                dist[v], prev[v], prev_street[v], prev_weight[v] = nd, u, log, w
+                heapq.heappush(pq, (nd, v))
+
+    if stats is not None:
+        stats['settled'] = settled
+    if dist[dst] == float('inf'):
+        return float('inf'), [], [], []
+
+    path, streets, weights, cur = [], [], [], dst
+    while cur:
+        path.append(cur)
+        if prev_street[cur]:
+            streets.append(prev_street[cur])
+            weights.append(prev_weight[cur])
+        cur = prev[cur]
+    path.reverse()
+    streets.reverse()
+    weights.reverse()
+    return dist[dst], path, streets, weights
+
+# (func, dados) da execução em andamento. Com fork, os processos filhos
+# herdam este valor por cópia-na-escrita: o grafo não é serializado.
+_tarefa = None
+
+
+def _init_worker(func, dados):
+    global _tarefa
+    _tarefa = (func, dados)
+
+
+def _executar(item):
+    func, dados = _tarefa
+    return func(dados, item)
+
+
+def imap_processos(func, dados, itens, processos=None):
+    # Aplica func(dados, item) a cada item e entrega os resultados na ordem
+    # dos itens, qualquer que seja o processo que calculou cada um, à medida
+    # que ficam prontos. dados é só leitura; func precisa ser uma função de
+    # módulo (nível superior).
+    global _tarefa
+    itens = list(itens)
+    if not processos or processos <= 1 or len(itens) <= 1:
+        for item in itens:
+            yield func(dados, item)
+        return
+
+    processos = min(processos, len(itens))
+    chunksize = max(1, len(itens) // (4 * processos))
+
+    if 'fork' in multiprocessing.get_all_start_methods():
+        # Os processos são criados dentro do pool.map, enquanto _tarefa
+        # ainda aponta para estes dados.
+        _tarefa = (func, dados)
+        try:
+            with ProcessPoolExecutor(max_workers=processos,
+                                     mp_context=multiprocessing.get_context('fork')) as pool:
+                resultados = pool.map(_executar, itens, chunksize=chunksize)
+                _tarefa = None
+                yield from resultados
+        finally:
+            _tarefa = None
+        return
+
+    # Sem fork (Windows, por exemplo) os dados vão uma vez para cada processo.
+    with ProcessPoolExecutor(max_workers=processos, initializer=_init_worker,
+                             initargs=(func, dados)) as pool:
+        yield from pool.map(_executar, itens, chunksize=chunksize)
+
+def dijkstra_arvore(adj, src):
+    # Mesma busca do dijkstra, mas sem parar em um destino: devolve a árvore
+    # de caminhos mínimos de src para todos os bairros.
+    dist = {n: float('inf') for n in adj}
+    prev = {n: None for n in adj}
+    prev_street = {n: None for n in adj}
+    prev_weight = {n: None for n in adj}
+    dist[src] = 0
+    pq = [(0, src)]
+
+    while pq:
+        d, u = heapq.heappop(pq)
+        if d > dist[u]: continue
+        for v, w, log in adj[u]:
+            nd = d + w
+            if nd < dist[v]:
+                dist[v], prev[v], prev_street[v], prev_weight[v] = nd, u, log, w
+                heapq.heappush(pq, (nd, v))
+    return dist, prev, prev_street, prev_weight
+
+def caminho_da_origem(arvore, dst):
+    dist, prev, prev_street, prev_weight = arvore
+    if dist[dst] == float('inf'):
+        return float('inf'), [], [], []
+
+    path, streets, weights, cur = [], [], [], dst
+    while cur:
+        path.append(cur)
+        if prev_street[cur]:
+            streets.append(prev_street[cur])
+            weights.append(prev_weight[cur])
+        cur = prev[cur]
+    path.reverse()
+    streets.reverse()
+    weights.reverse()
+    return dist[dst], path, streets, weights
+
+def caminho_ate_o_destino(arvore, src):
+    # Árvore montada a partir do destino sobre o grafo reverso: prev aponta
+    # para o próximo bairro do caminho. O custo é somado na ordem do caminho,
+    # como no dijkstra.
+    dist, prev, prev_street, prev_weight = arvore
+    if dist[src] == float('inf'):
+        return float('inf'), [], [], []
+
+    cost, path, streets, weights, cur = 0, [src], [], [], src
+    while prev[cur]:
+        cost += prev_weight[cur]
+        if prev_street[cur]:
+            streets.append(prev_street[cur])
+            weights.append(prev_weight[cur])
+        cur = prev[cur]
+        path.append(cur)
+    return cost, path, streets, weights
+
+def _caminhos_do_grupo(dados, grupo):
+    # Uma árvore para a raiz do grupo e os caminhos de todos os pares dela.
+    grafo, por_origem = dados
+    raiz, outros = grupo
+    arvore = dijkstra_arvore(grafo, raiz)
+    if por_origem:
+        return [((raiz, dst), caminho_da_origem(arvore, dst)) for dst in outros]
+    return [((src, raiz), caminho_ate_o_destino(arvore, src)) for src in outros]
+
+def matriz_distancias(adj, pares, adj_reverso=None, processos=None):
+    # Responde uma lista de pares (origem, destino) com uma busca por
+    # bairro distinto em vez de uma por par: agrupa pelas origens, ou pelos
+    # destinos (busca no grafo reverso; o de bairros é não direcionado)
+    # quando há menos destinos distintos. Com processos > 1 os grupos são
+    # divididos entre processos; a tabela sai igual.
+    validos = [(src, dst) for src, dst in pares if src in adj and dst in adj]
+    tabela = {par: (float('inf'), [], [], []) for par in pares}
+
+    origens = {}
+    destinos = {}
+    for src, dst in validos:
+        origens.setdefault(src, {})[dst] = None
+        destinos.setdefault(dst, {})[src] = None
+
+    if len(origens) <= len(destinos):
+        dados, grupos = (adj, True), origens
+    else:
+        dados, grupos = (adj if adj_reverso is None else adj_reverso, False), destinos
+
+    grupos = [(raiz, list(outros)) for raiz, outros in grupos.items()]
+    for caminhos in imap_processos(_caminhos_do_grupo, dados, grupos, processos):
+        tabela.update(caminhos)
+    return tabela
+
+class TestMatrizDistancias(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Grafo não direcionado no formato do load_graph, com um bairro
+        isolado (E) e uma rua sem nome (C-D).
+        """
+        ruas = [('A', 'B', 2, 'Rua A-B'), ('B', 'C', 3, 'Rua B-C'), ('A', 'C', 10, 'Rua A-C'), ('C', 'D', 1, '')]
+        cls.adj = {'E': []}
+        for u, v, w, log in ruas:
+            cls.adj.setdefault(u, []).append((v, w, log))
+            cls.adj.setdefault(v, []).append((u, w, log))
+
+    def test_agrupado_por_origem(self):
+        print("\nTestando: test_agrupado_por_origem")
+        pares = [('A', 'C'), ('A', 'D'), ('A', 'E'), ('B', 'D'), ('A', 'A')]
+        tabela = matriz_distancias(self.adj, pares)
+        for src, dst in pares:
+            self.assertEqual(tabela[(src, dst)], dijkstra(self.adj, src, dst))
+
+    def test_agrupado_por_destino(self):
+        print("\nTestando: test_agrupado_por_destino (menos destinos que origens)")
+        pares = [('A', 'D'), ('B', 'D'), ('C', 'D'), ('E', 'D')]
+        tabela = matriz_distancias(self.adj, pares)
+        self.assertEqual(tabela[('A', 'D')], (6, ['A', 'B', 'C', 'D'], ['Rua A-B', 'Rua B-C'], [2, 3]))
+        for par in pares:
+            self.assertEqual(tabela[par], dijkstra(self.adj, *par))
+
+    def test_processos(self):
+        print("\nTestando: test_processos (mesma tabela com 2 processos)")
+        pares = [(src, dst) for src in self.adj for dst in self.adj]
+        self.assertEqual(matriz_distancias(self.adj, pares, processos=2), matriz_distancias(self.adj, pares))
+
+    def test_bairro_desconhecido(self):
+        print("\nTestando: test_bairro_desconhecido (Z -> A)")
+        tabela = matriz_distancias(self.adj, [('Z', 'A')])
+        self.assertEqual(tabela[('Z', 'A')], (float('inf'), [], [], []))
+
+
+if __name__ == '__main__':
+    print("--- Executando Testes de Unidade para a Matriz de Distâncias ---")
+    unittest.main()
@@ -0,0 +1,65 @@
+import math
+import re
+import sys
+import unicodedata
+import unittest
+import pandas as pd
+
+_ESPACOS = re.compile(r'\s+')
+
+# Nome bruto -> nome canônico. Os canônicos são internados, então o mesmo
+# bairro é sempre o mesmo objeto str, venha do CSV que vier.
+_canonicos = {}
+
+
+def _canonizar(nome):
+    nome = _ESPACOS.sub(' ', str(nome).strip().lower())
+    nome = unicodedata.normalize('NFKD', nome).encode('ASCII', 'ignore').decode('utf-8')
+    return sys.intern(nome.title())
+
+
+def canonizar(nome):
+    # Sem espaços sobrando, sem acentos e em Title Case: "  são  josé" e
+    # "Sao Jose" viram o mesmo bairro. Cada nome bruto é normalizado uma vez.
+    if nome is None or (isinstance(nome, float) and math.isnan(nome)):
+        return ''
+    try:
+        return _canonicos[nome]
+    except KeyError:
+        canonico = _canonicos[nome] = _canonizar(nome)
+        return canonico
+
+
+def canonizar_coluna(serie):
+    # Normaliza só os valores distintos da coluna e aplica a tabela de uma
+    # vez com map; células vazias viram '' como em canonizar.
+    tabela = {valor: canonizar(valor) for valor in serie.dropna().unique()}
+    return serie.map(tabela).fillna('')
+
+
+class TestNomes(unittest.TestCase):
+
+    def test_forma_canonica(self):
+        print("\nTestando: test_forma_canonica")
+        self.assertEqual(canonizar('  são   josé '), 'Sao Jose')
+        self.assertEqual(canonizar('ALTO JOSÉ DO PINHO'), 'Alto Jose Do Pinho')
+        self.assertEqual(canonizar('Várzea'), canonizar('Varzea'))
+
+    def test_vazios(self):
+        print("\nTestando: test_vazios (None, NaN)")
+        self.assertEqual(canonizar(None), '')
+        self.assertEqual(canonizar(float('nan')), '')
+
+    def test_mesmo_objeto(self):
+        print("\nTestando: test_mesmo_objeto (nomes internados)")
+        self.assertIs(canonizar('Boa  Viagem'), canonizar('boa viagem'))
+
+    def test_coluna(self):
+        print("\nTestando: test_coluna")
+        serie = pd.Series(['Graças', 'gracas', None, 'Graças', ' Ibura '])
+        self.assertEqual(canonizar_coluna(serie).tolist(), ['Gracas', 'Gracas', '', 'Gracas', 'Ibura'])
+
+
+if __name__ == '__main__':
+    print("--- Executando Testes de Unidade para a Normalização de Nomes ---")
+    unittest.main()
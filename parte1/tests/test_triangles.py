@@ -0,0 +1,138 @@
+import unittest
+
+def adjacencia_sem_lacos(adj):
+    # Aceita vizinhos como set, lista de nomes ou lista de (vizinho, logradouro),
+    # que são os formatos usados pelo viz.py e pelo Grafo do solve.py. Um set
+    # sem laço é usado como está (só para leitura), sem cópia.
+    vizinhos = {}
+    for u, lista in adj.items():
+        if lista and isinstance(next(iter(lista)), tuple):
+            conjunto = {v[0] for v in lista}
+            conjunto.discard(u)
+        elif isinstance(lista, (set, frozenset)) and u not in lista:
+            conjunto = lista
+        else:
+            conjunto = set(lista)
+            conjunto.discard(u)
+        vizinhos[u] = conjunto
+    return vizinhos
+
+
+def contar_triangulos(adj):
+    # Cada aresta é orientada do nó de menor grau para o de maior grau (no
+    # empate vale a ordem de inserção), então cada nó só guarda os vizinhos
+    # "acima" dele e cada triângulo u-v-w é encontrado uma única vez, a
+    # partir do seu nó mais baixo u. Em mapas de bairros quase todo nó tem
+    # poucos vizinhos acima, então o laço testa pertinência em vez de montar
+    # um set de interseção por aresta.
+    vizinhos = adjacencia_sem_lacos(adj)
+    posicao = {u: i for i, u in enumerate(sorted(vizinhos, key=lambda u: len(vizinhos[u])))}
+
+    acima = {}
+    for u, viz in vizinhos.items():
+        pu = posicao[u]
+        acima[u] = [v for v in viz if posicao[v] > pu]
+
+    triangulos = dict.fromkeys(vizinhos, 0)
+    for u, sucessores in acima.items():
+        if len(sucessores) < 2:
+            continue
+        conjunto = set(sucessores)
+        em_u = 0
+        for v in sucessores:
+            for w in acima[v]:
+                if w in conjunto:
+                    em_u += 1
+                    triangulos[v] += 1
+                    triangulos[w] += 1
+        triangulos[u] += em_u
+    return triangulos, vizinhos
+
+
+def metricas_ego(adj):
+    # Tudo sai da contagem de triângulos: a rede ego de u tem os k vizinhos
+    # mais u (se k > 0), as k arestas de u e uma aresta por triângulo em u.
+    triangulos, vizinhos = contar_triangulos(adj)
+
+    metricas = {}
+    for u, t in triangulos.items():
+        k = len(vizinhos[u])
+        ordem_ego = k + 1 if k > 0 else 0
+        tamanho_ego = k + t
+        pares = k * (k - 1) / 2
+        metricas[u] = {
+            'grau': k,
+            'triangulos': t,
+            'ordem_ego': ordem_ego,
+            'tamanho_ego': tamanho_ego,
+            'densidade_ego': (2 * tamanho_ego) / (ordem_ego * (ordem_ego - 1)) if ordem_ego >= 2 else 0,
+            'clustering': t / pares if k > 1 else 0,
+        }
+    return metricas
+
+
+class TestTriangulos(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Dois triângulos (A-B-C e A-C-D) compartilhando a aresta A-C, um nó
+        pendurado (E), um nó isolado (F) e um laço em D.
+        """
+        cls.adj = {
+            'A': {'B', 'C', 'D'},
+            'B': {'A', 'C'},
+            'C': {'A', 'B', 'D'},
+            'D': {'A', 'C', 'D', 'E'},
+            'E': {'D'},
+            'F': set(),
+        }
+
+    def test_contagem_de_triangulos(self):
+        print("\nTestando: test_contagem_de_triangulos")
+        triangulos, _ = contar_triangulos(self.adj)
+        self.assertEqual(triangulos, {'A': 2, 'B': 1, 'C': 2, 'D': 1, 'E': 0, 'F': 0})
+
+    def test_metricas_ego(self):
+        print("\nTestando: test_metricas_ego (D)")
+        d = metricas_ego(self.adj)['D']
+        self.assertEqual(d['grau'], 3, "O laço em D não conta como vizinho")
+        self.assertEqual(d['ordem_ego'], 4)
+        self.assertEqual(d['tamanho_ego'], 4)
+        self.assertAlmostEqual(d['densidade_ego'], 8 / 12)
+        self.assertAlmostEqual(d['clustering'], 1 / 3)
+
+    def test_no_isolado_e_folha(self):
+        print("\nTestando: test_no_isolado_e_folha (E, F)")
+        metricas = metricas_ego(self.adj)
+        self.assertEqual(metricas['F']['ordem_ego'], 0)
+        self.assertEqual(metricas['F']['densidade_ego'], 0)
+        self.assertEqual(metricas['E']['ordem_ego'], 2)
+        self.assertEqual(metricas['E']['densidade_ego'], 1)
+        self.assertEqual(metricas['E']['clustering'], 0)
+
+    def test_igual_ao_subgrafo_ego(self):
+        print("\nTestando: test_igual_ao_subgrafo_ego")
+        vizinhos = adjacencia_sem_lacos(self.adj)
+        metricas = metricas_ego(self.adj)
+        for u, viz in vizinhos.items():
+            ego = viz | {u}
+            arestas = sum(1 for a in ego for b in vizinhos[a] if b in ego and a < b)
+            self.assertEqual(metricas[u]['tamanho_ego'], arestas)
+
+    def test_lista_de_tuplas(self):
+        print("\nTestando: test_lista_de_tuplas (formato do Grafo do solve.py)")
+        adj = {u: [(v, 'Rua ' + u + v) for v in sorted(viz)] for u, viz in self.adj.items()}
+        self.assertEqual(metricas_ego(adj), metricas_ego(self.adj))
+
+    def test_entrada_nao_e_alterada(self):
+        print("\nTestando: test_entrada_nao_e_alterada")
+        adj = {u: set(viz) for u, viz in self.adj.items()}
+        metricas_ego(adj)
+        self.assertEqual(adj, self.adj)
+        self.assertIn('D', adj['D'])
+
+
+if __name__ == '__main__':
+    print("--- Executando Testes de Unidade para a Contagem de Triângulos ---")
+    unittest.main()
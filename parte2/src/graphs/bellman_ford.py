@@ -1,28 +1,89 @@
-import json
-import time
-import tracemalloc
-from graph import build_directed_graph 
+import argparse
+from csr import CSRGraph
+from graph import build_csr_graph, build_directed_graph
+from parallel import imap_processos
+from profiling import Profiler
+from writers import JsonStreamWriter
+
+def bellman_ford_csr(graph, start):
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    n = len(graph)
+
+    dist = [float('inf')] * n
+    pred = [-1] * n
+    pred_edge = [-1] * n
+    dist[start] = 0
+
+    changed = bytearray(n)
+    changed[start] = 1
+    pendentes = 1
+
+    for _ in range(n - 1):
+        if not pendentes:
+            break
+        for u in range(n):
+            if not changed[u]:
+                continue
+            changed[u] = 0
+            pendentes -= 1
+            du = dist[u]
+            for e in range(offsets[u], offsets[u + 1]):
+                v = targets[e]
+                nd = du + weights[e]
+                if nd < dist[v]:
+                    dist[v] = nd
+                    pred[v] = u
+                    pred_edge[v] = e
+                    if not changed[v]:
+                        changed[v] = 1
+                        pendentes += 1
+                    if v == u:
+                        du = nd
+
+    has_neg = False
+    for u in range(n):
+        if not changed[u]:
+            continue
+        for e in range(offsets[u], offsets[u + 1]):
+            v = targets[e]
+            if dist[u] + weights[e] < dist[v]:
+                has_neg = True
+                print(f"Ciclo negativo detectado: {graph.names[u]} -> {graph.names[v]}")
+                break
+        if has_neg:
+            break
+
+    return dist, pred, pred_edge, has_neg
+
 
 def bellman_ford(graph, start):
-    tracemalloc.start()
-    start_time = time.time()
+    if isinstance(graph, CSRGraph):
+        return _bellman_ford_csr_por_nome(graph, start)
 
     dist = {n: float('inf') for n in graph}
     pred = {n: None for n in graph}
     dist[start] = 0
 
+    # Só nós cuja distância mudou desde a última varredura podem relaxar
+    # alguma aresta; os demais são pulados sem alterar a ordem das rodadas.
+    changed = {start}
+
     for _ in range(len(graph) - 1):
+        if not changed:
+            break
         for u in graph:
-            if dist[u] == float('inf'):
+            if u not in changed:
                 continue
+            changed.discard(u)
             for v, w, log in graph[u]:
                 if dist[u] + w < dist[v]:
                     dist[v] = dist[u] + w
                     pred[v] = (u, log, w)
+                    changed.add(v)
 
     has_neg = False
     for u in graph:
-        if dist[u] == float('inf'):
+        if u not in changed:
             continue
         for v, w, _ in graph[u]:
             if dist[u] + w < dist[v]:
@@ -32,12 +93,20 @@ def bellman_ford(graph, start):
         if has_neg:
             break
 
-    exec_time = time.time() - start_time
-    current, peak = tracemalloc.get_traced_memory()
-    tracemalloc.stop()
-    peak_memory_kb = peak / 1024
+    return dist, pred, has_neg
+
+
+def _bellman_ford_csr_por_nome(graph, start):
+    names = graph.names
+    dist_csr, pred_csr, pred_edge, has_neg = bellman_ford_csr(graph, graph.index[start])
 
-    return dist, pred, has_neg, exec_time, peak_memory_kb
+    dist = dict(zip(names, dist_csr))
+    pred = {n: None for n in names}
+    for v, e in enumerate(pred_edge):
+        if e != -1:
+            pred[names[v]] = (names[pred_csr[v]], graph.flight(e), graph.weights[e])
+
+    return dist, pred, has_neg
 
 
 def reconstruir_caminho(pred, origem, destino):
@@ -59,7 +128,71 @@ def reconstruir_caminho(pred, origem, destino):
     return path, flights, weights
 
 
-def main():
+def rota_json(exemplo_num, cost, path, flights, weights, src, dst, exec_time, peak_memory_kb):
+    resultado_json = {
+        "exemplo_num": exemplo_num,
+        "origem": src,
+        "destino": dst,
+        "custo_total_minutos": cost,
+        "tempo_execucao_segundos": exec_time,
+        "peak_memory_kb": peak_memory_kb,
+        "caminho": path,
+        "etapas": []
+    }
+    for j in range(len(flights)):
+        etapa = {
+            "de": path[j],
+            "para": path[j+1],
+            "voo": flights[j],
+            "duration_minutes": weights[j]
+        }
+        resultado_json["etapas"].append(etapa)
+    return resultado_json
+
+
+def caminhos_da_origem(dados, src_country):
+    # Um Bellman-Ford e todos os caminhos que saem dele. Roda igual no
+    # processo principal ou em um processo do pool (dados é só leitura).
+    graph, all_countries, min_nos_no_caminho, timing, memory = dados
+    profiler = Profiler(timing=timing, memory=memory)
+
+    with profiler.measure(f"bellman_ford:{src_country}") as perfil:
+        dist, pred, has_neg = bellman_ford(graph, src_country)
+
+    rotas = []
+    for dst_country in all_countries:
+        if src_country == dst_country:
+            continue
+
+        if dist[dst_country] == float('inf'):
+            continue
+
+        path, flights, weights = reconstruir_caminho(pred, src_country, dst_country)
+
+        if path and len(path) >= min_nos_no_caminho:
+            rotas.append((dist[dst_country], path, flights, weights, dst_country))
+
+    return rotas, has_neg, perfil
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--simples', action='store_true',
+                        help='mantém apenas o voo mais curto entre cada par de países')
+    parser.add_argument('--csr', action='store_true',
+                        help='usa a representação compacta (CSR) do grafo')
+    parser.add_argument('--snapshot', action='store_true',
+                        help='carrega o grafo de um snapshot binário (gravado na primeira execução)')
+    parser.add_argument('--johnson', action='store_true',
+                        help='usa Johnson (um Bellman-Ford + um Dijkstra por origem)')
+    parser.add_argument('--processos', type=int, default=None,
+                        help='número de processos para as buscas por origem (Bellman-Ford, '
+                             'ou Dijkstra no Johnson)')
+    Profiler.add_arguments(parser)
+    JsonStreamWriter.add_arguments(parser)
+    args = parser.parse_args(argv)
+    profiler = Profiler.from_args(args)
+
     print("--- Iniciando busca com Bellman-Ford ---")
 
     csv_file_path = '../../data/flight_filtrado.csv'
@@ -67,75 +200,69 @@ def main():
 
     min_nos_no_caminho = 0
 
-    graph = build_directed_graph(csv_file_path)
+    if args.csr:
+        graph = build_csr_graph(csv_file_path, simple=args.simples, snapshot=args.snapshot)
+    else:
+        graph = build_directed_graph(csv_file_path, simple=args.simples, snapshot=args.snapshot)
     if not graph:
         print("ERRO: O grafo está vazio. Verifique 'flight_filtrado.csv'.")
         return
 
-    found_examples = []
     all_countries = list(graph.keys())
     total_countries = len(all_countries)
 
-    print(f"Iniciando cálculo de Bellman-Ford para {total_countries} países de origem...")
+    if args.johnson:
+        from johnson import johnson, rotas_da_matriz
 
-    for i, src_country in enumerate(all_countries):
-        
-        print(f"  Calculando caminhos a partir de: {src_country} ({i+1}/{total_countries})")
+        print(f"Iniciando cálculo de Johnson para {total_countries} países de origem...")
 
-        dist, pred, has_neg, bf_exec_time, bf_peak_memory = bellman_ford(graph, src_country)
-        
-        if has_neg:
-            print(f"    ALERTA: Ciclo negativo detectado em caminhos a partir de {src_country}")
+        with profiler.measure("johnson") as perfil:
+            resultado = johnson(graph.to_adjacency() if args.csr else graph, processes=args.processos)
 
-        for dst_country in all_countries:
-            if src_country == dst_country:
-                continue
-                
-            if dist[dst_country] == float('inf'):
-                continue
-                
-            path, flights, weights = reconstruir_caminho(pred, src_country, dst_country)
-            
-            if path and len(path) >= min_nos_no_caminho:
-                dist_val = dist[dst_country]
-                
-                found_examples.append((
-                    dist_val, path, flights, weights, 
-                    src_country, dst_country, 
-                    bf_exec_time, bf_peak_memory
-                ))
-
-    print(f"\nCálculo de caminhos concluído. Total de {len(found_examples)} caminhos encontrados.")
-
-    json_results_list = []
-    for i, ex in enumerate(found_examples):
-        cost, path, flights, weights, src_found, dst_found, exec_time, peak_memory_kb = ex
-        resultado_json = {
-            "exemplo_num": i + 1,
-            "origem": src_found,
-            "destino": dst_found,
-            "custo_total_minutos": cost,
-            "tempo_execucao_segundos": exec_time,
-            "peak_memory_kb": peak_memory_kb,
-            "caminho": path,
-            "etapas": []
-        }
-        for j in range(len(flights)):
-            etapa = {
-                "de": path[j],
-                "para": path[j+1],
-                "voo": flights[j],
-                "duration_minutes": weights[j]
-            }
-            resultado_json["etapas"].append(etapa)
-        json_results_list.append(resultado_json)
+        if resultado is None:
+            return
 
     try:
-        with open(output_json_file, 'w', encoding='utf-8') as f:
-            json.dump(json_results_list, f, ensure_ascii=False, indent=4)
-        print(f"\nArquivo JSON salvo com {len(json_results_list)} exemplos em '{output_json_file}'.")
-    except Exception as e:
+        writer = JsonStreamWriter.from_args(output_json_file, args)
+    except OSError as e:
         print(f"ERRO ao salvar o arquivo JSON: {e}")
+        return
+
+    with writer:
+        if args.johnson:
+            # Uma execução atende todas as origens: o tempo é rateado entre elas.
+            exec_time = perfil.elapsed_seconds / total_countries if profiler.timing else None
+            for rota in rotas_da_matriz(resultado, all_countries, all_countries):
+                if len(rota[1]) >= min_nos_no_caminho:
+                    writer.write(rota_json(writer.count + 1, *rota, exec_time, perfil.peak_memory_kb))
+
+        else:
+            print(f"Iniciando cálculo de Bellman-Ford para {total_countries} países de origem...")
+
+            # As origens são independentes; os resultados voltam na ordem de
+            # all_countries, então o arquivo é o mesmo com ou sem processos.
+            dados = (graph, all_countries, min_nos_no_caminho, profiler.timing, profiler.memory)
+            resultados = imap_processos(caminhos_da_origem, dados, all_countries, args.processos)
+
+            for i, (src_country, (rotas, has_neg, perfil)) in enumerate(zip(all_countries, resultados)):
+                profiler.records.append(perfil)
+
+                print(f"  Calculando caminhos a partir de: {src_country} ({i+1}/{total_countries})")
+
+                if has_neg:
+                    print(f"    ALERTA: Ciclo negativo detectado em caminhos a partir de {src_country}")
+
+                for cost, path, flights, weights, dst_country in rotas:
+                    writer.write(rota_json(
+                        writer.count + 1, cost, path, flights, weights,
+                        src_country, dst_country,
+                        perfil.elapsed_seconds, perfil.peak_memory_kb
+                    ))
+
+    print(f"\nCálculo de caminhos concluído. Total de {writer.count} caminhos encontrados.")
+    print(f"\nArquivo salvo com {writer.count} exemplos em '{writer.path}'.")
+
+    profiler.report()
 
 
 if __name__ == "__main__":
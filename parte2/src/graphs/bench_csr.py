@@ -0,0 +1,79 @@
+import contextlib
+import io
+import time
+import tracemalloc
+from bellman_ford import bellman_ford_csr
+from csr import CSRGraph
+from dijkstra import dijkstra_tree, dijkstra_tree_csr
+from graph import adjacency_from_flights, load_flights
+
+
+def memoria_por_aresta(construir, num_edges):
+    tracemalloc.start()
+    grafo = construir()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return grafo, current / num_edges
+
+
+def bellman_ford_dict(graph, start):
+    # Mesmo laço de bellman_ford.bellman_ford, sem a instrumentação de tempo/memória.
+    dist = {n: float('inf') for n in graph}
+    pred = {n: None for n in graph}
+    dist[start] = 0
+
+    changed = {start}
+
+    for _ in range(len(graph) - 1):
+        if not changed:
+            break
+        for u in graph:
+            if u not in changed:
+                continue
+            changed.discard(u)
+            for v, w, log in graph[u]:
+                if dist[u] + w < dist[v]:
+                    dist[v] = dist[u] + w
+                    pred[v] = (u, log, w)
+                    changed.add(v)
+
+    return dist, pred
+
+
+def tempo_por_relaxacao(func, origens, relaxacoes, repeticoes):
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        start_time = time.perf_counter()
+        for origem in origens:
+            func(origem)
+        melhor = min(melhor, time.perf_counter() - start_time)
+    return melhor / relaxacoes * 1e9
+
+
+def main():
+    csv_file_path = '../../data/flight_filtrado.csv'
+    repeticoes = 5
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = load_flights(csv_file_path)
+
+    num_edges = len(df)
+    adj, bytes_dict = memoria_por_aresta(lambda: adjacency_from_flights(df), num_edges)
+    csr, bytes_csr = memoria_por_aresta(lambda: CSRGraph.from_flights(df), num_edges)
+
+    print(f"Arestas: {num_edges}, nós: {len(csr)}")
+    print(f"Memória por aresta: dict {bytes_dict:.1f} B, CSR {bytes_csr:.1f} B")
+
+    # Dijkstra a partir de cada origem relaxa todas as arestas alcançáveis uma vez.
+    relaxacoes = num_edges * len(csr)
+    ns_dict = tempo_por_relaxacao(lambda s: dijkstra_tree(adj, s), list(adj), relaxacoes, repeticoes)
+    ns_csr = tempo_por_relaxacao(lambda s: dijkstra_tree_csr(csr, s), range(len(csr)), relaxacoes, repeticoes)
+    print(f"Dijkstra (ns/relaxação): dict {ns_dict:.1f}, CSR {ns_csr:.1f}")
+
+    ns_dict = tempo_por_relaxacao(lambda s: bellman_ford_dict(adj, s), list(adj), relaxacoes, repeticoes)
+    ns_csr = tempo_por_relaxacao(lambda s: bellman_ford_csr(csr, s), range(len(csr)), relaxacoes, repeticoes)
+    print(f"Bellman-Ford (ns/aresta da origem): dict {ns_dict:.1f}, CSR {ns_csr:.1f}")
+
+
+if __name__ == '__main__':
+    main()
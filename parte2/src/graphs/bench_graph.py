@@ -0,0 +1,88 @@
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import pandas as pd
+from graph import build_directed_graph
+
+
+def build_directed_graph_iterrows(csv_path):
+    # Versão original (linha a linha), mantida apenas para comparação.
+    required_cols = ['from_country', 'dest_country', 'flight_number', 'duration_minutes']
+
+    adjacency_list = {}
+
+    all_nodes = set()
+    try:
+        df = pd.read_csv(csv_path)
+
+        if not all(col in df.columns for col in required_cols):
+            print(f"Erro: O arquivo '{csv_path}' deve conter as colunas: {required_cols}")
+            sys.exit()
+
+    except FileNotFoundError:
+        print(f"Erro: Arquivo '{csv_path}' não encontrado.")
+        sys.exit()
+
+    for index, row in df.iterrows():
+        try:
+            origem = str(row['from_country']).strip()
+            destino = str(row['dest_country']).strip()
+            voo = str(row['flight_number']).strip()
+
+            peso = pd.to_numeric(row['duration_minutes'], errors='coerce')
+
+            if pd.isna(peso) or not origem or not destino:
+                print(f"Aviso: Ignorando linha {index} (dados inválidos ou faltando)")
+                continue
+            all_nodes.add(origem)
+            all_nodes.add(destino)
+            adjacency_list.setdefault(origem, []).append((destino, peso, voo))
+
+        except Exception as e:
+            print(f"Aviso: Erro ao processar linha {index}. Erro: {e}")
+
+    for node in all_nodes:
+        adjacency_list.setdefault(node, [])
+
+    return adjacency_list
+
+
+def medir(func, csv_path, repeticoes):
+    melhor = float('inf')
+    resultado = None
+    for _ in range(repeticoes):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start_time = time.perf_counter()
+            resultado = func(csv_path)
+            melhor = min(melhor, time.perf_counter() - start_time)
+    return melhor, resultado
+
+
+def main():
+    csv_file_path = '../../data/flight_filtrado.csv'
+    fatores = [1, 10]
+    repeticoes = 3
+
+    df = pd.read_csv(csv_file_path)
+
+    print(f"{'linhas':>10} {'iterrows (s)':>14} {'vetorizado (s)':>16} {'ganho':>8}")
+    for fator in fatores:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            caminho = os.path.join(tmp_dir, 'flights.csv')
+            pd.concat([df] * fator, ignore_index=True).to_csv(caminho, index=False)
+
+            t_antigo, g_antigo = medir(build_directed_graph_iterrows, caminho, repeticoes)
+            t_novo, g_novo = medir(build_directed_graph, caminho, repeticoes)
+
+        if dict(g_antigo) != dict(g_novo):
+            print(f"ERRO: os grafos gerados diferem para o fator {fator}.")
+            return
+
+        print(f"{len(df) * fator:>10} {t_antigo:>14.4f} {t_novo:>16.4f} {t_antigo / t_novo:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+import os
+import sys
+import time
+from bellman_ford import caminhos_da_origem
+from bench_traversal import grafo_sintetico
+from dijkstra import rotas_da_origem
+from graph import build_directed_graph
+from parallel import imap_processos
+
+
+def medir(func, dados, origens, processos):
+    start_time = time.perf_counter()
+    resultados = [r[0] for r in imap_processos(func, dados, origens, processos)]
+    return time.perf_counter() - start_time, resultados
+
+
+def comparar(nome, func, dados, origens, contagens):
+    print(f"\n{nome}: {len(origens)} origens")
+    print(f"{'processos':>9} | {'tempo (s)':>9} | {'speedup':>7}")
+    serial, esperado = medir(func, dados, origens, 1)
+    print(f"{1:>9} | {serial:>9.3f} | {1:>7.2f}")
+    for processos in contagens[1:]:
+        elapsed, resultados = medir(func, dados, origens, processos)
+        assert resultados == esperado
+        print(f"{processos:>9} | {elapsed:>9.3f} | {serial / elapsed:>7.2f}")
+
+
+def main():
+    cpus = os.cpu_count() or 1
+    contagens = sorted({1, 2, 4, cpus} | set(range(8, cpus + 1, 8)))
+    if len(sys.argv) > 1:
+        contagens = sorted({1} | {int(n) for n in sys.argv[1:]})
+    print(f"{cpus} CPUs disponíveis; contagens de processos: {contagens}")
+
+    adj = build_directed_graph('../../data/flight_filtrado.csv')
+    paises = list(adj)
+    comparar("Dijkstra, voos (todos os países)", rotas_da_origem,
+             (adj, paises, False, False, False), paises, contagens)
+    comparar("Bellman-Ford, voos (todos os países)", caminhos_da_origem,
+             (adj, paises, 0, False, False), paises, contagens)
+
+    adj = grafo_sintetico(20000, 8)
+    origens = list(adj)[:64]
+    comparar("Dijkstra, grafo sintético (20000 nós)", rotas_da_origem,
+             (adj, origens, False, False, False), origens, contagens)
+
+
+if __name__ == '__main__':
+    main()
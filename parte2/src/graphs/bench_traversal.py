@@ -0,0 +1,103 @@
+import random
+import sys
+import time
+from collections import deque
+from bfs import bfs_adj, bfs_csr
+from csr import CSRGraph
+from dfs import dfs_adj, dfs_csr
+
+
+def bfs_lista(adj, start):
+    # Versão anterior: pertinência testada contra a lista de visitados.
+    visited = []
+    queue = deque([(start, 0)])
+    seen = {start}
+    levels = {start: 0}
+    cycles = []
+
+    while queue:
+        node, level = queue.popleft()
+        visited.append(node)
+
+        for neighbor, _, _ in adj[node]:
+            if neighbor not in seen:
+                seen.add(neighbor)
+                queue.append((neighbor, level + 1))
+                levels[neighbor] = level + 1
+            elif neighbor in visited:
+                cycles.append((node, neighbor))
+
+    return visited, levels, cycles
+
+
+def dfs_lista(adj, start):
+    # Versão anterior: lista de visitados e cópia da lista de ancestrais a cada passo.
+    visited = []
+    levels = {start: 0}
+    cycles = []
+
+    def dfs_visit(node, depth, ancestors):
+        visited.append(node)
+        for neighbor, _, _ in adj[node]:
+            if neighbor not in visited:
+                levels[neighbor] = depth + 1
+                dfs_visit(neighbor, depth + 1, ancestors + [node])
+            elif neighbor in ancestors:
+                cycles.append((node, neighbor))
+
+    dfs_visit(start, 0, [])
+    return visited, levels, cycles
+
+
+def grafo_sintetico(num_nodes, arestas_por_no, seed=42):
+    rng = random.Random(seed)
+    nodes = [f"N{i}" for i in range(num_nodes)]
+    adj = {}
+    for i, u in enumerate(nodes):
+        # Uma aresta para o próximo nó garante que tudo é alcançável a partir de N0.
+        arestas = [(nodes[(i + 1) % num_nodes], 1, f"V{i}")]
+        arestas += [(rng.choice(nodes), 1, f"V{i}-{k}") for k in range(arestas_por_no - 1)]
+        adj[u] = arestas
+    return adj
+
+
+def medir(func, adj, start, repeticoes=3):
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        start_time = time.perf_counter()
+        func(adj, start)
+        melhor = min(melhor, time.perf_counter() - start_time)
+    return melhor
+
+
+def main():
+    sys.setrecursionlimit(100000)
+    tamanhos = [250, 500, 1000, 2000, 4000]
+    arestas_por_no = 20
+    limite_versao_lista = 1000
+
+    print("Tempo por elemento (ns/(V+E)); a versão com listas é quadrática e só roda nos menores tamanhos.")
+    print(f"{'V':>6} {'E':>8} | {'bfs':>8} {'dfs':>8} {'bfs csr':>8} {'dfs csr':>8} | {'bfs lista':>10} {'dfs lista':>10}")
+    for num_nodes in tamanhos:
+        adj = grafo_sintetico(num_nodes, arestas_por_no)
+        csr = CSRGraph.from_adjacency(adj)
+        total = num_nodes + num_nodes * arestas_por_no
+        ns = lambda segundos: f"{segundos / total * 1e9:.0f}"
+
+        colunas = [
+            ns(medir(bfs_adj, adj, 'N0')),
+            ns(medir(dfs_adj, adj, 'N0')),
+            ns(medir(bfs_csr, csr, 0)),
+            ns(medir(dfs_csr, csr, 0)),
+        ]
+        if num_nodes <= limite_versao_lista:
+            antigas = [ns(medir(bfs_lista, adj, 'N0', 1)), ns(medir(dfs_lista, adj, 'N0', 1))]
+        else:
+            antigas = ['-', '-']
+
+        print(f"{num_nodes:>6} {total - num_nodes:>8} | {colunas[0]:>8} {colunas[1]:>8} "
+              f"{colunas[2]:>8} {colunas[3]:>8} | {antigas[0]:>10} {antigas[1]:>10}")
+
+
+if __name__ == '__main__':
+    main()
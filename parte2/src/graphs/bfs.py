@@ -1,36 +1,71 @@
-import time
-import tracemalloc  
 from collections import deque
-from graph import build_directed_graph
-import json
+from csr import CSRGraph
+from graph import build_csr_graph, build_directed_graph
+from profiling import Profiler
+from writers import JsonStreamWriter
+import argparse
+
+def bfs_csr(graph, start):
+    offsets, targets = graph.offsets, graph.targets
+    n = len(graph)
 
-def bfs(adj, start):
     visited = []
+    queue = deque([start])
+    level = [-1] * n
+    done = bytearray(n)
+    cycles = []
+    level[start] = 0
+
+    while queue:
+        node = queue.popleft()
+        visited.append(node)
+        done[node] = 1
+        next_level = level[node] + 1
+
+        for e in range(offsets[node], offsets[node + 1]):
+            neighbor = targets[e]
+            if level[neighbor] == -1:
+                level[neighbor] = next_level
+                queue.append(neighbor)
+            elif done[neighbor]:
+                cycles.append((node, neighbor))
+
+    return visited, level, cycles
+
+
+def bfs_adj(adj, start):
+    visited = []
+    done = set()
     queue = deque([(start, 0)])  
     seen = {start}
     levels = {start: 0}
     cycles = []
 
-    tracemalloc.start()  
-    start_time = time.time()
-
     while queue:
         node, level = queue.popleft()
         visited.append(node)
+        done.add(node)
 
         for neighbor, _, _ in adj[node]:
             if neighbor not in seen:
                 seen.add(neighbor)
                 queue.append((neighbor, level + 1))
                 levels[neighbor] = level + 1
-            elif neighbor in visited:
+            elif neighbor in done:
                 cycles.append((node, neighbor))
 
-    exec_time = time.time() - start_time
-    
-    current, peak = tracemalloc.get_traced_memory()  
-    tracemalloc.stop()  
-    peak_memory_kb = peak / 1024  
+    return visited, levels, cycles
+
+
+def bfs(adj, start):
+    if isinstance(adj, CSRGraph):
+        names = adj.names
+        order, level, cycles_csr = bfs_csr(adj, adj.index[start])
+        visited = [names[u] for u in order]
+        levels = {names[u]: level[u] for u in order}
+        cycles = [(names[u], names[v]) for u, v in cycles_csr]
+    else:
+        visited, levels, cycles = bfs_adj(adj, start)
 
     return {
         "algorithm": "BFS",
@@ -38,34 +73,44 @@ def bfs(adj, start):
         "visited_order": visited,
         "levels": levels,
         "cycles": cycles,
-        "execution_time": exec_time,
-        "peak_memory_kb": peak_memory_kb  
     }
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--csr', action='store_true',
+                        help='usa a representação compacta (CSR) do grafo')
+    parser.add_argument('--snapshot', action='store_true',
+                        help='carrega o grafo de um snapshot binário (gravado na primeira execução)')
+    Profiler.add_arguments(parser)
+    JsonStreamWriter.add_arguments(parser)
+    args = parser.parse_args(argv)
+    profiler = Profiler.from_args(args)
+
     input_file = '../../data/flight_filtrado.csv'
     output_file = '../../out/percurso_voo_bfs.json'
 
-    adj = build_directed_graph(input_file)
+    if args.csr:
+        adj = build_csr_graph(input_file, snapshot=args.snapshot)
+    else:
+        adj = build_directed_graph(input_file, snapshot=args.snapshot)
     origins = list(adj.keys())[:3]  
 
-    all_results = []
-
-    for origin in origins:
-        print(f"\n🔹 Rodando BFS a partir de '{origin}'...")
-
-        bfs_result = bfs(adj, origin)
-        all_results.append({
-            "origin": origin,
-            "bfs": bfs_result
-        })
+    with JsonStreamWriter.from_args(output_file, args) as writer:
+        for origin in origins:
+            print(f"\n🔹 Rodando BFS a partir de '{origin}'...")
 
-        print(f"  BFS: {len(bfs_result['visited_order'])} nós visitados em {bfs_result['execution_time']:.6f}s, pico de memória: {bfs_result['peak_memory_kb']:.2f} KB")
+            with profiler.measure(f"bfs:{origin}") as perfil:
+                bfs_result = bfs(adj, origin)
+            writer.write({
+                "origin": origin,
+                "bfs": bfs_result,
+                "perfil": perfil.to_dict()
+            })
 
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(all_results, f, indent=4, ensure_ascii=False)
+            print(f"  BFS: {len(bfs_result['visited_order'])} nós visitados {perfil.summary()}")
 
-    print(f"\nResultados BFS salvos em '{output_file}'.")
+    print(f"\nResultados BFS salvos em '{writer.path}'.")
+    profiler.report()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
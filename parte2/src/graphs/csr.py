@@ -0,0 +1,98 @@
+from array import array
+
+
+class CSRGraph:
+    # Nós são internados como inteiros 0..n-1; as arestas de u ocupam as
+    # posições offsets[u]..offsets[u+1] de targets, weights e flight_ids.
+    def __init__(self, names, offsets, targets, weights, flight_ids, flights):
+        self.names = names
+        self.index = {n: i for i, n in enumerate(names)}
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.flight_ids = flight_ids
+        self.flights = flights
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def keys(self):
+        return list(self.names)
+
+    def num_edges(self):
+        return len(self.targets)
+
+    def edges(self, u):
+        return range(self.offsets[u], self.offsets[u + 1])
+
+    def flight(self, e):
+        return self.flights[self.flight_ids[e]]
+
+    def to_adjacency(self):
+        names, targets, weights = self.names, self.targets, self.weights
+        return {
+            names[u]: [(names[targets[e]], weights[e], self.flight(e)) for e in self.edges(u)]
+            for u in range(len(names))
+        }
+
+    @classmethod
+    def from_adjacency(cls, adjacency_list):
+        names = list(adjacency_list)
+        index = {n: i for i, n in enumerate(names)}
+        flight_index = {}
+
+        offsets = [0]
+        targets = []
+        weights = []
+        flight_ids = array('i')
+        for u in names:
+            for v, w, voo in adjacency_list[u]:
+                targets.append(index[v])
+                weights.append(w)
+                flight_ids.append(flight_index.setdefault(voo, len(flight_index)))
+            offsets.append(len(targets))
+
+        return cls(names, offsets, targets, weights, flight_ids, list(flight_index))
+
+    @staticmethod
+    def node_order(df):
+        import pandas as pd
+
+        nodes_origem = pd.unique(df['from_country'].to_numpy()).tolist()
+        nodes_destino = pd.unique(df['dest_country'].to_numpy()).tolist()
+        origem_set = set(nodes_origem)
+        return nodes_origem + [n for n in nodes_destino if n not in origem_set]
+
+    @classmethod
+    def from_flights(cls, df, names=None):
+        import numpy as np
+        import pandas as pd
+
+        if names is None:
+            names = cls.node_order(df)
+
+        origem = pd.Categorical(df['from_country'].to_numpy(), categories=names).codes
+        destino = pd.Categorical(df['dest_country'].to_numpy(), categories=names).codes
+        flight_codes, flights = pd.factorize(df['flight_number'].to_numpy(), sort=False)
+
+        ordem = origem.argsort(kind='stable')
+        offsets = [0] + np.bincount(origem, minlength=len(names)).cumsum().tolist()
+
+        # Pesos iguais compartilham o mesmo objeto int/float na lista.
+        pesos_unicos = {}
+        weights = [pesos_unicos.setdefault(w, w) for w in df['duration_minutes'].to_numpy()[ordem].tolist()]
+
+        return cls(
+            names,
+            offsets,
+            destino[ordem].tolist(),
+            weights,
+            array('i', flight_codes[ordem].astype(np.int32).tobytes()),
+            flights.tolist(),
+        )
@@ -1,31 +1,104 @@
-import time
-import json
-import tracemalloc
-from graph import build_directed_graph
+import argparse
+from csr import CSRGraph
+from graph import build_csr_graph, build_directed_graph
+from profiling import Profiler
+from writers import JsonStreamWriter
 
-def dfs(adj, start):
-    visited = []
+def dfs_csr(graph, start):
+    offsets, targets = graph.offsets, graph.targets
+    n = len(graph)
+
+    visited = [start]
+    level = [-1] * n
+    discovery = [-1] * n
+    finish = [-1] * n
+    in_stack = bytearray(n)
+    cycles = []
+
+    # Pilha explícita: nó e posição da próxima aresta a examinar, no lugar
+    # da recursão (mesma ordem de visita, sem limite de profundidade).
+    stack_nodes = [start]
+    stack_edges = [offsets[start]]
+    level[start] = 0
+    discovery[start] = 0
+    in_stack[start] = 1
+    clock = 1
+
+    while stack_nodes:
+        node = stack_nodes[-1]
+        e = stack_edges[-1]
+        end = offsets[node + 1]
+
+        while e < end:
+            neighbor = targets[e]
+            e += 1
+            if level[neighbor] == -1:
+                stack_edges[-1] = e
+                level[neighbor] = level[node] + 1
+                discovery[neighbor] = clock
+                clock += 1
+                in_stack[neighbor] = 1
+                visited.append(neighbor)
+                stack_nodes.append(neighbor)
+                stack_edges.append(offsets[neighbor])
+                break
+            elif in_stack[neighbor] and neighbor != node:
+                cycles.append((node, neighbor))
+        else:
+            stack_nodes.pop()
+            stack_edges.pop()
+            in_stack[node] = 0
+            finish[node] = clock
+            clock += 1
+
+    return visited, level, cycles, discovery, finish
+
+
+def dfs_adj(adj, start):
+    visited = [start]
     levels = {start: 0}
+    discovery = {start: 0}
+    finish = {}
+    in_stack = {start}
     cycles = []
-    
-    tracemalloc.start()
-    start_time = time.time()
-
-    def dfs_visit(node, depth, ancestors):
-        visited.append(node)
-        for neighbor, _, _ in adj[node]:
-            if neighbor not in visited:
-                levels[neighbor] = depth + 1
-                dfs_visit(neighbor, depth + 1, ancestors + [node])
-            elif neighbor in ancestors:
+
+    stack = [(start, iter(adj[start]))]
+    clock = 1
+
+    while stack:
+        node, edges = stack[-1]
+
+        for neighbor, _, _ in edges:
+            if neighbor not in levels:
+                levels[neighbor] = levels[node] + 1
+                discovery[neighbor] = clock
+                clock += 1
+                in_stack.add(neighbor)
+                visited.append(neighbor)
+                stack.append((neighbor, iter(adj[neighbor])))
+                break
+            elif neighbor in in_stack and neighbor != node:
                 cycles.append((node, neighbor))
+        else:
+            stack.pop()
+            in_stack.discard(node)
+            finish[node] = clock
+            clock += 1
 
-    dfs_visit(start, 0, [])
-    exec_time = time.time() - start_time
-    
-    current, peak = tracemalloc.get_traced_memory()  
-    tracemalloc.stop() 
-    peak_memory_kb = peak / 1024  
+    return visited, levels, cycles, discovery, finish
+
+
+def dfs(adj, start):
+    if isinstance(adj, CSRGraph):
+        names = adj.names
+        order, level, cycles_csr, disc, fin = dfs_csr(adj, adj.index[start])
+        visited = [names[u] for u in order]
+        levels = {names[u]: level[u] for u in order}
+        cycles = [(names[u], names[v]) for u, v in cycles_csr]
+        discovery = {names[u]: disc[u] for u in order}
+        finish = {names[u]: fin[u] for u in order}
+    else:
+        visited, levels, cycles, discovery, finish = dfs_adj(adj, start)
 
     return {
         "algorithm": "DFS",
@@ -33,34 +106,46 @@ def dfs(adj, start):
         "visited_order": visited,
         "levels": levels,
         "cycles": cycles,
-        "execution_time": exec_time,
-        "peak_memory_kb": peak_memory_kb 
+        "discovery": discovery,
+        "finish": finish,
     }
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--csr', action='store_true',
+                        help='usa a representação compacta (CSR) do grafo')
+    parser.add_argument('--snapshot', action='store_true',
+                        help='carrega o grafo de um snapshot binário (gravado na primeira execução)')
+    Profiler.add_arguments(parser)
+    JsonStreamWriter.add_arguments(parser)
+    args = parser.parse_args(argv)
+    profiler = Profiler.from_args(args)
+
     input_file = '../../data/flight_filtrado.csv'
     output_file = '../../out/percurso_voo_dfs.json'
 
-    adj = build_directed_graph(input_file)
+    if args.csr:
+        adj = build_csr_graph(input_file, snapshot=args.snapshot)
+    else:
+        adj = build_directed_graph(input_file, snapshot=args.snapshot)
     origins = list(adj.keys())[:3]  
 
-    all_results = []
-
-    for origin in origins:
-        print(f"\n🔹 Rodando DFS a partir de '{origin}'...")
-
-        dfs_result = dfs(adj, origin)
-        all_results.append({
-            "origin": origin,
-            "dfs": dfs_result
-        })
+    with JsonStreamWriter.from_args(output_file, args) as writer:
+        for origin in origins:
+            print(f"\n🔹 Rodando DFS a partir de '{origin}'...")
 
-        print(f"  DFS: {len(dfs_result['visited_order'])} nós visitados em {dfs_result['execution_time']:.6f}s, pico de memória: {dfs_result['peak_memory_kb']:.2f} KB")
+            with profiler.measure(f"dfs:{origin}") as perfil:
+                dfs_result = dfs(adj, origin)
+            writer.write({
+                "origin": origin,
+                "dfs": dfs_result,
+                "perfil": perfil.to_dict()
+            })
 
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(all_results, f, indent=4, ensure_ascii=False)
+            print(f"  DFS: {len(dfs_result['visited_order'])} nós visitados {perfil.summary()}")
 
-    print(f"\nResultados DFS salvos em '{output_file}'.")
+    print(f"\nResultados DFS salvos em '{writer.path}'.")
+    profiler.report()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,13 +1,24 @@
+import argparse
 import heapq
-import json
-import time
-import tracemalloc 
-from graph import build_directed_graph
+from csr import CSRGraph
+from graph import build_csr_graph, build_directed_graph
+from parallel import imap_processos
+from profiling import Profiler
+from writers import JsonStreamWriter
 
-def dijkstra(adj, src, dst):
-    if src not in adj or dst not in adj:
-        return float('inf'), [], [], []
+PAISES_DESEJADOS = [
+    "Algeria", "Argentina", "Australia", "Austria", "Brazil", "Belgium",
+    "Chile", "Columbia", "Dublin", "Egypt", "France", "Germany", "Greece",
+    "India", "Peru", "Rome", "Qatar", "Spain", "Turkey", "United Arab Emirates",
+    "United Kingdom", "Canada", "China", "Portugal", "Russia", "South Korea",
+    "United States", "Zurich", "Vietnam", "Denmark", "Ethiopia", "Indonesia",
+    "Kenya", "Japan", "Morocco", "Mexico", "Norway", "Philippines", "Malaysia",
+    "South Africa", "Singapore", "Thailand", "Taiwan", "Italy", "Netherlands",
+    "Panama", "Sweden"
+]
 
+
+def dijkstra_tree(adj, src, dst=None):
     dist = {n: float('inf') for n in adj}
     prev = {n: None for n in adj}
     prev_log = {n: None for n in adj}
@@ -34,6 +45,12 @@ def dijkstra(adj, src, dst):
                 prev_weight[v] = w
                 heapq.heappush(pq, (nd, v))
 
+    return dist, prev, prev_log, prev_weight
+
+
+def caminho_da_arvore(tree, dst):
+    dist, prev, prev_log, prev_weight = tree
+
     if dist[dst] == float('inf'):
         return float('inf'), [], [], []
 
@@ -54,98 +71,204 @@ def dijkstra(adj, src, dst):
     return dist[dst], path, logs, weights
 
 
-def main():
+def dijkstra_tree_csr(graph, src, dst=-1):
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    n = len(graph)
+
+    dist = [float('inf')] * n
+    prev = [-1] * n
+    prev_edge = [-1] * n
+
+    dist[src] = 0
+    pq = [(0, src)]
+
+    while pq:
+        d, u = heapq.heappop(pq)
+
+        if u == dst:
+            break
+        if d > dist[u]:
+            continue
+
+        for e in range(offsets[u], offsets[u + 1]):
+            v = targets[e]
+            nd = d + weights[e]
+
+            if nd < dist[v]:
+                dist[v] = nd
+                prev[v] = u
+                prev_edge[v] = e
+                heapq.heappush(pq, (nd, v))
+
+    return dist, prev, prev_edge
+
+
+def caminho_da_arvore_csr(graph, tree, dst):
+    dist, prev, prev_edge = tree
+
+    if dist[dst] == float('inf'):
+        return float('inf'), [], [], []
+
+    path, logs, weights = [], [], []
+    cur = dst
+
+    while cur != -1:
+        path.append(graph.names[cur])
+        e = prev_edge[cur]
+        if e != -1:
+            log = graph.flight(e)
+            if log:
+                logs.append(log)
+                weights.append(graph.weights[e])
+        cur = prev[cur]
+
+    path.reverse()
+    logs.reverse()
+    weights.reverse()
+
+    return dist[dst], path, logs, weights
+
+
+def dijkstra(adj, src, dst):
+    if src not in adj or dst not in adj:
+        return float('inf'), [], [], []
+
+    if isinstance(adj, CSRGraph):
+        s, t = adj.index[src], adj.index[dst]
+        return caminho_da_arvore_csr(adj, dijkstra_tree_csr(adj, s, t), t)
+
+    return caminho_da_arvore(dijkstra_tree(adj, src, dst), dst)
+
+
+def rota_json(exemplo_num, cost, path, flights, weights, src, dst, exec_time, tree_time, peak_memory_kb):
+    resultado_json = {
+        "exemplo_num": exemplo_num,
+        "origem": src,
+        "destino": dst,
+        "custo_total_minutos": cost,
+        "tempo_execucao_segundos": exec_time,
+        "tempo_arvore_segundos": tree_time,
+        "peak_memory_kb": peak_memory_kb,
+        "caminho": path,
+        "etapas": []
+    }
+
+    for j in range(len(flights)):
+        etapa = {
+            "de": path[j],
+            "para": path[j+1],
+            "voo": flights[j],
+            "duration_minutes": weights[j]
+        }
+        resultado_json["etapas"].append(etapa)
+
+    return resultado_json
+
+
+def rotas_da_origem(dados, src_country):
+    # Uma árvore de Dijkstra e todas as rotas que saem dela. Roda igual no
+    # processo principal ou em um processo do pool (dados é só leitura).
+    adj, paises_para_buscar, csr, timing, memory = dados
+    profiler = Profiler(timing=timing, memory=memory)
+
+    with profiler.measure(f"dijkstra_tree:{src_country}") as perfil:
+        if csr:
+            tree = dijkstra_tree_csr(adj, adj.index[src_country])
+        else:
+            tree = dijkstra_tree(adj, src_country)
+
+    rotas, verificadas = [], 0
+    for dst_country in paises_para_buscar:
+        if src_country == dst_country:
+            continue
+
+        verificadas += 1
+        if csr:
+            cost, path, flights, weights = caminho_da_arvore_csr(adj, tree, adj.index[dst_country])
+        else:
+            cost, path, flights, weights = caminho_da_arvore(tree, dst_country)
+
+        if cost != float('inf'):
+            rotas.append((cost, path, flights, weights, dst_country))
+
+    return rotas, verificadas, perfil
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--simples', action='store_true',
+                        help='mantém apenas o voo mais curto entre cada par de países')
+    parser.add_argument('--csr', action='store_true',
+                        help='usa a representação compacta (CSR) do grafo')
+    parser.add_argument('--snapshot', action='store_true',
+                        help='carrega o grafo de um snapshot binário (gravado na primeira execução)')
+    parser.add_argument('--processos', type=int, default=None,
+                        help='número de processos para as buscas (uma árvore por origem)')
+    Profiler.add_arguments(parser)
+    JsonStreamWriter.add_arguments(parser)
+    args = parser.parse_args(argv)
+    profiler = Profiler.from_args(args)
+
     print("--- Iniciando busca por rotas 'todos para todos' ---")
     
     csv_file_path = '../../data/flight_filtrado.csv'
     output_json_file = '../../out/percurso_voo_dijkstra.json'
     
-    paises_desejados = [
-        "Algeria", "Argentina", "Australia", "Austria", "Brazil", "Belgium",
-        "Chile", "Columbia", "Dublin", "Egypt", "France", "Germany", "Greece",
-        "India", "Peru", "Rome", "Qatar", "Spain", "Turkey", "United Arab Emirates",
-        "United Kingdom", "Canada", "China", "Portugal", "Russia", "South Korea",
-        "United States", "Zurich", "Vietnam", "Denmark", "Ethiopia", "Indonesia",
-        "Kenya", "Japan", "Morocco", "Mexico", "Norway", "Philippines", "Malaysia",
-        "South Africa", "Singapore", "Thailand", "Taiwan", "Italy", "Netherlands",
-        "Panama", "Sweden"
-    ]
-    
-    adj = build_directed_graph(csv_file_path)
+    if args.csr:
+        adj = build_csr_graph(csv_file_path, simple=args.simples, snapshot=args.snapshot)
+    else:
+        adj = build_directed_graph(csv_file_path, simple=args.simples, snapshot=args.snapshot)
     
     if not adj:
         print("ERRO: O grafo está vazio. Verifique 'flight_filtrado.csv'.")
         return
     
     paises_no_grafo = set(adj.keys())
-    paises_para_buscar = [p for p in paises_desejados if p in paises_no_grafo]
+    paises_para_buscar = [p for p in PAISES_DESEJADOS if p in paises_no_grafo]
     
-    paises_nao_encontrados = [p for p in paises_desejados if p not in paises_no_grafo]
+    paises_nao_encontrados = [p for p in PAISES_DESEJADOS if p not in paises_no_grafo]
     if paises_nao_encontrados:
         print(f"ATENÇÃO: Os seguintes países da lista não foram encontrados no grafo e serão ignorados:")
         print(f"  {', '.join(paises_nao_encontrados)}")
 
     print(f"\nIniciando busca de caminhos entre {len(paises_para_buscar)} países...")
 
-    found_examples = []
     total_rotas_calculadas = 0
 
-    for src_country in paises_para_buscar:
-        for dst_country in paises_para_buscar:
-            if src_country == dst_country:
-                continue
-            
-            total_rotas_calculadas += 1
-            tracemalloc.start() 
-            start_time = time.time()  
-            cost, path, flights, weights = dijkstra(adj, src_country, dst_country)
-            exec_time = time.time() - start_time
-            current, peak = tracemalloc.get_traced_memory()
-            tracemalloc.stop() 
-            peak_memory_kb = peak / 1024  
-
-            if cost != float('inf'):
-                found_examples.append((cost, path, flights, weights, src_country, dst_country, exec_time, peak_memory_kb))
-                
-                if len(found_examples) % 100 == 0:
-                    print(f"  ... {len(found_examples)} rotas válidas encontradas...")
+    try:
+        writer = JsonStreamWriter.from_args(output_json_file, args)
+    except OSError as e:
+        print(f"ERRO ao salvar o arquivo JSON: {e}")
+        return
 
+    # As origens são independentes; os resultados voltam na ordem de
+    # paises_para_buscar, então o arquivo é o mesmo com ou sem processos.
+    dados = (adj, paises_para_buscar, args.csr, profiler.timing, profiler.memory)
+    resultados = imap_processos(rotas_da_origem, dados, paises_para_buscar, args.processos)
 
-    print(f"\nBusca concluída. {total_rotas_calculadas} rotas potenciais verificadas.")
-    print(f"{len(found_examples)} rotas válidas (com caminho) foram encontradas.")
-
-    json_results_list = []
-    for i, example_data in enumerate(found_examples):
-        cost, path, flights, weights, src_found, dst_found, exec_time, peak_memory_kb = example_data
-        
-        resultado_json = {
-            "exemplo_num": i + 1,
-            "origem": src_found,
-            "destino": dst_found,
-            "custo_total_minutos": cost,
-            "tempo_execucao_segundos": exec_time,
-            "peak_memory_kb": peak_memory_kb, 
-            "caminho": path,
-            "etapas": []
-        }
+    with writer:
+        for src_country, (rotas, verificadas, perfil) in zip(paises_para_buscar, resultados):
+            profiler.records.append(perfil)
+            total_rotas_calculadas += verificadas
+            tree_time = perfil.elapsed_seconds
 
-        for j in range(len(flights)):
-            etapa = {
-                "de": path[j],
-                "para": path[j+1],
-                "voo": flights[j],
-                "duration_minutes": weights[j]
-            }
-            resultado_json["etapas"].append(etapa)
+            # Uma única busca atende todas as rotas desta origem: o tempo da árvore
+            # é rateado entre elas e o pico de memória é o da própria árvore.
+            exec_time = tree_time / len(rotas) if rotas and profiler.timing else tree_time
+            for cost, path, flights, weights, dst_country in rotas:
+                writer.write(rota_json(
+                    writer.count + 1, cost, path, flights, weights, src_country, dst_country,
+                    exec_time, tree_time, perfil.peak_memory_kb
+                ))
 
-        json_results_list.append(resultado_json)
+                if writer.count % 100 == 0:
+                    print(f"  ... {writer.count} rotas válidas encontradas...")
 
-    try:
-        with open(output_json_file, 'w', encoding='utf-8') as f:
-            json.dump(json_results_list, f, ensure_ascii=False, indent=4)
-        print(f"\nArquivo JSON salvo com {len(json_results_list)} rotas em '{output_json_file}'.")
-    except Exception as e:
-        print(f"ERRO ao salvar o arquivo JSON: {e}")
+    print(f"\nBusca concluída. {total_rotas_calculadas} rotas potenciais verificadas.")
+    print(f"{writer.count} rotas válidas (com caminho) foram encontradas.")
+    print(f"\nArquivo salvo com {writer.count} rotas em '{writer.path}'.")
+
+    profiler.report()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,19 +1,25 @@
-import pandas as pd
+import argparse
 import sys
+from csr import CSRGraph
+from snapshot import caminho_snapshot, carregar_snapshot, salvar_snapshot, snapshot_atualizado
+
+# numpy/pandas são importados dentro das funções que leem o CSV: quando o
+# grafo vem de um snapshot, o import do pandas seria a maior parte da partida.
+
+REQUIRED_COLS = ['from_country', 'dest_country', 'flight_number', 'duration_minutes']
+AMOSTRA_LINHAS_INVALIDAS = 5
+
+
+def load_flights(csv_path):
+    import pandas as pd
 
-def build_directed_graph(csv_path):
-    required_cols = ['from_country', 'dest_country', 'flight_number', 'duration_minutes']
-    
-    adjacency_list = {}
-    
-    all_nodes = set()
     try:
-        df = pd.read_csv(csv_path)
-        
-        if not all(col in df.columns for col in required_cols):
-            print(f"Erro: O arquivo '{csv_path}' deve conter as colunas: {required_cols}")
+        df = pd.read_csv(csv_path, usecols=lambda col: col in REQUIRED_COLS)
+
+        if not all(col in df.columns for col in REQUIRED_COLS):
+            print(f"Erro: O arquivo '{csv_path}' deve conter as colunas: {REQUIRED_COLS}")
             sys.exit()
-            
+
     except FileNotFoundError:
         print(f"Erro: Arquivo '{csv_path}' não encontrado.")
         sys.exit()
@@ -23,37 +29,156 @@ def build_directed_graph(csv_path):
 
     print(f"Arquivo '{csv_path}' lido com sucesso. Processando {len(df)} voos...")
 
-    for index, row in df.iterrows():
-        try:
-            origem = str(row['from_country']).strip()
-            destino = str(row['dest_country']).strip()
-            voo = str(row['flight_number']).strip()
-            
-            peso = pd.to_numeric(row['duration_minutes'], errors='coerce')
-
-            if pd.isna(peso) or not origem or not destino:
-                print(f"Aviso: Ignorando linha {index} (dados inválidos ou faltando)")
-                continue
-            all_nodes.add(origem)
-            all_nodes.add(destino)
-            adjacency_list.setdefault(origem, []).append((destino, peso, voo))
-            
-        except Exception as e:
-            print(f"Aviso: Erro ao processar linha {index}. Erro: {e}")
-
-    for node in all_nodes:
-        adjacency_list.setdefault(node, []) 
-    print(f"\nGrafo dirigido construído com sucesso.")
-    print(f"Total de Nós (países): {len(all_nodes)}")
-    
+    origem = df['from_country'].astype('string').str.strip()
+    destino = df['dest_country'].astype('string').str.strip()
+    voo = df['flight_number'].astype('string').str.strip()
+    peso = pd.to_numeric(df['duration_minutes'], errors='coerce')
+
+    validas = (
+        peso.notna()
+        & origem.notna() & (origem != '')
+        & destino.notna() & (destino != '')
+    ).to_numpy(dtype=bool)
+
+    invalidas = int((~validas).sum())
+    if invalidas:
+        amostra = df.index[~validas][:AMOSTRA_LINHAS_INVALIDAS].tolist()
+        print(f"Aviso: Ignorando {invalidas} linhas (dados inválidos ou faltando). Amostra de linhas: {amostra}")
+
+    peso = peso[validas]
+    if peso.dtype.kind == 'f' and (peso % 1 == 0).all():
+        peso = peso.astype('int64')
+
+    return pd.DataFrame({
+        'from_country': origem[validas].astype(object),
+        'dest_country': destino[validas].astype(object),
+        'flight_number': voo[validas].fillna('nan').astype(object),
+        'duration_minutes': peso,
+    }).reset_index(drop=True)
+
+
+def cheapest_flights(df):
+    grupos = df.groupby(['from_country', 'dest_country'], sort=False)['duration_minutes']
+    return df.loc[grupos.idxmin()].sort_index()
+
+
+def build_flight_index(df):
+    ordenado = df.sort_values(['from_country', 'dest_country', 'duration_minutes'], kind='stable')
+
+    flight_index = {}
+    for chave, grupo in ordenado.groupby(['from_country', 'dest_country'], sort=False):
+        flight_index[chave] = list(zip(grupo['duration_minutes'].tolist(), grupo['flight_number'].tolist()))
+
+    return flight_index
+
+
+def adjacency_from_flights(df, simple=False):
+    import numpy as np
+    import pandas as pd
+
+    adjacency_list = {}
+    nodes_origem = pd.unique(df['from_country'].to_numpy()).tolist()
+    nodes_destino = pd.unique(df['dest_country'].to_numpy()).tolist()
+
+    if simple:
+        df = cheapest_flights(df)
+
+    destinos = df['dest_country'].tolist()
+    pesos = df['duration_minutes'].tolist()
+    voos = df['flight_number'].tolist()
+
+    codigos = pd.Categorical(df['from_country'].to_numpy(), categories=nodes_origem).codes
+    ordem = codigos.argsort(kind='stable')
+    limites = np.bincount(codigos, minlength=len(nodes_origem)).cumsum()
+
+    inicio = 0
+    for origem, fim in zip(nodes_origem, limites.tolist()):
+        idx = ordem[inicio:fim].tolist()
+        adjacency_list[origem] = [(destinos[i], pesos[i], voos[i]) for i in idx]
+        inicio = fim
+
+    for node in nodes_destino:
+        adjacency_list.setdefault(node, [])
+
+    return adjacency_list
+
+
+def print_graph_summary(adjacency_list, simple=False):
+    tipo = "simples (voo mais curto por par)" if simple else "dirigido"
+    print(f"\nGrafo {tipo} construído com sucesso.")
+    print(f"Total de Nós (países): {len(adjacency_list)}")
+
     total_edges = sum(len(edges) for edges in adjacency_list.values())
     print(f"Total de Arestas (voos únicos de origem->destino): {total_edges}")
 
+
+def csr_graph_from_csv(csv_path, simple=False):
+    df = load_flights(csv_path)
+    return CSRGraph.from_flights(cheapest_flights(df) if simple else df, names=CSRGraph.node_order(df))
+
+
+def csr_graph_from_snapshot(csv_path, simple=False):
+    path = caminho_snapshot(csv_path, simple)
+    if snapshot_atualizado(path, csv_path, simple):
+        print(f"Snapshot '{path}' carregado (CSV inalterado).")
+        return carregar_snapshot(path)
+
+    graph = csr_graph_from_csv(csv_path, simple=simple)
+    try:
+        salvar_snapshot(graph, path, csv_path, simple)
+        print(f"Snapshot '{path}' gravado.")
+    except OSError as e:
+        print(f"Aviso: não foi possível gravar o snapshot '{path}': {e}")
+    return graph
+
+
+def build_directed_graph(csv_path, simple=False, snapshot=False):
+    if snapshot:
+        adjacency_list = csr_graph_from_snapshot(csv_path, simple=simple).to_adjacency()
+    else:
+        df = load_flights(csv_path)
+        adjacency_list = adjacency_from_flights(df, simple=simple)
+    print_graph_summary(adjacency_list, simple=simple)
     return adjacency_list
 
-def main():
+
+def build_csr_graph(csv_path, simple=False, snapshot=False):
+    if snapshot:
+        graph = csr_graph_from_snapshot(csv_path, simple=simple)
+    else:
+        graph = csr_graph_from_csv(csv_path, simple=simple)
+
+    tipo = "simples (voo mais curto por par)" if simple else "dirigido"
+    print(f"\nGrafo {tipo} (CSR) construído com sucesso.")
+    print(f"Total de Nós (países): {len(graph)}")
+    print(f"Total de Arestas (voos únicos de origem->destino): {graph.num_edges()}")
+    return graph
+
+
+def build_simple_graph(csv_path):
+    # Grafo simples mais o índice com todos os voos de cada par (origem,
+    # destino), do mais curto para o mais longo; o primeiro é o que ficou
+    # como aresta.
+    df = load_flights(csv_path)
+    adjacency_list = adjacency_from_flights(df, simple=True)
+    print_graph_summary(adjacency_list, simple=True)
+    return adjacency_list, build_flight_index(df)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--snapshot', action='store_true',
+                        help='carrega o grafo de um snapshot binário (gravado na primeira execução)')
+    parser.add_argument('--simples', action='store_true',
+                        help='mantém apenas o voo mais curto entre cada par de países e lista os demais')
+    args = parser.parse_args(argv)
+
     file_path = '../../data/flight_filtrado.csv'
-    graph = build_directed_graph(file_path)
+    flight_index = None
+    if args.simples:
+        graph, flight_index = build_simple_graph(file_path)
+    else:
+        graph = build_directed_graph(file_path, snapshot=args.snapshot)
     
     print("\n--- AMOSTRA DA LISTA DE ADJACÊNCIA (GRAFO) ---")
     
@@ -73,6 +198,10 @@ def main():
                     print(f"     ... (e mais {len(arestas) - 3})")
                     break
                 print(f"     - Destino: '{destino}' (Peso: {peso}, Voo: {voo})")
+                if flight_index is not None:
+                    outros = flight_index[(origem, destino)][1:]
+                    if outros:
+                        print(f"       (+{len(outros)} voos alternativos, o próximo: {outros[0][1]} com peso {outros[0][0]})")
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -1,5 +1,13 @@
-import pandas as pd
+import argparse
 import sys
+import time
+import numpy as np
+import pandas as pd
+
+try:
+    import resource
+except ImportError:
+    resource = None
 
 input_file = "../../data/flight.csv"
 output_file = "../../data/flight_filtrado.csv"
@@ -7,27 +15,57 @@ output_file = "../../data/flight_filtrado.csv"
 required_cols = ['from_country', 'dest_country', 'flight_number', 'departure_time', 'arrival_time']
 final_cols = ['from_country', 'dest_country', 'flight_number', 'duration_minutes']
 
-print(f"Iniciando o processo de filtragem...")
-print(f"Arquivo de entrada: {input_file}")
-print(f"Arquivo de saída: {output_file}")
+# Tipos explícitos para a leitura em blocos: sem eles o pandas infere os
+# tipos a cada bloco (e pode inferir tipos diferentes entre blocos).
+dtypes = {
+    'from_country': 'category',
+    'dest_country': 'category',
+    'flight_number': 'string',
+    'departure_time': 'string',
+    'arrival_time': 'string',
+}
+CHUNKSIZE = 200_000
 
-try:
+
+def colunas_faltando(input_file):
+    colunas = pd.read_csv(input_file, nrows=0).columns
+    return [col for col in required_cols if col not in colunas]
+
+
+def imprimir_colunas_faltando(input_file, missing_cols):
+    print("\n--- ERRO ---")
+    print(f"O arquivo '{input_file}' não contém as seguintes colunas obrigatórias:")
+    for col in missing_cols:
+        print(f"- {col}")
+    print("O arquivo filtrado NÃO foi gerado.")
+
+
+def calcular_duracao(df_filtrado):
+    df_filtrado['departure_time'] = pd.to_datetime(df_filtrado['departure_time'], errors='coerce')
+    df_filtrado['arrival_time'] = pd.to_datetime(df_filtrado['arrival_time'], errors='coerce')
+
+    linhas_antes_nat = len(df_filtrado)
+    df_filtrado = df_filtrado.dropna(subset=['departure_time', 'arrival_time'])
+    linhas_removidas_nat = linhas_antes_nat - len(df_filtrado)
+
+    duracao_timedelta = df_filtrado['arrival_time'] - df_filtrado['departure_time']
+    df_filtrado['duration_minutes'] = (duracao_timedelta.dt.total_seconds() / 60).astype(int)
+    return df_filtrado, linhas_removidas_nat
+
+
+def filtrar_em_memoria(input_file, output_file):
     print(f"Lendo '{input_file}'...")
     df = pd.read_csv(input_file)
     print("Leitura concluída.")
 
     missing_cols = [col for col in required_cols if col not in df.columns]
-    
+
     if missing_cols:
-        print("\n--- ERRO ---")
-        print(f"O arquivo '{input_file}' não contém as seguintes colunas obrigatórias:")
-        for col in missing_cols:
-            print(f"- {col}")
-        print("O arquivo filtrado NÃO foi gerado.")
-        sys.exit() 
+        imprimir_colunas_faltando(input_file, missing_cols)
+        sys.exit()
 
     print(f"Filtrando pelas colunas necessárias para o processo: {required_cols}")
-    df_filtrado = df[required_cols].copy() 
+    df_filtrado = df[required_cols].copy()
     linhas_antes_null = len(df_filtrado)
     print(f"Removendo linhas com valores nulos... (Total atual: {linhas_antes_null} linhas)")
     df_filtrado = df_filtrado.dropna()
@@ -35,20 +73,10 @@ try:
     print(f"{linhas_removidas_null} linhas com valores nulos foram removidas.")
 
     if not df_filtrado.empty:
-        print("Convertendo 'departure_time' e 'arrival_time' para formato de data...")
-        
-        df_filtrado['departure_time'] = pd.to_datetime(df_filtrado['departure_time'], errors='coerce')
-        df_filtrado['arrival_time'] = pd.to_datetime(df_filtrado['arrival_time'], errors='coerce')
-
-        linhas_antes_nat = len(df_filtrado)
-        df_filtrado = df_filtrado.dropna(subset=['departure_time', 'arrival_time'])
-        linhas_removidas_nat = linhas_antes_nat - len(df_filtrado)
+        print("Convertendo 'departure_time' e 'arrival_time' para formato de data e calculando a duração do voo em minutos...")
+        df_filtrado, linhas_removidas_nat = calcular_duracao(df_filtrado)
         if linhas_removidas_nat > 0:
             print(f"{linhas_removidas_nat} linhas removidas por terem datas inválidas ('NaT').")
-
-        print("Calculando a duração do voo em minutos...")
-        duracao_timedelta = df_filtrado['arrival_time'] - df_filtrado['departure_time']
-        df_filtrado['duration_minutes'] = (duracao_timedelta.dt.total_seconds() / 60).astype(int)
         print(f"Nova coluna 'duration_minutes' criada.")
 
         print(f"Removendo voos duplicados (com base em 'flight_number')... (Total atual: {len(df_filtrado)} linhas)")
@@ -62,22 +90,154 @@ try:
 
     print(f"Selecionando colunas finais para o output: {final_cols}")
     df_filtrado = df_filtrado[final_cols]
-    
+
     df_filtrado.to_csv(output_file, index=False)
-    
-    print("\n--- SUCESSO ---")
-    print(f"O arquivo '{output_file}' foi gerado com sucesso.")
-    print(f"Total de linhas processadas: {len(df_filtrado)}")
-
-except FileNotFoundError:
-    print(f"\n--- ERRO ---")
-    print(f"O arquivo '{input_file}' não foi encontrado.")
-    print(f"Por favor, verifique o caminho e o nome do arquivo '{input_file}'.")
-
-except pd.errors.EmptyDataError:
-    print(f"\n--- ERRO ---")
-    print(f"O arquivo '{input_file}' está vazio.")
-
-except Exception as e:
-    print(f"\n--- ERRO INESPERADO ---")
-    print(f"Ocorreu um erro: {e}")
\ No newline at end of file
+    return len(df), len(df_filtrado)
+
+
+class HashesVistos:
+    # Conjunto compacto dos números de voo já gravados: hashes de 64 bits
+    # (8 bytes por voo) guardados em "corridas" ordenadas, cada uma maior
+    # que a soma das seguintes. O bloco novo vira uma corrida e só é fundido
+    # com as do fim enquanto elas não forem maiores que ele, então cada hash
+    # é recopiado O(log n) vezes no total e uma consulta faz uma busca
+    # binária em cada uma das O(log n) corridas.
+    #
+    # Dois números de voo diferentes com o mesmo hash seriam tratados como
+    # duplicata. Com n voos distintos a chance de haver alguma colisão é
+    # cerca de n² / 2^65 (~3e-4 para 100 milhões), risco aceito em troca de
+    # não guardar as strings.
+    def __init__(self):
+        self.corridas = []
+
+    def __len__(self):
+        return sum(len(corrida) for corrida in self.corridas)
+
+    def contem(self, hashes):
+        encontrados = np.zeros(len(hashes), dtype=bool)
+        for corrida in self.corridas:
+            posicoes = np.minimum(np.searchsorted(corrida, hashes), len(corrida) - 1)
+            encontrados |= corrida[posicoes] == hashes
+        return encontrados
+
+    def adicionar(self, hashes):
+        # hashes: ordenados, sem repetição e nenhum já presente no conjunto.
+        if not len(hashes):
+            return
+        nova = hashes
+        while self.corridas and len(self.corridas[-1]) <= len(nova):
+            nova = np.sort(np.concatenate((self.corridas.pop(), nova)), kind='stable')
+        self.corridas.append(nova)
+
+
+def deduplicar_bloco(df, vistos):
+    # Mantém a primeira ocorrência de cada número de voo que ainda não está
+    # em vistos (HashesVistos) e acrescenta os novos ao conjunto.
+    hashes = pd.util.hash_array(df['flight_number'].to_numpy(dtype=object))
+
+    unicos, primeiros = np.unique(hashes, return_index=True)
+    novos = ~vistos.contem(unicos)
+
+    manter = np.zeros(len(df), dtype=bool)
+    manter[primeiros[novos]] = True
+    vistos.adicionar(unicos[novos])
+    return df[manter]
+
+
+def filtrar_em_blocos(input_file, output_file, chunksize=CHUNKSIZE):
+    missing_cols = colunas_faltando(input_file)
+    if missing_cols:
+        imprimir_colunas_faltando(input_file, missing_cols)
+        sys.exit()
+
+    print(f"Lendo '{input_file}' em blocos de {chunksize} linhas (colunas: {required_cols})...")
+
+    vistos = HashesVistos()
+    linhas_lidas = 0
+    linhas_gravadas = 0
+    removidas_null = removidas_nat = removidas_duplicatas = 0
+
+    # O cabeçalho é gravado uma vez; cada bloco só acrescenta suas linhas.
+    pd.DataFrame(columns=final_cols).to_csv(output_file, index=False)
+
+    blocos = pd.read_csv(input_file, usecols=required_cols, dtype=dtypes, chunksize=chunksize)
+    for i, bloco in enumerate(blocos):
+        linhas_lidas += len(bloco)
+
+        df_filtrado = bloco[required_cols].dropna()
+        removidas_null += len(bloco) - len(df_filtrado)
+
+        if not df_filtrado.empty:
+            df_filtrado, linhas_removidas_nat = calcular_duracao(df_filtrado)
+            removidas_nat += linhas_removidas_nat
+
+            linhas_antes_duplicatas = len(df_filtrado)
+            df_filtrado = deduplicar_bloco(df_filtrado, vistos)
+            removidas_duplicatas += linhas_antes_duplicatas - len(df_filtrado)
+
+            df_filtrado[final_cols].to_csv(output_file, mode='a', header=False, index=False)
+            linhas_gravadas += len(df_filtrado)
+
+        print(f"  Bloco {i + 1}: {linhas_lidas} linhas lidas, {linhas_gravadas} gravadas...")
+
+    print(f"{removidas_null} linhas com valores nulos foram removidas.")
+    if removidas_nat > 0:
+        print(f"{removidas_nat} linhas removidas por terem datas inválidas ('NaT').")
+    print(f"{removidas_duplicatas} linhas duplicadas (flight_number) foram removidas.")
+    return linhas_lidas, linhas_gravadas
+
+
+def pico_rss_mb():
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss vem em KB no Linux e em bytes no macOS.
+    return pico / (1024 * 1024) if sys.platform == 'darwin' else pico / 1024
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--entrada', default=input_file, help='CSV bruto de voos')
+    parser.add_argument('--saida', default=output_file, help='CSV filtrado gerado')
+    parser.add_argument('--blocos', action='store_true',
+                        help='processa o CSV em blocos, sem carregá-lo inteiro na memória')
+    parser.add_argument('--chunksize', type=int, default=CHUNKSIZE,
+                        help='linhas por bloco no modo --blocos')
+    args = parser.parse_args(argv)
+
+    print(f"Iniciando o processo de filtragem...")
+    print(f"Arquivo de entrada: {args.entrada}")
+    print(f"Arquivo de saída: {args.saida}")
+
+    try:
+        start_time = time.perf_counter()
+        if args.blocos:
+            linhas_lidas, linhas_gravadas = filtrar_em_blocos(args.entrada, args.saida, args.chunksize)
+        else:
+            linhas_lidas, linhas_gravadas = filtrar_em_memoria(args.entrada, args.saida)
+        elapsed = time.perf_counter() - start_time
+
+        print("\n--- SUCESSO ---")
+        print(f"O arquivo '{args.saida}' foi gerado com sucesso.")
+        print(f"Total de linhas processadas: {linhas_gravadas}")
+        print(f"Vazão: {linhas_lidas / elapsed:,.0f} linhas/s ({linhas_lidas} linhas lidas em {elapsed:.2f}s)")
+        pico = pico_rss_mb()
+        if pico is not None:
+            print(f"Pico de memória (RSS): {pico:.1f} MB")
+
+    except FileNotFoundError:
+        print(f"\n--- ERRO ---")
+        print(f"O arquivo '{args.entrada}' não foi encontrado.")
+        print(f"Por favor, verifique o caminho e o nome do arquivo '{args.entrada}'.")
+
+    except pd.errors.EmptyDataError:
+        print(f"\n--- ERRO ---")
+        print(f"O arquivo '{args.entrada}' está vazio.")
+
+    except Exception as e:
+        print(f"\n--- ERRO INESPERADO ---")
+        print(f"Ocorreu um erro: {e}")
+
+
+if __name__ == '__main__':
+    main()
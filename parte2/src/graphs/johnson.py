@@ -0,0 +1,118 @@
+from array import array
+from bellman_ford import bellman_ford
+from dijkstra import dijkstra_tree
+from parallel import imap_processos
+
+VIRTUAL_SOURCE = ('__johnson__',)
+
+
+def potenciais(graph):
+    aux = dict(graph)
+    aux[VIRTUAL_SOURCE] = [(v, 0, None) for v in graph]
+
+    h, _, has_neg = bellman_ford(aux, VIRTUAL_SOURCE)
+    if has_neg:
+        return None
+
+    del h[VIRTUAL_SOURCE]
+    return h
+
+
+def reponderar(graph, h):
+    # O peso original segue junto do voo para que a árvore devolva o valor real.
+    return {
+        u: [(v, w + h[u] - h[v], (log, w)) for v, w, log in arestas]
+        for u, arestas in graph.items()
+    }
+
+
+def _linha_worker(dados, src):
+    adj, nodes, index, h = dados
+    return _linha(adj, src, nodes, index, h)
+
+
+def _linha(adj, src, nodes, index, h):
+    dist_rw, prev, prev_log, _ = dijkstra_tree(adj, src)
+
+    dist = []
+    pred = array('l')
+    pred_flight = []
+    pred_weight = []
+    for v in nodes:
+        d = dist_rw[v]
+        dist.append(d - h[src] + h[v] if d != float('inf') else d)
+        if prev[v] is None:
+            pred.append(-1)
+            pred_flight.append(None)
+            pred_weight.append(None)
+        else:
+            pred.append(index[prev[v]])
+            log, w = prev_log[v]
+            pred_flight.append(log)
+            pred_weight.append(w)
+
+    return dist, pred, pred_flight, pred_weight
+
+
+def johnson(graph, sources=None, processes=None):
+    h = potenciais(graph)
+    if h is None:
+        print("ERRO: Ciclo negativo detectado; Johnson não se aplica a este grafo.")
+        return None
+
+    adj = reponderar(graph, h)
+    nodes = list(graph)
+    index = {n: i for i, n in enumerate(nodes)}
+    sources = list(graph) if sources is None else list(sources)
+
+    linhas = list(imap_processos(_linha_worker, (adj, nodes, index, h), sources, processes))
+
+    return {
+        "nodes": nodes,
+        "index": index,
+        "sources": sources,
+        "source_index": {n: i for i, n in enumerate(sources)},
+        "dist": [linha[0] for linha in linhas],
+        "pred": [linha[1] for linha in linhas],
+        "pred_flight": [linha[2] for linha in linhas],
+        "pred_weight": [linha[3] for linha in linhas],
+    }
+
+
+def caminho_da_matriz(resultado, origem, destino):
+    i = resultado["source_index"][origem]
+    j = resultado["index"][destino]
+    nodes = resultado["nodes"]
+    cost = resultado["dist"][i][j]
+
+    if cost == float('inf'):
+        return float('inf'), [], [], []
+
+    pred = resultado["pred"][i]
+    pred_flight = resultado["pred_flight"][i]
+    pred_weight = resultado["pred_weight"][i]
+
+    path, flights, weights = [], [], []
+    cur = j
+    while cur != -1:
+        path.append(nodes[cur])
+        if pred[cur] != -1:
+            flights.append(pred_flight[cur])
+            weights.append(pred_weight[cur])
+        cur = pred[cur]
+
+    path.reverse()
+    flights.reverse()
+    weights.reverse()
+
+    return cost, path, flights, weights
+
+
+def rotas_da_matriz(resultado, origens, destinos):
+    for src in origens:
+        for dst in destinos:
+            if src == dst:
+                continue
+            cost, path, flights, weights = caminho_da_matriz(resultado, src, dst)
+            if cost != float('inf'):
+                yield cost, path, flights, weights, src, dst
@@ -0,0 +1,51 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+# (func, dados) da execução em andamento. Com fork, os processos filhos
+# herdam este valor por cópia-na-escrita: o grafo não é serializado.
+_tarefa = None
+
+
+def _init_worker(func, dados):
+    global _tarefa
+    _tarefa = (func, dados)
+
+
+def _executar(item):
+    func, dados = _tarefa
+    return func(dados, item)
+
+
+def imap_processos(func, dados, itens, processos=None):
+    # Aplica func(dados, item) a cada item e entrega os resultados na ordem
+    # dos itens, qualquer que seja o processo que calculou cada um, à medida
+    # que ficam prontos. dados é só leitura; func precisa ser uma função de
+    # módulo (nível superior).
+    global _tarefa
+    itens = list(itens)
+    if not processos or processos <= 1 or len(itens) <= 1:
+        for item in itens:
+            yield func(dados, item)
+        return
+
+    processos = min(processos, len(itens))
+    chunksize = max(1, len(itens) // (4 * processos))
+
+    if 'fork' in multiprocessing.get_all_start_methods():
+        # Os processos são criados dentro do pool.map, enquanto _tarefa
+        # ainda aponta para estes dados.
+        _tarefa = (func, dados)
+        try:
+            with ProcessPoolExecutor(max_workers=processos,
+                                     mp_context=multiprocessing.get_context('fork')) as pool:
+                resultados = pool.map(_executar, itens, chunksize=chunksize)
+                _tarefa = None
+                yield from resultados
+        finally:
+            _tarefa = None
+        return
+
+    # Sem fork (Windows, por exemplo) os dados vão uma vez para cada processo.
+    with ProcessPoolExecutor(max_workers=processos, initializer=_init_worker,
+                             initargs=(func, dados)) as pool:
+        yield from pool.map(_executar, itens, chunksize=chunksize)
@@ -0,0 +1,89 @@
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+class ProfileRecord:
+    def __init__(self, name):
+        self.name = name
+        self.elapsed_ns = None
+        self.peak_memory_kb = None
+
+    @property
+    def elapsed_seconds(self):
+        return None if self.elapsed_ns is None else self.elapsed_ns / 1e9
+
+    def summary(self):
+        partes = []
+        if self.elapsed_ns is not None:
+            partes.append(f"em {self.elapsed_seconds:.6f}s")
+        if self.peak_memory_kb is not None:
+            partes.append(f"pico de memória: {self.peak_memory_kb:.2f} KB")
+        return ", ".join(partes)
+
+    def to_dict(self):
+        return {
+            "etapa": self.name,
+            "tempo_execucao_segundos": self.elapsed_seconds,
+            "peak_memory_kb": self.peak_memory_kb,
+        }
+
+
+class Profiler:
+    # Tempo via perf_counter_ns é barato e fica ligado por padrão; o
+    # tracemalloc deixa cada alocação mais lenta, então só roda se pedido.
+    def __init__(self, timing=True, memory=False):
+        self.timing = timing
+        self.memory = memory
+        self.records = []
+
+    @classmethod
+    def from_args(cls, args):
+        return cls(timing=not args.sem_perfil, memory=args.perfil_memoria and not args.sem_perfil)
+
+    @staticmethod
+    def add_arguments(parser):
+        parser.add_argument('--sem-perfil', action='store_true',
+                            help='não mede tempo nem memória')
+        parser.add_argument('--perfil-memoria', action='store_true',
+                            help='mede o pico de memória com tracemalloc (deixa a execução mais lenta)')
+
+    @contextmanager
+    def measure(self, name):
+        record = ProfileRecord(name)
+
+        started_tracing = False
+        if self.memory:
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+                started_tracing = True
+
+        start = time.perf_counter_ns() if self.timing else None
+        try:
+            yield record
+        finally:
+            if self.timing:
+                record.elapsed_ns = time.perf_counter_ns() - start
+            if self.memory:
+                _, peak = tracemalloc.get_traced_memory()
+                record.peak_memory_kb = peak / 1024
+                if started_tracing:
+                    tracemalloc.stop()
+            self.records.append(record)
+
+    def report(self):
+        if not self.timing:
+            return
+
+        totais = {}
+        for record in self.records:
+            etapa = record.name.split(':')[0]
+            total, quantidade = totais.get(etapa, (0, 0))
+            totais[etapa] = (total + record.elapsed_ns, quantidade + 1)
+
+        print("\n--- PERFIL DE EXECUÇÃO ---")
+        for etapa, (total, quantidade) in totais.items():
+            print(f"  {etapa}: {quantidade} medições, {total / 1e9:.6f}s no total, "
+                  f"{total / quantidade / 1e3:.1f} µs em média")
@@ -0,0 +1,69 @@
+from collections import OrderedDict
+from bellman_ford import bellman_ford, reconstruir_caminho, rota_json
+from dijkstra import dijkstra
+from graph import build_directed_graph
+from profiling import Profiler
+
+ALGORITMOS = ['Dijkstra', 'Bellman-Ford']
+MAX_ROTAS_EM_CACHE = 4096
+
+
+class RouteService:
+    # Carrega o grafo uma vez e responde (origem, destino, algoritmo) sob
+    # demanda. As respostas ficam em um LRU limitado cuja chave inclui a
+    # versão do grafo: trocar o grafo invalida todas de uma vez.
+    def __init__(self, graph, max_entries=MAX_ROTAS_EM_CACHE, profiler=None):
+        self.graph = graph
+        self.version = 0
+        self.max_entries = max_entries
+        self.profiler = profiler or Profiler()
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_csv(cls, csv_path, snapshot=False, **kwargs):
+        return cls(build_directed_graph(csv_path, snapshot=snapshot), **kwargs)
+
+    def nodes(self):
+        return sorted(self.graph)
+
+    def set_graph(self, graph):
+        self.graph = graph
+        self.version += 1
+        self.cache.clear()
+
+    def route(self, origem, destino, algoritmo='Dijkstra'):
+        if algoritmo not in ALGORITMOS:
+            raise ValueError(f"Algoritmo desconhecido: {algoritmo}")
+
+        key = (self.version, origem, destino, algoritmo)
+        if key in self.cache:
+            self.hits += 1
+            self.cache.move_to_end(key)
+            return self.cache[key]
+
+        self.misses += 1
+        resultado = self._calcular(origem, destino, algoritmo)
+
+        self.cache[key] = resultado
+        if len(self.cache) > self.max_entries:
+            self.cache.popitem(last=False)
+        return resultado
+
+    def _calcular(self, origem, destino, algoritmo):
+        if origem not in self.graph or destino not in self.graph:
+            return None
+
+        with self.profiler.measure(f"{algoritmo}:{origem}->{destino}") as perfil:
+            if algoritmo == 'Dijkstra':
+                cost, path, flights, weights = dijkstra(self.graph, origem, destino)
+            else:
+                dist, pred, _ = bellman_ford(self.graph, origem)
+                cost = dist[destino]
+                path, flights, weights = reconstruir_caminho(pred, origem, destino)
+
+        if cost == float('inf'):
+            return None
+        return rota_json(None, cost, path, flights, weights, origem, destino,
+                         perfil.elapsed_seconds, perfil.peak_memory_kb)
@@ -0,0 +1,31 @@
+from writers import iter_json_records
+
+
+class RouteStore:
+    # Índice das rotas pré-calculadas (saída do dijkstra.py/bellman_ford.py)
+    # por (origem, destino), com as listas de origens, destinos e nós já
+    # prontas para os seletores da interface.
+    def __init__(self, routes):
+        self.routes = routes
+
+        origins, destinations, nodes = set(), set(), set()
+        for (origem, destino), registro in routes.items():
+            origins.add(origem)
+            destinations.add(destino)
+            for etapa in registro.get("etapas", []):
+                nodes.add(etapa["de"])
+                nodes.add(etapa["para"])
+
+        self.origins = sorted(origins)
+        self.destinations = sorted(destinations)
+        self.nodes = sorted(nodes)
+
+    @classmethod
+    def from_json(cls, path):
+        return cls({(r["origem"], r["destino"]): r for r in iter_json_records(path)})
+
+    def __len__(self):
+        return len(self.routes)
+
+    def get(self, origem, destino):
+        return self.routes.get((origem, destino))
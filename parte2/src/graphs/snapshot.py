@@ -0,0 +1,166 @@
+import hashlib
+import mmap
+import os
+import struct
+from array import array
+from csr import CSRGraph
+
+MAGIC = b'GRAFOCSR'
+VERSAO = 1
+
+# magic, versão, simples, tipo dos pesos ('q' ou 'd'), mtime_ns e tamanho do
+# CSV de origem, sha256 do CSV, número de nós, de arestas e de voos.
+CABECALHO = struct.Struct('<8sHBcqQ32sQQQ')
+OFFSET_MTIME = struct.calcsize('<8sHBc')
+
+
+class TabelaDeTextos:
+    # Tabela de strings UTF-8 dentro do snapshot; cada item só é
+    # decodificado quando alguém pede por ele.
+    def __init__(self, offsets, blob):
+        self.offsets = offsets
+        self.blob = blob
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return str(self.blob[self.offsets[i]:self.offsets[i + 1]], 'utf-8')
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+
+class GrafoMapeado(CSRGraph):
+    # CSRGraph cujas listas são fatias do mmap do snapshot. memoryview não
+    # pode ser serializada, então quem recebe o grafo por pickle (processos
+    # criados sem fork) reabre o mesmo arquivo em vez de receber uma cópia.
+    def __init__(self, path, *args):
+        super().__init__(*args)
+        self.path = os.path.abspath(path)
+
+    def __reduce__(self):
+        return carregar_snapshot, (self.path,)
+
+
+def caminho_snapshot(csv_path, simple=False):
+    base, _ = os.path.splitext(csv_path)
+    return base + ('_simples' if simple else '') + '.grafo'
+
+
+def sha256_arquivo(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for bloco in iter(lambda: f.read(1 << 20), b''):
+            h.update(bloco)
+    return h.digest()
+
+
+def _alinhar(f):
+    resto = f.tell() % 8
+    if resto:
+        f.write(b'\0' * (8 - resto))
+
+
+def _escrever_textos(f, textos):
+    codificados = [t.encode('utf-8') for t in textos]
+    offsets = array('q', [0])
+    for c in codificados:
+        offsets.append(offsets[-1] + len(c))
+    f.write(offsets.tobytes())
+    f.write(b''.join(codificados))
+    _alinhar(f)
+
+
+def salvar_snapshot(graph, path, csv_path, simple=False):
+    st = os.stat(csv_path)
+    tipo_peso = b'q' if all(isinstance(w, int) for w in graph.weights) else b'd'
+    cabecalho = CABECALHO.pack(
+        MAGIC, VERSAO, int(simple), tipo_peso, st.st_mtime_ns, st.st_size, sha256_arquivo(csv_path),
+        len(graph), graph.num_edges(), len(graph.flights),
+    )
+
+    # Grava em um arquivo temporário e troca no final para que uma
+    # execução interrompida nunca deixe um snapshot pela metade.
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(cabecalho)
+        _alinhar(f)
+        _escrever_textos(f, graph.names)
+        f.write(array('q', graph.offsets).tobytes())
+        f.write(array('i', graph.targets).tobytes())
+        _alinhar(f)
+        f.write(array(tipo_peso.decode(), graph.weights).tobytes())
+        f.write(array('i', graph.flight_ids).tobytes())
+        _alinhar(f)
+        _escrever_textos(f, graph.flights)
+    os.replace(tmp_path, path)
+
+
+def _ler_cabecalho(path):
+    with open(path, 'rb') as f:
+        dados = f.read(CABECALHO.size)
+    if len(dados) < CABECALHO.size:
+        return None
+    return CABECALHO.unpack(dados)
+
+
+def snapshot_atualizado(path, csv_path, simple=False):
+    if not os.path.exists(path):
+        return False
+
+    cabecalho = _ler_cabecalho(path)
+    if cabecalho is None:
+        return False
+    magic, versao, simples, _, mtime_ns, tamanho, digest, _, _, _ = cabecalho
+    if magic != MAGIC or versao != VERSAO or simples != int(simple):
+        return False
+
+    st = os.stat(csv_path)
+    if st.st_size != tamanho:
+        return False
+    if st.st_mtime_ns == mtime_ns:
+        return True
+    # O mtime mudou (cópia, checkout...): só o conteúdo decide. Se for o
+    # mesmo, o novo mtime é gravado para evitar o hash nas próximas vezes.
+    if sha256_arquivo(csv_path) != digest:
+        return False
+    with open(path, 'r+b') as f:
+        f.seek(OFFSET_MTIME)
+        f.write(struct.pack('<q', st.st_mtime_ns))
+    return True
+
+
+def carregar_snapshot(path):
+    with open(path, 'rb') as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    # As fatias de memoryview apontam direto para o mmap: nada é copiado.
+    buf = memoryview(mm)
+    _, _, _, tipo_peso, _, _, _, num_nodes, num_edges, num_flights = CABECALHO.unpack_from(buf)
+    pos = CABECALHO.size + (-CABECALHO.size % 8)
+
+    def secao(formato, quantidade):
+        nonlocal pos
+        tamanho = quantidade * struct.calcsize(formato)
+        view = buf[pos:pos + tamanho].cast(formato)
+        pos += tamanho
+        pos += -pos % 8
+        return view
+
+    def textos(quantidade):
+        nonlocal pos
+        offsets = secao('q', quantidade + 1)
+        blob = buf[pos:pos + offsets[quantidade]]
+        pos += offsets[quantidade]
+        pos += -pos % 8
+        return TabelaDeTextos(offsets, blob)
+
+    names = list(textos(num_nodes))
+    offsets = secao('q', num_nodes + 1)
+    targets = secao('i', num_edges)
+    weights = secao(tipo_peso.decode(), num_edges)
+    flight_ids = secao('i', num_edges)
+    flights = textos(num_flights)
+
+    return GrafoMapeado(path, names, offsets, targets, weights, flight_ids, flights)
@@ -0,0 +1,315 @@
+import argparse
+import csv
+import json
+import os
+import time
+from dijkstra import PAISES_DESEJADOS, caminho_da_arvore, dijkstra_tree, rota_json
+from graph import build_directed_graph
+from profiling import Profiler
+from snapshot import sha256_arquivo
+from writers import JsonStreamWriter, iter_json_records
+
+ACOES = ['adicionar', 'remover', 'alterar']
+VERSAO_ESTADO = 1
+
+
+class DynamicRoutes:
+    # Mantém uma árvore de Dijkstra por origem sobre uma lista de adjacência
+    # que pode ser alterada voo a voo. Cada alteração só invalida as origens
+    # cuja árvore ela pode mudar; refresh() recalcula apenas essas. Árvores
+    # já conhecidas (de um estado salvo) podem ser passadas em trees: só as
+    # origens sem árvore são calculadas na criação.
+    def __init__(self, adj, sources, trees=None, profiler=None):
+        self.adj = adj
+        self.sources = list(sources)
+        self.trees = dict(trees or {})
+        self.perfis = {}
+        self.dirty = {src for src in self.sources if src not in self.trees}
+        self.refresh(profiler)
+
+    def _garantir_no(self, node):
+        if node in self.adj:
+            return
+        self.adj[node] = []
+        for dist, prev, prev_log, prev_weight in self.trees.values():
+            dist[node] = float('inf')
+            prev[node] = None
+            prev_log[node] = None
+            prev_weight[node] = None
+
+    def _invalidar_se_melhora(self, u, v, w):
+        # Uma aresta nova (ou mais barata) só muda a árvore se alcançar v com
+        # custo menor ou igual ao atual; no empate o Dijkstra pode escolhê-la.
+        for src in self.sources:
+            if src in self.dirty:
+                continue
+            dist = self.trees[src][0]
+            if dist[u] != float('inf') and dist[u] + w <= dist[v]:
+                self.dirty.add(src)
+
+    def _invalidar_se_aresta_da_arvore(self, u, v, w, voo):
+        # Remover (ou encarecer) uma aresta fora da árvore não muda nenhuma distância.
+        for src in self.sources:
+            if src in self.dirty:
+                continue
+            _, prev, prev_log, prev_weight = self.trees[src]
+            if prev[v] == u and prev_log[v] == voo and prev_weight[v] == w:
+                self.dirty.add(src)
+
+    def add_flight(self, orig, dest, weight, voo):
+        if weight < 0:
+            raise ValueError(f"Peso negativo não é suportado pelo Dijkstra: {orig} -> {dest} ({voo})")
+        self._garantir_no(orig)
+        self._garantir_no(dest)
+        self.adj[orig].append((dest, weight, voo))
+        self._invalidar_se_melhora(orig, dest, weight)
+
+    def remove_flight(self, orig, dest, voo):
+        arestas = self.adj.get(orig, [])
+        mantidas = [a for a in arestas if a[0] != dest or a[2] != voo]
+        if len(mantidas) == len(arestas):
+            return 0
+
+        self.adj[orig] = mantidas
+        for v, w, log in arestas:
+            if v == dest and log == voo:
+                self._invalidar_se_aresta_da_arvore(orig, dest, w, voo)
+        return len(arestas) - len(mantidas)
+
+    def reweight_flight(self, orig, dest, voo, weight):
+        if weight < 0:
+            raise ValueError(f"Peso negativo não é suportado pelo Dijkstra: {orig} -> {dest} ({voo})")
+
+        alteradas = 0
+        arestas = self.adj.get(orig, [])
+        for i, (v, w, log) in enumerate(arestas):
+            if v != dest or log != voo or w == weight:
+                continue
+            arestas[i] = (v, weight, log)
+            if weight < w:
+                self._invalidar_se_melhora(orig, dest, weight)
+            else:
+                self._invalidar_se_aresta_da_arvore(orig, dest, w, voo)
+            alteradas += 1
+        return alteradas
+
+    def refresh(self, profiler=None):
+        profiler = profiler or Profiler(timing=False)
+        afetadas = [src for src in self.sources if src in self.dirty]
+        for src in afetadas:
+            with profiler.measure(f"dijkstra_tree:{src}") as perfil:
+                self.trees[src] = dijkstra_tree(self.adj, src)
+            self.perfis[src] = perfil
+        self.dirty.clear()
+        return afetadas
+
+    def route(self, src, dst):
+        return caminho_da_arvore(self.trees[src], dst)
+
+
+def caminho_estado(json_path):
+    base, _ = os.path.splitext(json_path)
+    return base + '.estado.json'
+
+
+def salvar_estado(routes, path, csv_path, json_path):
+    # Grafo com todas as alterações já aplicadas e a árvore de cada origem,
+    # marcados com o CSV de onde o grafo saiu e o JSON que corresponde a ele.
+    dados = {
+        'versao': VERSAO_ESTADO,
+        'csv_sha256': sha256_arquivo(csv_path).hex(),
+        'json_sha256': sha256_arquivo(json_path).hex(),
+        'adj': routes.adj,
+        'arvores': routes.trees,
+    }
+    # Mesmo esquema do snapshot: nunca deixa um arquivo pela metade.
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(dados, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def carregar_estado(path, csv_path, json_path):
+    # Devolve (adj, trees) do estado salvo, ou None se ele não existe ou se o
+    # CSV ou o JSON mudaram desde que ele foi gravado (dijkstra.py ou io.py
+    # rodaram de novo, por exemplo).
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding='utf-8') as f:
+            dados = json.load(f)
+        if (dados.get('versao') != VERSAO_ESTADO
+                or dados.get('csv_sha256') != sha256_arquivo(csv_path).hex()
+                or dados.get('json_sha256') != sha256_arquivo(json_path).hex()):
+            return None
+        adj = {u: [tuple(aresta) for aresta in arestas] for u, arestas in dados['adj'].items()}
+        trees = {src: tuple(arvore) for src, arvore in dados['arvores'].items()}
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    return adj, trees
+
+
+def ler_deltas(path):
+    deltas = []
+    with open(path, newline='', encoding='utf-8') as f:
+        for linha, registro in enumerate(csv.DictReader(f), start=2):
+            acao = registro['acao'].strip()
+            if acao not in ACOES:
+                print(f"Aviso: ação '{acao}' desconhecida na linha {linha} de '{path}', ignorando.")
+                continue
+
+            peso = None
+            if acao != 'remover':
+                peso = float(registro['duration_minutes'])
+                if peso.is_integer():
+                    peso = int(peso)
+
+            deltas.append((
+                acao,
+                registro['from_country'].strip(),
+                registro['dest_country'].strip(),
+                registro['flight_number'].strip(),
+                peso,
+            ))
+    return deltas
+
+
+def aplicar_deltas(routes, deltas):
+    ignorados = 0
+    for acao, orig, dest, voo, peso in deltas:
+        if acao == 'adicionar':
+            routes.add_flight(orig, dest, peso, voo)
+        elif acao == 'remover':
+            ignorados += routes.remove_flight(orig, dest, voo) == 0
+        else:
+            ignorados += routes.reweight_flight(orig, dest, voo, peso) == 0
+    return ignorados
+
+
+def mesma_rota(registro, cost, path, flights, weights):
+    return (
+        registro["custo_total_minutos"] == cost
+        and registro["caminho"] == path
+        and [e["voo"] for e in registro["etapas"]] == flights
+        and [e["duration_minutes"] for e in registro["etapas"]] == weights
+    )
+
+
+def atualizar_rotas(routes, afetadas, registros, writer):
+    # Pares de origens não afetadas são copiados do JSON anterior; só os
+    # pares cujo caminho mudou ganham um registro novo.
+    afetadas = set(afetadas)
+    alterados = 0
+
+    for src in routes.sources:
+        if src not in afetadas:
+            for dst in routes.sources:
+                registro = registros.get((src, dst))
+                if registro is not None:
+                    writer.write(dict(registro, exemplo_num=writer.count + 1))
+            continue
+
+        rotas_da_origem = []
+        for dst in routes.sources:
+            if src == dst:
+                continue
+            cost, path, flights, weights = routes.route(src, dst)
+            registro = registros.get((src, dst))
+            if cost == float('inf'):
+                alterados += registro is not None
+            elif registro is not None and mesma_rota(registro, cost, path, flights, weights):
+                rotas_da_origem.append(registro)
+            else:
+                rotas_da_origem.append((cost, path, flights, weights, dst))
+                alterados += 1
+
+        perfil = routes.perfis[src]
+        tree_time = perfil.elapsed_seconds
+        exec_time = tree_time / len(rotas_da_origem) if rotas_da_origem and tree_time is not None else tree_time
+        for rota in rotas_da_origem:
+            if isinstance(rota, dict):
+                writer.write(dict(rota, exemplo_num=writer.count + 1))
+            else:
+                cost, path, flights, weights, dst = rota
+                writer.write(rota_json(
+                    writer.count + 1, cost, path, flights, weights, src, dst,
+                    exec_time, tree_time, perfil.peak_memory_kb
+                ))
+
+    return alterados
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('deltas', help="CSV com as colunas acao (adicionar/remover/alterar), "
+                                       "from_country, dest_country, flight_number, duration_minutes")
+    parser.add_argument('--json', default='../../out/percurso_voo_dijkstra.json',
+                        help='JSON de rotas do dijkstra.py a ser atualizado')
+    parser.add_argument('--snapshot', action='store_true',
+                        help='carrega o grafo de um snapshot binário (gravado na primeira execução)')
+    Profiler.add_arguments(parser)
+    JsonStreamWriter.add_arguments(parser)
+    args = parser.parse_args(argv)
+    profiler = Profiler.from_args(args)
+
+    print("--- Atualizando rotas a partir de alterações de voos ---")
+
+    csv_file_path = '../../data/flight_filtrado.csv'
+
+    if not os.path.exists(args.json):
+        print(f"ERRO: '{args.json}' não encontrado. Rode o dijkstra.py antes.")
+        return
+    registros = {(r["origem"], r["destino"]): r for r in iter_json_records(args.json)}
+
+    deltas = ler_deltas(args.deltas)
+    print(f"{len(deltas)} alterações lidas de '{args.deltas}'.")
+
+    start_time = time.perf_counter()
+    estado_path = caminho_estado(args.json)
+    estado = carregar_estado(estado_path, csv_file_path, args.json)
+    if estado is not None:
+        print(f"Estado '{estado_path}' carregado (grafo e árvores da última atualização).")
+        adj, trees = estado
+        routes = DynamicRoutes(adj, [p for p in PAISES_DESEJADOS if p in adj], trees, profiler)
+        ignorados = aplicar_deltas(routes, deltas)
+        routes.refresh(profiler)
+    else:
+        # Primeira atualização sobre este CSV e este JSON: o grafo sai do CSV
+        # e, como o JSON não tem árvores associadas, toda origem é calculada
+        # (uma vez só, já com as alterações) e comparada par a par.
+        print(f"Nenhum estado compatível em '{estado_path}': partindo do CSV.")
+        adj = build_directed_graph(csv_file_path, snapshot=args.snapshot)
+        if not adj:
+            print("ERRO: O grafo está vazio. Verifique 'flight_filtrado.csv'.")
+            return
+        ignorados = aplicar_deltas(DynamicRoutes(adj, []), deltas)
+        routes = DynamicRoutes(adj, [p for p in PAISES_DESEJADOS if p in adj], profiler=profiler)
+
+    # Origens cuja árvore foi calculada nesta execução, na criação ou no refresh.
+    afetadas = [src for src in routes.sources if src in routes.perfis]
+    if ignorados:
+        print(f"Aviso: {ignorados} alterações não encontraram o voo correspondente no grafo.")
+
+    try:
+        writer = JsonStreamWriter.from_args(args.json, args)
+    except OSError as e:
+        print(f"ERRO ao salvar o arquivo JSON: {e}")
+        return
+
+    with writer:
+        alterados = atualizar_rotas(routes, afetadas, registros, writer)
+
+    try:
+        salvar_estado(routes, estado_path, csv_file_path, writer.path)
+    except OSError as e:
+        print(f"Aviso: não foi possível gravar o estado '{estado_path}': {e}")
+    elapsed = time.perf_counter() - start_time
+
+    print(f"\n{len(afetadas)} de {len(routes.sources)} origens recalculadas, {alterados} pares alterados "
+          f"em {elapsed:.3f}s.")
+    print(f"Arquivo salvo com {writer.count} rotas em '{writer.path}'.")
+    profiler.report()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+import gzip
+import json
+import textwrap
+
+FORMATOS = ['json', 'jsonl']
+
+
+class JsonStreamWriter:
+    # Grava cada registro assim que ele é produzido, sem manter a lista
+    # inteira em memória. No formato 'json' padrão (indent=4) o arquivo
+    # final é idêntico ao de json.dump(lista, indent=4, ensure_ascii=False).
+    def __init__(self, path, fmt='json', compact=False, compress=False):
+        if fmt not in FORMATOS:
+            raise ValueError(f"Formato de saída desconhecido: {fmt}")
+        if fmt == 'jsonl' and path.endswith('.json'):
+            path = path[:-len('.json')] + '.jsonl'
+        if compress:
+            path += '.gz'
+
+        self.path = path
+        self.fmt = fmt
+        self.compact = compact
+        self.count = 0
+
+        if compress:
+            self._file = gzip.open(path, 'wt', encoding='utf-8')
+        else:
+            self._file = open(path, 'w', encoding='utf-8')
+
+        if fmt == 'json':
+            self._file.write('[')
+
+    @classmethod
+    def from_args(cls, path, args):
+        return cls(path, fmt=args.formato, compact=args.compacto, compress=args.gzip)
+
+    @staticmethod
+    def add_arguments(parser):
+        parser.add_argument('--formato', choices=FORMATOS, default='json',
+                            help="'json' (lista) ou 'jsonl' (um registro por linha)")
+        parser.add_argument('--compacto', action='store_true',
+                            help='grava o JSON sem indentação')
+        parser.add_argument('--gzip', action='store_true',
+                            help='comprime a saída com gzip (acrescenta .gz ao nome)')
+
+    def write(self, record):
+        if self.fmt == 'jsonl':
+            self._file.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')))
+            self._file.write('\n')
+        elif self.compact:
+            if self.count:
+                self._file.write(',')
+            self._file.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')))
+        else:
+            self._file.write(',\n' if self.count else '\n')
+            self._file.write(textwrap.indent(json.dumps(record, ensure_ascii=False, indent=4), '    '))
+        self.count += 1
+
+    def close(self):
+        if self._file.closed:
+            return
+        if self.fmt == 'json':
+            self._file.write('\n]' if self.count and not self.compact else ']')
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def iter_json_records(path):
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        if path.endswith('.jsonl') or path.endswith('.jsonl.gz'):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from json.load(f)
@@ -2,8 +2,43 @@ import streamlit as st
 import json
 import networkx as nx
 from pyvis.network import Network
-import tempfile
+import hashlib
+import math
 import os
+import sys
+import time
+import heapq
+from collections import Counter
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "graphs"))
+from route_service import RouteService
+from route_store import RouteStore
+
+
+# Acima destes tamanhos a visão BFS/DFS agrega arestas (modo automático) e o
+# HTML é gerado com layout calculado no servidor e física desligada.
+LIMITE_ARESTAS_DETALHE = 500
+MAX_ARESTAS_PADRAO = 1000
+LIMITE_FISICA = 1500
+LIMITE_SPRING_LAYOUT = 500
+
+
+@st.cache_resource
+def carregar_servico_de_rotas(csv_path: str) -> RouteService:
+    return RouteService.from_csv(csv_path)
+
+
+# cache_resource (e não cache_data) para não copiar o índice a cada rerun;
+# o mtime entra na chave para recarregar quando o JSON for regerado.
+@st.cache_resource(max_entries=4)
+def carregar_rotas_pre_calculadas(json_path: str, mtime: float) -> RouteStore:
+    return RouteStore.from_json(json_path)
+
+
+@st.cache_resource(max_entries=4)
+def carregar_percursos(json_path: str, mtime: float) -> list:
+    with open(json_path, "r", encoding="utf-8") as f:
+        return json.load(f)
 
 
 def create_networkx_graph(data: list, algoritmo: str) -> nx.DiGraph:
@@ -55,7 +90,79 @@ def create_networkx_graph(data: list, algoritmo: str) -> nx.DiGraph:
     return G
 
 
-def create_pyvis_html(G: nx.DiGraph, physics_config: dict, cache_key: str) -> str:
+def contar_arestas_brutas(data: list, algoritmo: str) -> int:
+    total = 0
+    for exemplo in data:
+        resultado = exemplo.get(algoritmo.lower(), {})
+        total += max(len(resultado.get("visited_order", [])) - 1, 0) + len(resultado.get("cycles", []))
+    return total
+
+
+def create_lod_graph(data: list, algoritmo: str, mostrar_ciclos: bool, max_arestas: int):
+    # Arestas repetidas (entre origens ou ciclos detectados várias vezes)
+    # viram uma só, com a contagem como peso.
+    passos = Counter()
+    ciclos = Counter()
+    origens = []
+    for exemplo in data:
+        resultado = exemplo.get(algoritmo.lower(), {})
+        ordem = resultado.get("visited_order", [])
+        origens.extend(ordem[:1])
+        passos.update(zip(ordem, ordem[1:]))
+        if mostrar_ciclos:
+            ciclos.update(map(tuple, resultado.get("cycles", [])))
+
+    # Importância: arestas do percurso antes das de ciclo e, em cada grupo,
+    # as mais frequentes primeiro.
+    arestas = set(passos) | set(ciclos)
+    mantidas = heapq.nsmallest(max_arestas, arestas,
+                               key=lambda a: (passos[a] == 0, -(passos[a] + ciclos[a]), a))
+
+    G = nx.DiGraph()
+    G.add_nodes_from(origens)
+    maior = max((passos[a] + ciclos[a] for a in mantidas), default=1)
+    for u, v in mantidas:
+        total = passos[(u, v)] + ciclos[(u, v)]
+        G.add_edge(
+            u, v,
+            weight=total,
+            label=f"×{total}" if total > 1 else "",
+            color="#33A1FD" if passos[(u, v)] else "#FF007F",
+            width=1 + 5 * math.log1p(total) / math.log1p(maior),
+            title=f"Percurso: {passos[(u, v)]}x | Ciclo: {ciclos[(u, v)]}x"
+        )
+
+    return G, len(arestas) - len(mantidas)
+
+
+@st.cache_data(max_entries=8)
+def grafo_agregado(json_path: str, mtime: float, algoritmo: str, mostrar_ciclos: bool, max_arestas: int):
+    return create_lod_graph(carregar_percursos(json_path, mtime), algoritmo, mostrar_ciclos, max_arestas)
+
+
+def layout_estatico(G: nx.DiGraph) -> dict:
+    # spring_layout só é denso (sem scipy) até ~500 nós; acima disso usa um layout circular.
+    if G.number_of_nodes() <= LIMITE_SPRING_LAYOUT:
+        posicoes = nx.spring_layout(G, seed=42, iterations=50)
+    else:
+        posicoes = nx.circular_layout(G)
+    escala = 60 * math.sqrt(max(G.number_of_nodes(), 1))
+    return {n: (float(x) * escala, float(y) * escala) for n, (x, y) in posicoes.items()}
+
+
+def assinatura_do_grafo(G: nx.DiGraph, physics_config: dict) -> str:
+    conteudo = json.dumps(
+        [list(G.nodes(data=True)), list(G.edges(data=True)), physics_config],
+        sort_keys=True, default=str
+    )
+    return hashlib.sha256(conteudo.encode("utf-8")).hexdigest()
+
+
+# A chave do cache é o hash do conteúdo do grafo e da física; o próprio
+# grafo vai como _G para o Streamlit não tentar fazer hash dele.
+@st.cache_data(max_entries=32)
+def create_pyvis_html(cache_key: str, _G: nx.DiGraph, physics_config: dict) -> str:
+    G = _G
     net = Network(
         height="750px",
         width="100%",
@@ -65,14 +172,23 @@ def create_pyvis_html(G: nx.DiGraph, physics_config: dict, cache_key: str) -> st
         notebook=False
     )
 
+    # Em grafos grandes a simulação barnes_hut trava o navegador: as posições
+    # são calculadas aqui uma vez (o HTML fica em cache) e a física é desligada.
+    estatico = G.number_of_nodes() + G.number_of_edges() > LIMITE_FISICA
+    posicoes = layout_estatico(G) if estatico else {}
+
     for node, data in G.nodes(data=True):
+        extras = {}
+        if node in posicoes:
+            extras = {"x": posicoes[node][0], "y": posicoes[node][1], "physics": False}
         net.add_node(
             node,
             label=node,
             color=data.get("color", "#0A84FF"),
             size=data.get("size", 18),
             title=f"Aeroporto: {node}",
-            font={"size": 14, "color": "#FFFFFF", "face": "Consolas"}
+            font={"size": 14, "color": "#FFFFFF", "face": "Consolas"},
+            **extras
         )
 
     for u, v, data_edge in G.edges(data=True):
@@ -85,19 +201,19 @@ def create_pyvis_html(G: nx.DiGraph, physics_config: dict, cache_key: str) -> st
             title=data_edge.get("title", data_edge.get("label", ""))
         )
 
-    net.barnes_hut(
-        gravity=physics_config["gravity"],
-        central_gravity=physics_config["central_gravity"],
-        spring_length=physics_config["spring_length"],
-        spring_strength=physics_config["spring_strength"],
-        damping=0.09,
-        overlap=0
-    )
-
-    tmp_path = tempfile.NamedTemporaryFile(delete=False, suffix=".html").name
-    net.save_graph(tmp_path)
-    return tmp_path
+    if estatico:
+        net.toggle_physics(False)
+    else:
+        net.barnes_hut(
+            gravity=physics_config["gravity"],
+            central_gravity=physics_config["central_gravity"],
+            spring_length=physics_config["spring_length"],
+            spring_strength=physics_config["spring_strength"],
+            damping=0.09,
+            overlap=0
+        )
 
+    return net.generate_html()
 
 
 def main():
@@ -160,7 +276,7 @@ def main():
 
     json_path = algoritmos[algoritmo]
     
-    if not os.path.exists(json_path):
+    if algoritmo in ["BFS", "DFS"] and not os.path.exists(json_path):
         st.error(f"Arquivo não encontrado: {json_path}")
         st.write(f"Caminho absoluto verificado: {os.path.abspath(json_path)}")
         st.error(f"Verifique se o arquivo '{algoritmos[algoritmo]}' existe na pasta 'out'.")
@@ -181,21 +297,25 @@ def main():
 
     
     if algoritmo in ["Dijkstra", "Bellman-Ford"]:
-        st.sidebar.markdown(f"<div class='highlight-box'><h3>Seleção de Rota ({algoritmo} Pré-calculado)</h3>", unsafe_allow_html=True)
+        fonte = st.sidebar.radio("Fonte das rotas:", ["Pré-calculado (JSON)", "Sob demanda"], key="fonte_rotas")
+        pre_calculado = fonte == "Pré-calculado (JSON)"
 
-        with open(json_path, "r", encoding="utf-8") as f:
-            data = json.load(f) 
+        st.sidebar.markdown(f"<div class='highlight-box'><h3>Seleção de Rota ({algoritmo} {'Pré-calculado' if pre_calculado else 'sob demanda'})</h3>", unsafe_allow_html=True)
 
-        all_origins = sorted(list(set(ex.get("origem") for ex in data if "origem" in ex)))
-        all_destinations = sorted(list(set(ex.get("destino") for ex in data if "destino" in ex)))
-        
-        all_nodes = set()
-        for ex in data:
-            for etapa in ex.get("etapas", []):
-                all_nodes.add(etapa["de"])
-                all_nodes.add(etapa["para"])
-        
-        G.add_nodes_from(sorted(list(all_nodes)))
+        if pre_calculado:
+            if not os.path.exists(json_path):
+                st.error(f"Arquivo não encontrado: {json_path}")
+                st.error(f"Gere o arquivo '{json_path}' ou escolha a opção 'Sob demanda'.")
+                st.stop()
+
+            rotas = carregar_rotas_pre_calculadas(json_path, os.path.getmtime(json_path))
+            all_origins, all_destinations, all_nodes = rotas.origins, rotas.destinations, rotas.nodes
+        else:
+            servico = carregar_servico_de_rotas("../data/flight_filtrado.csv")
+            all_nodes = servico.nodes()
+            all_origins = all_destinations = all_nodes
+
+        G.add_nodes_from(all_nodes)
 
         origem = st.sidebar.selectbox("Aeroporto de Origem:", [""] + all_origins, key="origem_select")
         destino = st.sidebar.selectbox("Aeroporto de Destino:", [""] + all_destinations, key="destino_select")
@@ -209,7 +329,14 @@ def main():
             st.warning(" O aeroporto de origem e destino são iguais. Escolha dois diferentes.")
         
         else:
-            matching_example = next((ex for ex in data if ex['origem'] == origem and ex['destino'] == destino), None)
+            inicio_consulta = time.perf_counter()
+            if pre_calculado:
+                matching_example = rotas.get(origem, destino)
+                detalhe = f"{len(rotas)} rotas no índice"
+            else:
+                matching_example = servico.route(origem, destino, algoritmo)
+                detalhe = f"cache: {servico.hits} acertos, {servico.misses} buscas"
+            st.sidebar.caption(f"Consulta em {(time.perf_counter() - inicio_consulta) * 1000:.3f} ms ({detalhe})")
             
             if matching_example:
                 G = create_networkx_graph([matching_example], algoritmo) 
@@ -217,7 +344,7 @@ def main():
                 path = matching_example['caminho']
                 length = matching_example['custo_total_minutos']
 
-                st.success(f" Caminho pré-calculado de **{origem}** até **{destino}** ({algoritmo}):")
+                st.success(f" Caminho de **{origem}** até **{destino}** ({algoritmo}):")
                 st.info(" → ".join(path))
                 st.metric("Duração total (min)", f"{length:.1f}")
 
@@ -235,20 +362,36 @@ def main():
                     G.nodes[destino]["size"] = 25
 
             else:
-                st.error(f"Nenhum caminho pré-calculado encontrado de {origem} para {destino} no arquivo JSON.")
+                if pre_calculado:
+                    st.error(f"Nenhum caminho pré-calculado encontrado de {origem} para {destino} no arquivo JSON.")
+                else:
+                    st.error(f"Nenhum caminho encontrado de {origem} para {destino}.")
 
 
     elif algoritmo in ["BFS", "DFS"]:
-        with open(json_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        
-        G = create_networkx_graph(data, algoritmo)
+        mtime = os.path.getmtime(json_path)
+        data = carregar_percursos(json_path, mtime)
         
         mostrar_ciclos = st.checkbox("Mostrar arestas de ciclos", value=True)
-        if not mostrar_ciclos:
-            edges_to_remove = [(u, v) for u, v, data in G.edges(data=True)
-                               if "Ciclo" in data.get("label", "")]
-            G.remove_edges_from(edges_to_remove)
+
+        arestas_brutas = contar_arestas_brutas(data, algoritmo)
+        nivel = st.sidebar.radio("Nível de detalhe:", ["Automático", "Completo", "Agregado"], key="nivel_detalhe")
+        agregado = nivel == "Agregado" or (nivel == "Automático" and arestas_brutas > LIMITE_ARESTAS_DETALHE)
+
+        if agregado:
+            max_arestas = st.sidebar.slider("Máximo de arestas desenhadas", 100, 10000, MAX_ARESTAS_PADRAO, step=100)
+            G, ocultas = grafo_agregado(json_path, mtime, algoritmo, mostrar_ciclos, max_arestas)
+            st.caption(f"Visão agregada: {arestas_brutas} arestas no resultado, {G.number_of_edges()} desenhadas"
+                       + (f" ({ocultas} menos frequentes ocultadas)." if ocultas else "."))
+        else:
+            G = create_networkx_graph(data, algoritmo)
+            if not mostrar_ciclos:
+                edges_to_remove = [(u, v) for u, v, data in G.edges(data=True)
+                                   if "Ciclo" in data.get("label", "")]
+                G.remove_edges_from(edges_to_remove)
+
+        if G.number_of_nodes() + G.number_of_edges() > LIMITE_FISICA:
+            st.caption("Grafo grande: layout calculado no servidor e física desligada.")
 
 
     st.sidebar.subheader(" Métricas do Grafo (Visão Atual)")
@@ -256,10 +399,7 @@ def main():
     col1.metric("Nós (Aeroportos)", G.number_of_nodes())
     col2.metric("Arestas (Voos)", G.number_of_edges())
 
-    graph_path = create_pyvis_html(G, physics_config, f"{algoritmo}-{origem}-{destino}")
-
-    with open(graph_path, "r", encoding="utf-8") as f:
-        html = f.read()
+    html = create_pyvis_html(assinatura_do_grafo(G, physics_config), G, physics_config)
 
     st.components.v1.html(html, height=750, scrolling=False)
 
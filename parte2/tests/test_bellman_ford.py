@@ -1,26 +1,29 @@
-import time
 import unittest
-import tracemalloc
 
 def bellman_ford(graph, start):
-    tracemalloc.start()
-    start_time = time.time()
-
     dist = {n: float('inf') for n in graph}
     pred = {n: None for n in graph}
     dist[start] = 0
 
+    changed = {start}
+
     for _ in range(len(graph) - 1):
+        if not changed:
+            break
         for u in graph:
-            if dist[u] == float('inf'):
+            if u not in changed:
                 continue
+            changed.discard(u)
             for v, w, _ in graph[u]:
                 if dist[u] + w < dist[v]:
                     dist[v] = dist[u] + w
                     pred[v] = u
+                    changed.add(v)
 
     has_neg = False
     for u in graph:
+        if u not in changed:
+            continue
         for v, w, _ in graph[u]:
             if dist[u] + w < dist[v]:
                 has_neg = True
@@ -28,16 +31,10 @@ def bellman_ford(graph, start):
         if has_neg:
             break
 
-    exec_time = time.time() - start_time
-    _, peak = tracemalloc.get_traced_memory()
-    tracemalloc.stop()
-
     return {
         "dist": dist,
         "pred": pred,
-        "has_negative_cycle": has_neg,
-        "execution_time": exec_time,
-        "peak_memory_kb": peak / 1024
+        "has_negative_cycle": has_neg
     }
 
 
@@ -60,6 +57,21 @@ def sample_graph_with_negative_cycle():
     }
 
 
+def sample_graph_unreachable_negative_cycle():
+    return {
+        'S': [('A', 2, '')],
+        'A': [],
+        'B': [('C', -3, '')],
+        'C': [('B', 1, '')]
+    }
+
+
+def sample_chain_graph(n):
+    graph = {i: [(i + 1, 1, '')] for i in range(n - 1)}
+    graph[n - 1] = []
+    return graph
+
+
 class TestBellmanFord(unittest.TestCase):
 
     def setUp(self):
@@ -82,6 +94,19 @@ class TestBellmanFord(unittest.TestCase):
         result = bellman_ford(self.graph_neg, 'A')
         self.assertTrue(result["has_negative_cycle"])
 
+    def test_bellman_ford_ciclo_negativo_inalcancavel(self):
+        result = bellman_ford(sample_graph_unreachable_negative_cycle(), 'S')
+        self.assertFalse(result["has_negative_cycle"])
+        self.assertEqual(result["dist"]['A'], 2)
+        self.assertEqual(result["dist"]['B'], float('inf'))
+
+    def test_bellman_ford_cadeia_longa(self):
+        n = 300
+        result = bellman_ford(sample_chain_graph(n), 0)
+        self.assertFalse(result["has_negative_cycle"])
+        self.assertEqual(result["dist"][n - 1], n - 1)
+        self.assertEqual(result["pred"][n - 1], n - 2)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
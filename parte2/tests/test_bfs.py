@@ -1,37 +1,33 @@
-import time
 from collections import deque
 import unittest
 
 def bfs(adj, start):
     visited = []
+    done = set()
     queue = deque([(start, 0)])  
     seen = {start}
     levels = {start: 0}
     cycles = []
 
-    start_time = time.time()
-
     while queue:
         node, level = queue.popleft()
         visited.append(node)
+        done.add(node)
 
         for neighbor, _, _ in adj[node]:
             if neighbor not in seen:
                 seen.add(neighbor)
                 queue.append((neighbor, level + 1))
                 levels[neighbor] = level + 1
-            elif neighbor in visited:
+            elif neighbor in done:
                 cycles.append((node, neighbor))
 
-    exec_time = time.time() - start_time
-
     return {
         "algorithm": "BFS",
         "start": start,
         "visited_order": visited,
         "levels": levels,
-        "cycles": cycles,
-        "execution_time": exec_time
+        "cycles": cycles
     }
 
 def sample_graph():
@@ -57,5 +53,10 @@ class TestBFS(unittest.TestCase):
         result = bfs(self.graph, 'A')
         self.assertGreaterEqual(len(result["cycles"]), 1)
 
+    def test_bfs_visit_order(self):
+        result = bfs(self.graph, 'A')
+        self.assertEqual(result["visited_order"], ['A', 'B', 'C', 'D'])
+        self.assertEqual(result["cycles"], [('C', 'A')])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
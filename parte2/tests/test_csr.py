@@ -0,0 +1,448 @@
+import heapq
+import unittest
+from array import array
+from collections import deque
+
+
+class CSRGraph:
+    # Nós são internados como inteiros 0..n-1; as arestas de u ocupam as
+    # posições offsets[u]..offsets[u+1] de targets, weights e flight_ids.
+    def __init__(self, names, offsets, targets, weights, flight_ids, flights):
+        self.names = names
+        self.index = {n: i for i, n in enumerate(names)}
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.flight_ids = flight_ids
+        self.flights = flights
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def keys(self):
+        return list(self.names)
+
+    def num_edges(self):
+        return len(self.targets)
+
+    def edges(self, u):
+        return range(self.offsets[u], self.offsets[u + 1])
+
+    def flight(self, e):
+        return self.flights[self.flight_ids[e]]
+
+    def to_adjacency(self):
+        names, targets, weights = self.names, self.targets, self.weights
+        return {
+            names[u]: [(names[targets[e]], weights[e], self.flight(e)) for e in self.edges(u)]
+            for u in range(len(names))
+        }
+
+    @classmethod
+    def from_adjacency(cls, adjacency_list):
+        names = list(adjacency_list)
+        index = {n: i for i, n in enumerate(names)}
+        flight_index = {}
+
+        offsets = [0]
+        targets = []
+        weights = []
+        flight_ids = array('i')
+        for u in names:
+            for v, w, voo in adjacency_list[u]:
+                targets.append(index[v])
+                weights.append(w)
+                flight_ids.append(flight_index.setdefault(voo, len(flight_index)))
+            offsets.append(len(targets))
+
+        return cls(names, offsets, targets, weights, flight_ids, list(flight_index))
+
+
+def dijkstra_tree(adj, src, dst=None):
+    dist = {n: float('inf') for n in adj}
+    prev = {n: None for n in adj}
+    prev_log = {n: None for n in adj}
+    prev_weight = {n: None for n in adj}
+
+    dist[src] = 0
+    pq = [(0, src)]
+
+    while pq:
+        d, u = heapq.heappop(pq)
+
+        if u == dst:
+            break
+        if d > dist[u]:
+            continue
+
+        for v, w, log in adj[u]:
+            nd = d + w
+
+            if nd < dist[v]:
+                dist[v] = nd
+                prev[v] = u
+                prev_log[v] = log
+                prev_weight[v] = w
+                heapq.heappush(pq, (nd, v))
+
+    return dist, prev, prev_log, prev_weight
+
+
+def dijkstra_tree_csr(graph, src, dst=-1):
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    n = len(graph)
+
+    dist = [float('inf')] * n
+    prev = [-1] * n
+    prev_edge = [-1] * n
+
+    dist[src] = 0
+    pq = [(0, src)]
+
+    while pq:
+        d, u = heapq.heappop(pq)
+
+        if u == dst:
+            break
+        if d > dist[u]:
+            continue
+
+        for e in range(offsets[u], offsets[u + 1]):
+            v = targets[e]
+            nd = d + weights[e]
+
+            if nd < dist[v]:
+                dist[v] = nd
+                prev[v] = u
+                prev_edge[v] = e
+                heapq.heappush(pq, (nd, v))
+
+    return dist, prev, prev_edge
+
+
+def bellman_ford_csr(graph, start):
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    n = len(graph)
+
+    dist = [float('inf')] * n
+    pred = [-1] * n
+    pred_edge = [-1] * n
+    dist[start] = 0
+
+    changed = bytearray(n)
+    changed[start] = 1
+    pendentes = 1
+
+    for _ in range(n - 1):
+        if not pendentes:
+            break
+        for u in range(n):
+            if not changed[u]:
+                continue
+            changed[u] = 0
+            pendentes -= 1
+            du = dist[u]
+            for e in range(offsets[u], offsets[u + 1]):
+                v = targets[e]
+                nd = du + weights[e]
+                if nd < dist[v]:
+                    dist[v] = nd
+                    pred[v] = u
+                    pred_edge[v] = e
+                    if not changed[v]:
+                        changed[v] = 1
+                        pendentes += 1
+                    if v == u:
+                        du = nd
+
+    has_neg = False
+    for u in range(n):
+        if not changed[u]:
+            continue
+        for e in range(offsets[u], offsets[u + 1]):
+            v = targets[e]
+            if dist[u] + weights[e] < dist[v]:
+                has_neg = True
+                break
+        if has_neg:
+            break
+
+    return dist, pred, pred_edge, has_neg
+
+
+def bellman_ford(graph, start):
+    dist = {n: float('inf') for n in graph}
+    pred = {n: None for n in graph}
+    dist[start] = 0
+
+    # Só nós cuja distância mudou desde a última varredura podem relaxar
+    # alguma aresta; os demais são pulados sem alterar a ordem das rodadas.
+    changed = {start}
+
+    for _ in range(len(graph) - 1):
+        if not changed:
+            break
+        for u in graph:
+            if u not in changed:
+                continue
+            changed.discard(u)
+            for v, w, log in graph[u]:
+                if dist[u] + w < dist[v]:
+                    dist[v] = dist[u] + w
+                    pred[v] = (u, log, w)
+                    changed.add(v)
+
+    has_neg = False
+    for u in graph:
+        if u not in changed:
+            continue
+        for v, w, _ in graph[u]:
+            if dist[u] + w < dist[v]:
+                has_neg = True
+                break
+        if has_neg:
+            break
+
+    return dist, pred, has_neg
+
+
+def bfs_csr(graph, start):
+    offsets, targets = graph.offsets, graph.targets
+    n = len(graph)
+
+    visited = []
+    queue = deque([start])
+    level = [-1] * n
+    done = bytearray(n)
+    cycles = []
+    level[start] = 0
+
+    while queue:
+        node = queue.popleft()
+        visited.append(node)
+        done[node] = 1
+        next_level = level[node] + 1
+
+        for e in range(offsets[node], offsets[node + 1]):
+            neighbor = targets[e]
+            if level[neighbor] == -1:
+                level[neighbor] = next_level
+                queue.append(neighbor)
+            elif done[neighbor]:
+                cycles.append((node, neighbor))
+
+    return visited, level, cycles
+
+
+def bfs_adj(adj, start):
+    visited = []
+    done = set()
+    queue = deque([(start, 0)])  
+    seen = {start}
+    levels = {start: 0}
+    cycles = []
+
+    while queue:
+        node, level = queue.popleft()
+        visited.append(node)
+        done.add(node)
+
+        for neighbor, _, _ in adj[node]:
+            if neighbor not in seen:
+                seen.add(neighbor)
+                queue.append((neighbor, level + 1))
+                levels[neighbor] = level + 1
+            elif neighbor in done:
+                cycles.append((node, neighbor))
+
+    return visited, levels, cycles
+
+
+def dfs_csr(graph, start):
+    offsets, targets = graph.offsets, graph.targets
+    n = len(graph)
+
+    visited = [start]
+    level = [-1] * n
+    discovery = [-1] * n
+    finish = [-1] * n
+    in_stack = bytearray(n)
+    cycles = []
+
+    # Pilha explícita: nó e posição da próxima aresta a examinar, no lugar
+    # da recursão (mesma ordem de visita, sem limite de profundidade).
+    stack_nodes = [start]
+    stack_edges = [offsets[start]]
+    level[start] = 0
+    discovery[start] = 0
+    in_stack[start] = 1
+    clock = 1
+
+    while stack_nodes:
+        node = stack_nodes[-1]
+        e = stack_edges[-1]
+        end = offsets[node + 1]
+
+        while e < end:
+            neighbor = targets[e]
+            e += 1
+            if level[neighbor] == -1:
+                stack_edges[-1] = e
+                level[neighbor] = level[node] + 1
+                discovery[neighbor] = clock
+                clock += 1
+                in_stack[neighbor] = 1
+                visited.append(neighbor)
+                stack_nodes.append(neighbor)
+                stack_edges.append(offsets[neighbor])
+                break
+            elif in_stack[neighbor] and neighbor != node:
+                cycles.append((node, neighbor))
+        else:
+            stack_nodes.pop()
+            stack_edges.pop()
+            in_stack[node] = 0
+            finish[node] = clock
+            clock += 1
+
+    return visited, level, cycles, discovery, finish
+
+
+def dfs_adj(adj, start):
+    visited = [start]
+    levels = {start: 0}
+    discovery = {start: 0}
+    finish = {}
+    in_stack = {start}
+    cycles = []
+
+    stack = [(start, iter(adj[start]))]
+    clock = 1
+
+    while stack:
+        node, edges = stack[-1]
+
+        for neighbor, _, _ in edges:
+            if neighbor not in levels:
+                levels[neighbor] = levels[node] + 1
+                discovery[neighbor] = clock
+                clock += 1
+                in_stack.add(neighbor)
+                visited.append(neighbor)
+                stack.append((neighbor, iter(adj[neighbor])))
+                break
+            elif neighbor in in_stack and neighbor != node:
+                cycles.append((node, neighbor))
+        else:
+            stack.pop()
+            in_stack.discard(node)
+            finish[node] = clock
+            clock += 1
+
+    return visited, levels, cycles, discovery, finish
+
+
+def sample_multigraph():
+    # Voos paralelos (inclusive com o mesmo peso), laço, ciclos e um país
+    # que só recebe voos.
+    return {
+        'A': [('B', 5, 'AB1'), ('B', 3, 'AB2'), ('C', 10, 'AC1'), ('B', 3, 'AB3')],
+        'B': [('C', 4, 'BC1'), ('C', 4, 'BC2'), ('A', 1, 'BA1'), ('B', 2, 'BB1')],
+        'C': [('D', 2, 'CD1'), ('A', 7, 'CA1'), ('D', 1, 'CD2')],
+        'D': [('E', 6, 'DE1'), ('B', 9, 'DB1')],
+        'E': [],
+        'F': [('A', 2, 'FA1'), ('A', 2, 'AB1')],
+    }
+
+
+def sample_negative_cycle():
+    return {
+        'A': [('B', 1, 'AB1'), ('B', 4, 'AB2')],
+        'B': [('C', -1, 'BC1'), ('C', 2, 'BC2')],
+        'C': [('A', -1, 'CA1')],
+        'D': [('A', 1, 'DA1')],
+    }
+
+
+class TestCSRGraph(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.adj = sample_multigraph()
+        cls.csr = CSRGraph.from_adjacency(cls.adj)
+
+    def nomes(self, lista):
+        return [self.csr.names[u] for u in lista]
+
+    def test_ida_e_volta_pela_adjacencia(self):
+        self.assertEqual(self.csr.to_adjacency(), self.adj)
+        self.assertEqual(list(self.csr), list(self.adj))
+        self.assertEqual(len(self.csr), len(self.adj))
+        self.assertEqual(self.csr.num_edges(), sum(len(e) for e in self.adj.values()))
+
+    def test_voos_repetidos_sao_internados(self):
+        self.assertEqual(len(self.csr.flights), len({voo for e in self.adj.values() for _, _, voo in e}))
+        self.assertEqual(self.csr.flight(self.csr.offsets[self.csr.index['F']] + 1), 'AB1')
+
+    def test_dijkstra_igual_a_adjacencia(self):
+        for origem in self.adj:
+            dist, prev, prev_log, prev_weight = dijkstra_tree(self.adj, origem)
+            dist_csr, prev_csr, prev_edge = dijkstra_tree_csr(self.csr, self.csr.index[origem])
+
+            self.assertEqual(dict(zip(self.csr.names, dist_csr)), dist)
+            for v, e in enumerate(prev_edge):
+                nome = self.csr.names[v]
+                if e == -1:
+                    self.assertIsNone(prev[nome])
+                else:
+                    self.assertEqual(self.csr.names[prev_csr[v]], prev[nome])
+                    self.assertEqual(self.csr.flight(e), prev_log[nome])
+                    self.assertEqual(self.csr.weights[e], prev_weight[nome])
+
+    def test_dijkstra_com_destino_para_no_mesmo_ponto(self):
+        dist, _, _, _ = dijkstra_tree(self.adj, 'A', 'D')
+        dist_csr, _, _ = dijkstra_tree_csr(self.csr, self.csr.index['A'], self.csr.index['D'])
+        self.assertEqual(dict(zip(self.csr.names, dist_csr)), dist)
+
+    def test_bellman_ford_igual_a_adjacencia(self):
+        for adj in (self.adj, sample_negative_cycle()):
+            csr = CSRGraph.from_adjacency(adj)
+            for origem in adj:
+                dist, pred, has_neg = bellman_ford(adj, origem)
+                dist_csr, pred_csr, pred_edge, has_neg_csr = bellman_ford_csr(csr, csr.index[origem])
+
+                self.assertEqual(has_neg_csr, has_neg)
+                self.assertEqual(dict(zip(csr.names, dist_csr)), dist)
+                for v, e in enumerate(pred_edge):
+                    esperado = None if e == -1 else (csr.names[pred_csr[v]], csr.flight(e), csr.weights[e])
+                    self.assertEqual(esperado, pred[csr.names[v]])
+
+    def test_bfs_igual_a_adjacencia(self):
+        for origem in self.adj:
+            visited, levels, cycles = bfs_adj(self.adj, origem)
+            order, level, cycles_csr = bfs_csr(self.csr, self.csr.index[origem])
+
+            self.assertEqual(self.nomes(order), visited)
+            self.assertEqual({self.csr.names[u]: level[u] for u in order}, levels)
+            self.assertEqual([(self.csr.names[u], self.csr.names[v]) for u, v in cycles_csr], cycles)
+
+    def test_dfs_igual_a_adjacencia(self):
+        for origem in self.adj:
+            visited, levels, cycles, discovery, finish = dfs_adj(self.adj, origem)
+            order, level, cycles_csr, disc, fin = dfs_csr(self.csr, self.csr.index[origem])
+
+            self.assertEqual(self.nomes(order), visited)
+            self.assertEqual({self.csr.names[u]: level[u] for u in order}, levels)
+            self.assertEqual([(self.csr.names[u], self.csr.names[v]) for u, v in cycles_csr], cycles)
+            self.assertEqual({self.csr.names[u]: disc[u] for u in order}, discovery)
+            self.assertEqual({self.csr.names[u]: fin[u] for u in order}, finish)
+
+
+if __name__ == "__main__":
+    unittest.main()
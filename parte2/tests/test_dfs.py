@@ -1,23 +1,35 @@
 import unittest
-import time
 
 def dfs(adj, start):
-    visited = []
+    visited = [start]
     levels = {start: 0}
+    discovery = {start: 0}
+    finish = {}
+    in_stack = {start}
     cycles = []
-    start_time = time.time()
-
-    def dfs_visit(node, depth, ancestors):
-        visited.append(node)
-        for neighbor, _, _ in adj[node]:
-            if neighbor not in visited:
-                levels[neighbor] = depth + 1
-                dfs_visit(neighbor, depth + 1, ancestors + [node])
-            elif neighbor in ancestors:
-                cycles.append((node, neighbor))
 
-    dfs_visit(start, 0, [])
-    exec_time = time.time() - start_time
+    stack = [(start, iter(adj[start]))]
+    clock = 1
+
+    while stack:
+        node, edges = stack[-1]
+
+        for neighbor, _, _ in edges:
+            if neighbor not in levels:
+                levels[neighbor] = levels[node] + 1
+                discovery[neighbor] = clock
+                clock += 1
+                in_stack.add(neighbor)
+                visited.append(neighbor)
+                stack.append((neighbor, iter(adj[neighbor])))
+                break
+            elif neighbor in in_stack and neighbor != node:
+                cycles.append((node, neighbor))
+        else:
+            stack.pop()
+            in_stack.discard(node)
+            finish[node] = clock
+            clock += 1
 
     return {
         "algorithm": "DFS",
@@ -25,7 +37,8 @@ def dfs(adj, start):
         "visited_order": visited,
         "levels": levels,
         "cycles": cycles,
-        "execution_time": exec_time
+        "discovery": discovery,
+        "finish": finish
     }
 
 def sample_graph():
@@ -50,5 +63,29 @@ class TestDFS(unittest.TestCase):
         result = dfs(self.graph, 'A')
         self.assertGreaterEqual(len(result["cycles"]), 1)
 
+    def test_dfs_visit_order(self):
+        result = dfs(self.graph, 'A')
+        self.assertEqual(result["visited_order"], ['A', 'B', 'D', 'C'])
+        self.assertEqual(result["cycles"], [('C', 'A')])
+
+    def test_dfs_discovery_finish_times(self):
+        result = dfs(self.graph, 'A')
+        discovery, finish = result["discovery"], result["finish"]
+        self.assertEqual(discovery, {'A': 0, 'B': 1, 'D': 2, 'C': 5})
+        self.assertEqual(finish, {'D': 3, 'B': 4, 'C': 6, 'A': 7})
+
+    def test_dfs_self_loop_is_not_a_cycle(self):
+        result = dfs({'A': [('A', 1, '')]}, 'A')
+        self.assertEqual(result["cycles"], [])
+
+    def test_dfs_deep_graph_without_recursion_limit(self):
+        n = 50000
+        graph = {i: [(i + 1, 1, '')] for i in range(n - 1)}
+        graph[n - 1] = [(0, 1, '')]
+        result = dfs(graph, 0)
+        self.assertEqual(len(result["visited_order"]), n)
+        self.assertEqual(result["levels"][n - 1], n - 1)
+        self.assertEqual(result["cycles"], [(n - 1, 0)])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
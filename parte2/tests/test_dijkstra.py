@@ -1,10 +1,7 @@
 import unittest
 import heapq
 
-def dijkstra(adj, src, dst):
-    if src not in adj or dst not in adj:
-        return float('inf'), [], [], []
-    
+def dijkstra_tree(adj, src, dst=None):
     dist = {n: float('inf') for n in adj}
     prev = {n: None for n in adj}
     prev_log = {n: None for n in adj} 
@@ -30,7 +27,13 @@ def dijkstra(adj, src, dst):
                 prev_log[v] = log
                 prev_weight[v] = w
                 heapq.heappush(pq, (nd, v))
-                
+
+    return dist, prev, prev_log, prev_weight
+
+
+def caminho_da_arvore(tree, dst):
+    dist, prev, prev_log, prev_weight = tree
+
     if dist[dst] == float('inf'):
         return float('inf'), [], [], []
         
@@ -51,6 +54,13 @@ def dijkstra(adj, src, dst):
     return dist[dst], path, logs, weights
 
 
+def dijkstra(adj, src, dst):
+    if src not in adj or dst not in adj:
+        return float('inf'), [], [], []
+
+    return caminho_da_arvore(dijkstra_tree(adj, src, dst), dst)
+
+
 class TestDijkstra(unittest.TestCase):
 
     @classmethod
@@ -119,6 +129,20 @@ class TestDijkstra(unittest.TestCase):
         self.assertEqual(logs, [])
         self.assertEqual(weights, [])
 
+    def test_tree_matches_pairwise_search(self):
+        for src in self.mock_adj:
+            tree = dijkstra_tree(self.mock_adj, src)
+            for dst in self.mock_adj:
+                self.assertEqual(caminho_da_arvore(tree, dst), dijkstra(self.mock_adj, src, dst))
+
+    def test_tree_keeps_all_reachable_nodes(self):
+        dist, prev, _, _ = dijkstra_tree(self.mock_adj, 'A')
+
+        self.assertEqual(dist['B'], 2)
+        self.assertEqual(dist['C'], 5)
+        self.assertEqual(prev['C'], 'B')
+        self.assertEqual(dist['D'], float('inf'))
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,95 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+
+class HashesVistos:
+    # Conjunto compacto dos números de voo já gravados: hashes de 64 bits
+    # (8 bytes por voo) guardados em "corridas" ordenadas, cada uma maior
+    # que a soma das seguintes. O bloco novo vira uma corrida e só é fundido
+    # com as do fim enquanto elas não forem maiores que ele, então cada hash
+    # é recopiado O(log n) vezes no total e uma consulta faz uma busca
+    # binária em cada uma das O(log n) corridas.
+    #
+    # Dois números de voo diferentes com o mesmo hash seriam tratados como
+    # duplicata. Com n voos distintos a chance de haver alguma colisão é
+    # cerca de n² / 2^65 (~3e-4 para 100 milhões), risco aceito em troca de
+    # não guardar as strings.
+    def __init__(self):
+        self.corridas = []
+
+    def __len__(self):
+        return sum(len(corrida) for corrida in self.corridas)
+
+    def contem(self, hashes):
+        encontrados = np.zeros(len(hashes), dtype=bool)
+        for corrida in self.corridas:
+            posicoes = np.minimum(np.searchsorted(corrida, hashes), len(corrida) - 1)
+            encontrados |= corrida[posicoes] == hashes
+        return encontrados
+
+    def adicionar(self, hashes):
+        # hashes: ordenados, sem repetição e nenhum já presente no conjunto.
+        if not len(hashes):
+            return
+        nova = hashes
+        while self.corridas and len(self.corridas[-1]) <= len(nova):
+            nova = np.sort(np.concatenate((self.corridas.pop(), nova)), kind='stable')
+        self.corridas.append(nova)
+
+
+def deduplicar_bloco(df, vistos):
+    # Mantém a primeira ocorrência de cada número de voo que ainda não está
+    # em vistos (HashesVistos) e acrescenta os novos ao conjunto.
+    hashes = pd.util.hash_array(df['flight_number'].to_numpy(dtype=object))
+
+    unicos, primeiros = np.unique(hashes, return_index=True)
+    novos = ~vistos.contem(unicos)
+
+    manter = np.zeros(len(df), dtype=bool)
+    manter[primeiros[novos]] = True
+    vistos.adicionar(unicos[novos])
+    return df[manter]
+
+
+class TestDeduplicarEmBlocos(unittest.TestCase):
+
+    def deduplicar(self, numeros, tamanho_bloco):
+        df = pd.DataFrame({'flight_number': numeros, 'linha': range(len(numeros))})
+        vistos = HashesVistos()
+        partes = [deduplicar_bloco(df.iloc[i:i + tamanho_bloco], vistos) for i in range(0, len(df), tamanho_bloco)]
+        return pd.concat(partes), vistos
+
+    def test_igual_ao_drop_duplicates_em_memoria(self):
+        rng = np.random.default_rng(0)
+        numeros = [f"FL{n}" for n in rng.integers(0, 600, 2000)]
+        esperado = pd.DataFrame({'flight_number': numeros, 'linha': range(len(numeros))})
+        esperado = esperado.drop_duplicates(subset=['flight_number'], keep='first')
+
+        for tamanho_bloco in (1, 7, 500, 2000):
+            resultado, vistos = self.deduplicar(numeros, tamanho_bloco)
+            self.assertEqual(resultado['linha'].tolist(), esperado['linha'].tolist())
+            self.assertEqual(len(vistos), len(esperado))
+
+    def test_corridas_ficam_ordenadas_e_poucas(self):
+        vistos = HashesVistos()
+        for i in range(64):
+            vistos.adicionar(np.arange(i * 100, (i + 1) * 100, dtype=np.uint64))
+        tamanhos = [len(c) for c in vistos.corridas]
+        self.assertEqual(tamanhos, [6400])
+        self.assertTrue(all((np.diff(c) > 0).all() for c in vistos.corridas))
+
+        vistos.adicionar(np.array([10**6, 10**6 + 1], dtype=np.uint64))
+        self.assertEqual([len(c) for c in vistos.corridas], [6400, 2])
+        self.assertEqual(vistos.contem(np.array([5, 10**6, 10**7], dtype=np.uint64)).tolist(), [True, True, False])
+
+    def test_bloco_vazio(self):
+        vistos = HashesVistos()
+        vistos.adicionar(np.empty(0, dtype=np.uint64))
+        self.assertEqual(vistos.corridas, [])
+        self.assertEqual(vistos.contem(np.array([1], dtype=np.uint64)).tolist(), [False])
+
+
+if __name__ == "__main__":
+    unittest.main()
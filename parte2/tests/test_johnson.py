@@ -0,0 +1,226 @@
+import heapq
+import unittest
+from array import array
+
+VIRTUAL_SOURCE = ('__johnson__',)
+
+
+def bellman_ford(graph, start):
+    dist = {n: float('inf') for n in graph}
+    pred = {n: None for n in graph}
+    dist[start] = 0
+
+    changed = {start}
+
+    for _ in range(len(graph) - 1):
+        if not changed:
+            break
+        for u in graph:
+            if u not in changed:
+                continue
+            changed.discard(u)
+            for v, w, log in graph[u]:
+                if dist[u] + w < dist[v]:
+                    dist[v] = dist[u] + w
+                    pred[v] = (u, log, w)
+                    changed.add(v)
+
+    has_neg = False
+    for u in graph:
+        if u not in changed:
+            continue
+        for v, w, _ in graph[u]:
+            if dist[u] + w < dist[v]:
+                has_neg = True
+                break
+        if has_neg:
+            break
+
+    return dist, pred, has_neg
+
+
+def dijkstra_tree(adj, src, dst=None):
+    dist = {n: float('inf') for n in adj}
+    prev = {n: None for n in adj}
+    prev_log = {n: None for n in adj}
+    prev_weight = {n: None for n in adj}
+
+    dist[src] = 0
+    pq = [(0, src)]
+
+    while pq:
+        d, u = heapq.heappop(pq)
+
+        if u == dst:
+            break
+        if d > dist[u]:
+            continue
+
+        for v, w, log in adj[u]:
+            nd = d + w
+
+            if nd < dist[v]:
+                dist[v] = nd
+                prev[v] = u
+                prev_log[v] = log
+                prev_weight[v] = w
+                heapq.heappush(pq, (nd, v))
+
+    return dist, prev, prev_log, prev_weight
+
+
+def potenciais(graph):
+    aux = dict(graph)
+    aux[VIRTUAL_SOURCE] = [(v, 0, None) for v in graph]
+
+    h, _, has_neg = bellman_ford(aux, VIRTUAL_SOURCE)
+    if has_neg:
+        return None
+
+    del h[VIRTUAL_SOURCE]
+    return h
+
+
+def reponderar(graph, h):
+    return {
+        u: [(v, w + h[u] - h[v], (log, w)) for v, w, log in arestas]
+        for u, arestas in graph.items()
+    }
+
+
+def _linha(adj, src, nodes, index, h):
+    dist_rw, prev, prev_log, _ = dijkstra_tree(adj, src)
+
+    dist = []
+    pred = array('l')
+    pred_flight = []
+    pred_weight = []
+    for v in nodes:
+        d = dist_rw[v]
+        dist.append(d - h[src] + h[v] if d != float('inf') else d)
+        if prev[v] is None:
+            pred.append(-1)
+            pred_flight.append(None)
+            pred_weight.append(None)
+        else:
+            pred.append(index[prev[v]])
+            log, w = prev_log[v]
+            pred_flight.append(log)
+            pred_weight.append(w)
+
+    return dist, pred, pred_flight, pred_weight
+
+
+def johnson(graph, sources=None):
+    h = potenciais(graph)
+    if h is None:
+        return None
+
+    adj = reponderar(graph, h)
+    nodes = list(graph)
+    index = {n: i for i, n in enumerate(nodes)}
+    sources = list(graph) if sources is None else list(sources)
+
+    linhas = [_linha(adj, src, nodes, index, h) for src in sources]
+
+    return {
+        "nodes": nodes,
+        "index": index,
+        "sources": sources,
+        "source_index": {n: i for i, n in enumerate(sources)},
+        "dist": [linha[0] for linha in linhas],
+        "pred": [linha[1] for linha in linhas],
+        "pred_flight": [linha[2] for linha in linhas],
+        "pred_weight": [linha[3] for linha in linhas],
+    }
+
+
+def caminho_da_matriz(resultado, origem, destino):
+    i = resultado["source_index"][origem]
+    j = resultado["index"][destino]
+    nodes = resultado["nodes"]
+    cost = resultado["dist"][i][j]
+
+    if cost == float('inf'):
+        return float('inf'), [], [], []
+
+    pred = resultado["pred"][i]
+    pred_flight = resultado["pred_flight"][i]
+    pred_weight = resultado["pred_weight"][i]
+
+    path, flights, weights = [], [], []
+    cur = j
+    while cur != -1:
+        path.append(nodes[cur])
+        if pred[cur] != -1:
+            flights.append(pred_flight[cur])
+            weights.append(pred_weight[cur])
+        cur = pred[cur]
+
+    path.reverse()
+    flights.reverse()
+    weights.reverse()
+
+    return cost, path, flights, weights
+
+
+def sample_graph_negative_edges():
+    return {
+        'S': [('A', 6, 'SA'), ('B', 5, 'SB')],
+        'A': [('C', -2, 'AC')],
+        'B': [('A', -2, 'BA'), ('D', 4, 'BD')],
+        'C': [('B', 5, 'CB'), ('E', 3, 'CE')],
+        'D': [('C', 3, 'DC'), ('E', -1, 'DE')],
+        'E': [],
+        'F': [('S', 1, 'FS')]
+    }
+
+
+def sample_graph_with_negative_cycle():
+    return {
+        'A': [('B', 1, '')],
+        'B': [('C', -1, '')],
+        'C': [('A', -1, '')]
+    }
+
+
+class TestJohnson(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = sample_graph_negative_edges()
+
+    def test_distancias_iguais_ao_bellman_ford(self):
+        resultado = johnson(self.graph)
+        for src in self.graph:
+            dist, _, _ = bellman_ford(self.graph, src)
+            for dst in self.graph:
+                cost, _, _, _ = caminho_da_matriz(resultado, src, dst)
+                self.assertEqual(cost, dist[dst])
+
+    def test_caminho_usa_pesos_originais(self):
+        resultado = johnson(self.graph)
+        cost, path, flights, weights = caminho_da_matriz(resultado, 'S', 'E')
+
+        self.assertEqual(cost, 4)
+        self.assertEqual(path, ['S', 'B', 'A', 'C', 'E'])
+        self.assertEqual(flights, ['SB', 'BA', 'AC', 'CE'])
+        self.assertEqual(weights, [5, -2, -2, 3])
+
+    def test_destino_inalcancavel(self):
+        resultado = johnson(self.graph)
+        cost, path, flights, weights = caminho_da_matriz(resultado, 'S', 'F')
+
+        self.assertEqual(cost, float('inf'))
+        self.assertEqual(path, [])
+
+    def test_subconjunto_de_origens(self):
+        resultado = johnson(self.graph, sources=['F'])
+        self.assertEqual(len(resultado["dist"]), 1)
+        self.assertEqual(caminho_da_matriz(resultado, 'F', 'E')[0], 5)
+
+    def test_ciclo_negativo(self):
+        self.assertIsNone(johnson(sample_graph_with_negative_cycle()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,363 @@
+import heapq
+import time
+import tracemalloc
+import unittest
+from collections import OrderedDict
+from contextlib import contextmanager
+
+ALGORITMOS = ['Dijkstra', 'Bellman-Ford']
+MAX_ROTAS_EM_CACHE = 4096
+
+
+class ProfileRecord:
+    def __init__(self, name):
+        self.name = name
+        self.elapsed_ns = None
+        self.peak_memory_kb = None
+
+    @property
+    def elapsed_seconds(self):
+        return None if self.elapsed_ns is None else self.elapsed_ns / 1e9
+
+    def summary(self):
+        partes = []
+        if self.elapsed_ns is not None:
+            partes.append(f"em {self.elapsed_seconds:.6f}s")
+        if self.peak_memory_kb is not None:
+            partes.append(f"pico de memória: {self.peak_memory_kb:.2f} KB")
+        return ", ".join(partes)
+
+    def to_dict(self):
+        return {
+            "etapa": self.name,
+            "tempo_execucao_segundos": self.elapsed_seconds,
+            "peak_memory_kb": self.peak_memory_kb,
+        }
+
+
+class Profiler:
+    # Tempo via perf_counter_ns é barato e fica ligado por padrão; o
+    # tracemalloc deixa cada alocação mais lenta, então só roda se pedido.
+    def __init__(self, timing=True, memory=False):
+        self.timing = timing
+        self.memory = memory
+        self.records = []
+
+    @classmethod
+    def from_args(cls, args):
+        return cls(timing=not args.sem_perfil, memory=args.perfil_memoria and not args.sem_perfil)
+
+    @staticmethod
+    def add_arguments(parser):
+        parser.add_argument('--sem-perfil', action='store_true',
+                            help='não mede tempo nem memória')
+        parser.add_argument('--perfil-memoria', action='store_true',
+                            help='mede o pico de memória com tracemalloc (deixa a execução mais lenta)')
+
+    @contextmanager
+    def measure(self, name):
+        record = ProfileRecord(name)
+
+        started_tracing = False
+        if self.memory:
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+                started_tracing = True
+
+        start = time.perf_counter_ns() if self.timing else None
+        try:
+            yield record
+        finally:
+            if self.timing:
+                record.elapsed_ns = time.perf_counter_ns() - start
+            if self.memory:
+                _, peak = tracemalloc.get_traced_memory()
+                record.peak_memory_kb = peak / 1024
+                if started_tracing:
+                    tracemalloc.stop()
+            self.records.append(record)
+
+    def report(self):
+        if not self.timing:
+            return
+
+        totais = {}
+        for record in self.records:
+            etapa = record.name.split(':')[0]
+            total, quantidade = totais.get(etapa, (0, 0))
+            totais[etapa] = (total + record.elapsed_ns, quantidade + 1)
+
+        print("\n--- PERFIL DE EXECUÇÃO ---")
+        for etapa, (total, quantidade) in totais.items():
+            print(f"  {etapa}: {quantidade} medições, {total / 1e9:.6f}s no total, "
+                  f"{total / quantidade / 1e3:.1f} µs em média")
+
+
+def dijkstra_tree(adj, src, dst=None):
+    dist = {n: float('inf') for n in adj}
+    prev = {n: None for n in adj}
+    prev_log = {n: None for n in adj}
+    prev_weight = {n: None for n in adj}
+
+    dist[src] = 0
+    pq = [(0, src)]
+
+    while pq:
+        d, u = heapq.heappop(pq)
+
+        if u == dst:
+            break
+        if d > dist[u]:
+            continue
+
+        for v, w, log in adj[u]:
+            nd = d + w
+
+            if nd < dist[v]:
+                dist[v] = nd
+                prev[v] = u
+                prev_log[v] = log
+                prev_weight[v] = w
+                heapq.heappush(pq, (nd, v))
+
+    return dist, prev, prev_log, prev_weight
+
+
+def caminho_da_arvore(tree, dst):
+    dist, prev, prev_log, prev_weight = tree
+
+    if dist[dst] == float('inf'):
+        return float('inf'), [], [], []
+
+    path, logs, weights = [], [], []
+    cur = dst
+
+    while cur:
+        path.append(cur)
+        if prev_log[cur]:
+            logs.append(prev_log[cur])
+            weights.append(prev_weight[cur])
+        cur = prev[cur]
+
+    path.reverse()
+    logs.reverse()
+    weights.reverse()
+
+    return dist[dst], path, logs, weights
+
+
+def dijkstra(adj, src, dst):
+    if src not in adj or dst not in adj:
+        return float('inf'), [], [], []
+
+    return caminho_da_arvore(dijkstra_tree(adj, src, dst), dst)
+
+
+def bellman_ford(graph, start):
+    dist = {n: float('inf') for n in graph}
+    pred = {n: None for n in graph}
+    dist[start] = 0
+
+    # Só nós cuja distância mudou desde a última varredura podem relaxar
+    # alguma aresta; os demais são pulados sem alterar a ordem das rodadas.
+    changed = {start}
+
+    for _ in range(len(graph) - 1):
+        if not changed:
+            break
+        for u in graph:
+            if u not in changed:
+                continue
+            changed.discard(u)
+            for v, w, log in graph[u]:
+                if dist[u] + w < dist[v]:
+                    dist[v] = dist[u] + w
+                    pred[v] = (u, log, w)
+                    changed.add(v)
+
+    has_neg = False
+    for u in graph:
+        if u not in changed:
+            continue
+        for v, w, _ in graph[u]:
+            if dist[u] + w < dist[v]:
+                has_neg = True
+                break
+        if has_neg:
+            break
+
+    return dist, pred, has_neg
+
+
+def reconstruir_caminho(pred, origem, destino):
+    path, flights, weights = [], [], []
+    cur = destino
+    while cur and cur in pred and pred[cur]:
+        path.insert(0, cur)
+        prev_node, log, w = pred[cur]
+        flights.insert(0, log)
+        weights.insert(0, w)
+        cur = prev_node
+    
+    if cur == origem:
+        path.insert(0, origem)
+    
+    if not path or path[0] != origem:
+        return [], [], [] 
+        
+    return path, flights, weights
+
+
+def rota_json(exemplo_num, cost, path, flights, weights, src, dst, exec_time, peak_memory_kb):
+    resultado_json = {
+        "exemplo_num": exemplo_num,
+        "origem": src,
+        "destino": dst,
+        "custo_total_minutos": cost,
+        "tempo_execucao_segundos": exec_time,
+        "peak_memory_kb": peak_memory_kb,
+        "caminho": path,
+        "etapas": []
+    }
+    for j in range(len(flights)):
+        etapa = {
+            "de": path[j],
+            "para": path[j+1],
+            "voo": flights[j],
+            "duration_minutes": weights[j]
+        }
+        resultado_json["etapas"].append(etapa)
+    return resultado_json
+
+
+class RouteService:
+    # Carrega o grafo uma vez e responde (origem, destino, algoritmo) sob
+    # demanda. As respostas ficam em um LRU limitado cuja chave inclui a
+    # versão do grafo: trocar o grafo invalida todas de uma vez.
+    def __init__(self, graph, max_entries=MAX_ROTAS_EM_CACHE, profiler=None):
+        self.graph = graph
+        self.version = 0
+        self.max_entries = max_entries
+        self.profiler = profiler or Profiler()
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def nodes(self):
+        return sorted(self.graph)
+
+    def set_graph(self, graph):
+        self.graph = graph
+        self.version += 1
+        self.cache.clear()
+
+    def route(self, origem, destino, algoritmo='Dijkstra'):
+        if algoritmo not in ALGORITMOS:
+            raise ValueError(f"Algoritmo desconhecido: {algoritmo}")
+
+        key = (self.version, origem, destino, algoritmo)
+        if key in self.cache:
+            self.hits += 1
+            self.cache.move_to_end(key)
+            return self.cache[key]
+
+        self.misses += 1
+        resultado = self._calcular(origem, destino, algoritmo)
+
+        self.cache[key] = resultado
+        if len(self.cache) > self.max_entries:
+            self.cache.popitem(last=False)
+        return resultado
+
+    def _calcular(self, origem, destino, algoritmo):
+        if origem not in self.graph or destino not in self.graph:
+            return None
+
+        with self.profiler.measure(f"{algoritmo}:{origem}->{destino}") as perfil:
+            if algoritmo == 'Dijkstra':
+                cost, path, flights, weights = dijkstra(self.graph, origem, destino)
+            else:
+                dist, pred, _ = bellman_ford(self.graph, origem)
+                cost = dist[destino]
+                path, flights, weights = reconstruir_caminho(pred, origem, destino)
+
+        if cost == float('inf'):
+            return None
+        return rota_json(None, cost, path, flights, weights, origem, destino,
+                         perfil.elapsed_seconds, perfil.peak_memory_kb)
+
+
+def sample_graph():
+    return {
+        'A': [('B', 2, 'AB1'), ('C', 10, 'AC1'), ('B', 3, 'AB2')],
+        'B': [('C', 3, 'BC1')],
+        'C': [('D', 1, 'CD1')],
+        'D': [],
+        'E': [],
+    }
+
+
+class TestRouteService(unittest.TestCase):
+
+    def setUp(self):
+        self.servico = RouteService(sample_graph(), max_entries=2)
+
+    def test_rota_dijkstra_e_bellman_ford(self):
+        for algoritmo in ALGORITMOS:
+            rota = self.servico.route('A', 'D', algoritmo)
+            self.assertEqual(rota["custo_total_minutos"], 6)
+            self.assertEqual(rota["caminho"], ['A', 'B', 'C', 'D'])
+            self.assertEqual([e["voo"] for e in rota["etapas"]], ['AB1', 'BC1', 'CD1'])
+
+    def test_sem_rota_ou_no_desconhecido(self):
+        self.assertIsNone(self.servico.route('D', 'A'))
+        self.assertIsNone(self.servico.route('A', 'Z'))
+        with self.assertRaises(ValueError):
+            self.servico.route('A', 'D', 'Floyd')
+
+    def test_acerto_no_cache(self):
+        primeira = self.servico.route('A', 'D')
+        self.assertIs(self.servico.route('A', 'D'), primeira)
+        self.assertEqual((self.servico.hits, self.servico.misses), (1, 1))
+        # O algoritmo faz parte da chave.
+        self.servico.route('A', 'D', 'Bellman-Ford')
+        self.assertEqual((self.servico.hits, self.servico.misses), (1, 2))
+
+    def test_lru_descarta_a_menos_usada(self):
+        self.servico.route('A', 'B')
+        self.servico.route('A', 'C')
+        self.servico.route('A', 'B')
+        self.servico.route('A', 'D')
+        self.assertEqual(len(self.servico.cache), 2)
+        self.assertEqual([k[1:3] for k in self.servico.cache], [('A', 'B'), ('A', 'D')])
+
+        self.servico.route('A', 'C')
+        self.assertEqual((self.servico.hits, self.servico.misses), (1, 4))
+
+    def test_trocar_o_grafo_invalida_o_cache(self):
+        self.servico.route('A', 'D')
+        grafo = sample_graph()
+        grafo['A'].append(('D', 4, 'AD1'))
+        self.servico.set_graph(grafo)
+
+        self.assertEqual(self.servico.version, 1)
+        self.assertEqual(len(self.servico.cache), 0)
+        rota = self.servico.route('A', 'D')
+        self.assertEqual(rota["custo_total_minutos"], 4)
+        self.assertEqual(self.servico.misses, 2)
+        self.assertEqual(self.servico.nodes(), ['A', 'B', 'C', 'D', 'E'])
+
+    def test_tempo_vem_do_profiler(self):
+        rota = self.servico.route('A', 'D')
+        self.assertEqual([r.name for r in self.servico.profiler.records], ['Dijkstra:A->D'])
+        self.assertEqual(rota["tempo_execucao_segundos"], self.servico.profiler.records[0].elapsed_seconds)
+        self.assertIsNone(rota["peak_memory_kb"])
+
+        sem_perfil = RouteService(sample_graph(), profiler=Profiler(timing=False))
+        self.assertIsNone(sem_perfil.route('A', 'D')["tempo_execucao_segundos"])
+
+
+if __name__ == "__main__":
+    unittest.main()
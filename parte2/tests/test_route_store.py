@@ -0,0 +1,114 @@
+import gzip
+import json
+import os
+import tempfile
+import unittest
+
+
+def iter_json_records(path):
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        if path.endswith('.jsonl') or path.endswith('.jsonl.gz'):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from json.load(f)
+
+
+class RouteStore:
+    # Índice das rotas pré-calculadas (saída do dijkstra.py/bellman_ford.py)
+    # por (origem, destino), com as listas de origens, destinos e nós já
+    # prontas para os seletores da interface.
+    def __init__(self, routes):
+        self.routes = routes
+
+        origins, destinations, nodes = set(), set(), set()
+        for (origem, destino), registro in routes.items():
+            origins.add(origem)
+            destinations.add(destino)
+            for etapa in registro.get("etapas", []):
+                nodes.add(etapa["de"])
+                nodes.add(etapa["para"])
+
+        self.origins = sorted(origins)
+        self.destinations = sorted(destinations)
+        self.nodes = sorted(nodes)
+
+    @classmethod
+    def from_json(cls, path):
+        return cls({(r["origem"], r["destino"]): r for r in iter_json_records(path)})
+
+    def __len__(self):
+        return len(self.routes)
+
+    def get(self, origem, destino):
+        return self.routes.get((origem, destino))
+
+
+def rota(origem, destino, *paradas):
+    caminho = [origem, *paradas, destino]
+    return {
+        "origem": origem,
+        "destino": destino,
+        "custo_total_minutos": 100 * (len(caminho) - 1),
+        "caminho": caminho,
+        "etapas": [{"de": de, "para": para, "voo": f"{de[:2]}{para[:2]}", "duration_minutes": 100}
+                   for de, para in zip(caminho, caminho[1:])],
+    }
+
+
+def sample_routes():
+    return [
+        rota('Peru', 'Chile'),
+        rota('Brazil', 'Mexico', 'Panama'),
+        rota('Brazil', 'Chile'),
+        rota('Argentina', 'Peru', 'Bolivia', 'Chile'),
+    ]
+
+
+class TestRouteStore(unittest.TestCase):
+
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.pasta.cleanup()
+
+    def gravar(self, nome, rotas):
+        path = os.path.join(self.pasta.name, nome)
+        opener = gzip.open if nome.endswith('.gz') else open
+        with opener(path, 'wt', encoding='utf-8') as f:
+            if '.jsonl' in nome:
+                f.writelines(json.dumps(r) + '\n' for r in rotas)
+            else:
+                json.dump(rotas, f, indent=4)
+        return path
+
+    def test_busca_por_origem_e_destino(self):
+        for nome in ('rotas.json', 'rotas.jsonl', 'rotas.jsonl.gz'):
+            store = RouteStore.from_json(self.gravar(nome, sample_routes()))
+            self.assertEqual(len(store), 4)
+            registro = store.get('Brazil', 'Mexico')
+            self.assertEqual(registro["caminho"], ['Brazil', 'Panama', 'Mexico'])
+            self.assertEqual(store.get('Peru', 'Chile')["custo_total_minutos"], 100)
+
+    def test_par_inexistente(self):
+        store = RouteStore.from_json(self.gravar('rotas.json', sample_routes()))
+        self.assertIsNone(store.get('Chile', 'Brazil'))
+        self.assertIsNone(store.get('Japan', 'Peru'))
+
+    def test_listas_dos_seletores_ordenadas(self):
+        store = RouteStore.from_json(self.gravar('rotas.json', sample_routes()))
+        self.assertEqual(store.origins, ['Argentina', 'Brazil', 'Peru'])
+        self.assertEqual(store.destinations, ['Chile', 'Mexico', 'Peru'])
+        self.assertEqual(store.nodes, ['Argentina', 'Bolivia', 'Brazil', 'Chile', 'Mexico', 'Panama', 'Peru'])
+
+    def test_arquivo_vazio(self):
+        store = RouteStore.from_json(self.gravar('rotas.json', []))
+        self.assertEqual(len(store), 0)
+        self.assertEqual((store.origins, store.destinations, store.nodes), ([], [], []))
+
+
+if __name__ == "__main__":
+    unittest.main()
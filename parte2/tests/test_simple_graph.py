@@ -0,0 +1,174 @@
+import heapq
+import unittest
+
+import numpy as np
+import pandas as pd
+
+
+def cheapest_flights(df):
+    grupos = df.groupby(['from_country', 'dest_country'], sort=False)['duration_minutes']
+    return df.loc[grupos.idxmin()].sort_index()
+
+
+def build_flight_index(df):
+    ordenado = df.sort_values(['from_country', 'dest_country', 'duration_minutes'], kind='stable')
+
+    flight_index = {}
+    for chave, grupo in ordenado.groupby(['from_country', 'dest_country'], sort=False):
+        flight_index[chave] = list(zip(grupo['duration_minutes'].tolist(), grupo['flight_number'].tolist()))
+
+    return flight_index
+
+
+def adjacency_from_flights(df, simple=False):
+    adjacency_list = {}
+    nodes_origem = pd.unique(df['from_country'].to_numpy()).tolist()
+    nodes_destino = pd.unique(df['dest_country'].to_numpy()).tolist()
+
+    if simple:
+        df = cheapest_flights(df)
+
+    destinos = df['dest_country'].tolist()
+    pesos = df['duration_minutes'].tolist()
+    voos = df['flight_number'].tolist()
+
+    codigos = pd.Categorical(df['from_country'].to_numpy(), categories=nodes_origem).codes
+    ordem = codigos.argsort(kind='stable')
+    limites = np.bincount(codigos, minlength=len(nodes_origem)).cumsum()
+
+    inicio = 0
+    for origem, fim in zip(nodes_origem, limites.tolist()):
+        idx = ordem[inicio:fim].tolist()
+        adjacency_list[origem] = [(destinos[i], pesos[i], voos[i]) for i in idx]
+        inicio = fim
+
+    for node in nodes_destino:
+        adjacency_list.setdefault(node, [])
+
+    return adjacency_list
+
+
+def dijkstra_tree(adj, src, dst=None):
+    dist = {n: float('inf') for n in adj}
+    prev = {n: None for n in adj}
+    prev_log = {n: None for n in adj}
+    prev_weight = {n: None for n in adj}
+
+    dist[src] = 0
+    pq = [(0, src)]
+
+    while pq:
+        d, u = heapq.heappop(pq)
+
+        if u == dst:
+            break
+        if d > dist[u]:
+            continue
+
+        for v, w, log in adj[u]:
+            nd = d + w
+
+            if nd < dist[v]:
+                dist[v] = nd
+                prev[v] = u
+                prev_log[v] = log
+                prev_weight[v] = w
+                heapq.heappush(pq, (nd, v))
+
+    return dist, prev, prev_log, prev_weight
+
+
+def bellman_ford(graph, start):
+    dist = {n: float('inf') for n in graph}
+    pred = {n: None for n in graph}
+    dist[start] = 0
+
+    changed = {start}
+
+    for _ in range(len(graph) - 1):
+        if not changed:
+            break
+        for u in graph:
+            if u not in changed:
+                continue
+            changed.discard(u)
+            for v, w, log in graph[u]:
+                if dist[u] + w < dist[v]:
+                    dist[v] = dist[u] + w
+                    pred[v] = (u, log, w)
+                    changed.add(v)
+
+    return dist, pred
+
+
+def sample_flights():
+    # Pares com vários voos (inclusive empates de duração) e um país que só
+    # aparece como destino.
+    linhas = [
+        ('Brazil', 'Chile', 'LA100', 240),
+        ('Brazil', 'Chile', 'G3200', 210),
+        ('Brazil', 'Chile', 'AR300', 260),
+        ('Brazil', 'Peru', 'LA400', 300),
+        ('Chile', 'Peru', 'LA500', 150),
+        ('Chile', 'Peru', 'H2600', 150),
+        ('Chile', 'Brazil', 'LA700', 230),
+        ('Peru', 'Mexico', 'AM800', 380),
+        ('Peru', 'Mexico', 'CM900', 420),
+        ('Peru', 'Mexico', 'AV110', 365),
+        ('Mexico', 'Canada', 'AC120', 290),
+        ('Brazil', 'Mexico', 'AM130', 700),
+        ('Brazil', 'Mexico', 'LA140', 640),
+    ]
+    return pd.DataFrame(linhas, columns=['from_country', 'dest_country', 'flight_number', 'duration_minutes'])
+
+
+class TestSimpleGraph(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.df = sample_flights()
+        cls.multi = adjacency_from_flights(cls.df)
+        cls.simples = adjacency_from_flights(cls.df, simple=True)
+        cls.index = build_flight_index(cls.df)
+
+    def test_uma_aresta_por_par(self):
+        self.assertEqual(set(self.simples), set(self.multi))
+        for origem, arestas in self.simples.items():
+            destinos = [v for v, _, _ in arestas]
+            self.assertEqual(len(destinos), len(set(destinos)))
+            self.assertEqual(set(destinos), {v for v, _, _ in self.multi[origem]})
+        self.assertEqual(self.simples['Canada'], [])
+
+    def test_aresta_e_o_voo_mais_curto_do_indice(self):
+        for origem, arestas in self.simples.items():
+            for destino, peso, voo in arestas:
+                self.assertEqual(self.index[(origem, destino)][0], (peso, voo))
+
+    def test_indice_guarda_todos_os_voos_ordenados(self):
+        self.assertEqual(self.index[('Brazil', 'Chile')], [(210, 'G3200'), (240, 'LA100'), (260, 'AR300')])
+        self.assertEqual(self.index[('Chile', 'Peru')], [(150, 'LA500'), (150, 'H2600')])
+        self.assertEqual(sum(len(voos) for voos in self.index.values()), len(self.df))
+
+    def test_dijkstra_igual_ao_multigrafo(self):
+        for origem in self.multi:
+            dist_multi, _, _, _ = dijkstra_tree(self.multi, origem)
+            dist_simples, prev, prev_log, prev_weight = dijkstra_tree(self.simples, origem)
+            self.assertEqual(dist_simples, dist_multi)
+            # Cada trecho do caminho é o voo mais curto do seu par.
+            for v, u in prev.items():
+                if u is not None:
+                    self.assertEqual(self.index[(u, v)][0], (prev_weight[v], prev_log[v]))
+
+    def test_bellman_ford_igual_ao_multigrafo(self):
+        for origem in self.multi:
+            dist_multi, _ = bellman_ford(self.multi, origem)
+            dist_simples, _ = bellman_ford(self.simples, origem)
+            self.assertEqual(dist_simples, dist_multi)
+
+    def test_bellman_ford_igual_ao_dijkstra_no_simples(self):
+        for origem in self.simples:
+            self.assertEqual(bellman_ford(self.simples, origem)[0], dijkstra_tree(self.simples, origem)[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
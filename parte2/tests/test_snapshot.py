@@ -0,0 +1,335 @@
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+import unittest
+from array import array
+
+
+class CSRGraph:
+    # Nós são internados como inteiros 0..n-1; as arestas de u ocupam as
+    # posições offsets[u]..offsets[u+1] de targets, weights e flight_ids.
+    def __init__(self, names, offsets, targets, weights, flight_ids, flights):
+        self.names = names
+        self.index = {n: i for i, n in enumerate(names)}
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.flight_ids = flight_ids
+        self.flights = flights
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def keys(self):
+        return list(self.names)
+
+    def num_edges(self):
+        return len(self.targets)
+
+    def edges(self, u):
+        return range(self.offsets[u], self.offsets[u + 1])
+
+    def flight(self, e):
+        return self.flights[self.flight_ids[e]]
+
+    def to_adjacency(self):
+        names, targets, weights = self.names, self.targets, self.weights
+        return {
+            names[u]: [(names[targets[e]], weights[e], self.flight(e)) for e in self.edges(u)]
+            for u in range(len(names))
+        }
+
+    @classmethod
+    def from_adjacency(cls, adjacency_list):
+        names = list(adjacency_list)
+        index = {n: i for i, n in enumerate(names)}
+        flight_index = {}
+
+        offsets = [0]
+        targets = []
+        weights = []
+        flight_ids = array('i')
+        for u in names:
+            for v, w, voo in adjacency_list[u]:
+                targets.append(index[v])
+                weights.append(w)
+                flight_ids.append(flight_index.setdefault(voo, len(flight_index)))
+            offsets.append(len(targets))
+
+        return cls(names, offsets, targets, weights, flight_ids, list(flight_index))
+
+
+MAGIC = b'GRAFOCSR'
+VERSAO = 1
+
+# magic, versão, simples, tipo dos pesos ('q' ou 'd'), mtime_ns e tamanho do
+# CSV de origem, sha256 do CSV, número de nós, de arestas e de voos.
+CABECALHO = struct.Struct('<8sHBcqQ32sQQQ')
+OFFSET_MTIME = struct.calcsize('<8sHBc')
+
+
+class TabelaDeTextos:
+    # Tabela de strings UTF-8 dentro do snapshot; cada item só é
+    # decodificado quando alguém pede por ele.
+    def __init__(self, offsets, blob):
+        self.offsets = offsets
+        self.blob = blob
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return str(self.blob[self.offsets[i]:self.offsets[i + 1]], 'utf-8')
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+
+class GrafoMapeado(CSRGraph):
+    # CSRGraph cujas listas são fatias do mmap do snapshot. memoryview não
+    # pode ser serializada, então quem recebe o grafo por pickle (processos
+    # criados sem fork) reabre o mesmo arquivo em vez de receber uma cópia.
+    def __init__(self, path, *args):
+        super().__init__(*args)
+        self.path = os.path.abspath(path)
+
+    def __reduce__(self):
+        return carregar_snapshot, (self.path,)
+
+
+def caminho_snapshot(csv_path, simple=False):
+    base, _ = os.path.splitext(csv_path)
+    return base + ('_simples' if simple else '') + '.grafo'
+
+
+def sha256_arquivo(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for bloco in iter(lambda: f.read(1 << 20), b''):
+            h.update(bloco)
+    return h.digest()
+
+
+def _alinhar(f):
+    resto = f.tell() % 8
+    if resto:
+        f.write(b'\0' * (8 - resto))
+
+
+def _escrever_textos(f, textos):
+    codificados = [t.encode('utf-8') for t in textos]
+    offsets = array('q', [0])
+    for c in codificados:
+        offsets.append(offsets[-1] + len(c))
+    f.write(offsets.tobytes())
+    f.write(b''.join(codificados))
+    _alinhar(f)
+
+
+def salvar_snapshot(graph, path, csv_path, simple=False):
+    st = os.stat(csv_path)
+    tipo_peso = b'q' if all(isinstance(w, int) for w in graph.weights) else b'd'
+    cabecalho = CABECALHO.pack(
+        MAGIC, VERSAO, int(simple), tipo_peso, st.st_mtime_ns, st.st_size, sha256_arquivo(csv_path),
+        len(graph), graph.num_edges(), len(graph.flights),
+    )
+
+    # Grava em um arquivo temporário e troca no final para que uma
+    # execução interrompida nunca deixe um snapshot pela metade.
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(cabecalho)
+        _alinhar(f)
+        _escrever_textos(f, graph.names)
+        f.write(array('q', graph.offsets).tobytes())
+        f.write(array('i', graph.targets).tobytes())
+        _alinhar(f)
+        f.write(array(tipo_peso.decode(), graph.weights).tobytes())
+        f.write(array('i', graph.flight_ids).tobytes())
+        _alinhar(f)
+        _escrever_textos(f, graph.flights)
+    os.replace(tmp_path, path)
+
+
+def _ler_cabecalho(path):
+    with open(path, 'rb') as f:
+        dados = f.read(CABECALHO.size)
+    if len(dados) < CABECALHO.size:
+        return None
+    return CABECALHO.unpack(dados)
+
+
+def snapshot_atualizado(path, csv_path, simple=False):
+    if not os.path.exists(path):
+        return False
+
+    cabecalho = _ler_cabecalho(path)
+    if cabecalho is None:
+        return False
+    magic, versao, simples, _, mtime_ns, tamanho, digest, _, _, _ = cabecalho
+    if magic != MAGIC or versao != VERSAO or simples != int(simple):
+        return False
+
+    st = os.stat(csv_path)
+    if st.st_size != tamanho:
+        return False
+    if st.st_mtime_ns == mtime_ns:
+        return True
+    # O mtime mudou (cópia, checkout...): só o conteúdo decide. Se for o
+    # mesmo, o novo mtime é gravado para evitar o hash nas próximas vezes.
+    if sha256_arquivo(csv_path) != digest:
+        return False
+    with open(path, 'r+b') as f:
+        f.seek(OFFSET_MTIME)
+        f.write(struct.pack('<q', st.st_mtime_ns))
+    return True
+
+
+def carregar_snapshot(path):
+    with open(path, 'rb') as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    # As fatias de memoryview apontam direto para o mmap: nada é copiado.
+    buf = memoryview(mm)
+    _, _, _, tipo_peso, _, _, _, num_nodes, num_edges, num_flights = CABECALHO.unpack_from(buf)
+    pos = CABECALHO.size + (-CABECALHO.size % 8)
+
+    def secao(formato, quantidade):
+        nonlocal pos
+        tamanho = quantidade * struct.calcsize(formato)
+        view = buf[pos:pos + tamanho].cast(formato)
+        pos += tamanho
+        pos += -pos % 8
+        return view
+
+    def textos(quantidade):
+        nonlocal pos
+        offsets = secao('q', quantidade + 1)
+        blob = buf[pos:pos + offsets[quantidade]]
+        pos += offsets[quantidade]
+        pos += -pos % 8
+        return TabelaDeTextos(offsets, blob)
+
+    names = list(textos(num_nodes))
+    offsets = secao('q', num_nodes + 1)
+    targets = secao('i', num_edges)
+    weights = secao(tipo_peso.decode(), num_edges)
+    flight_ids = secao('i', num_edges)
+    flights = textos(num_flights)
+
+    return GrafoMapeado(path, names, offsets, targets, weights, flight_ids, flights)
+
+
+def sample_graph():
+    adj = {
+        'Brazil': [('Chile', 210, 'G3200'), ('Chile', 240, 'LA100'), ('Perú', 300, 'LA400')],
+        'Chile': [('Perú', 150, 'LA500'), ('Brazil', 230, 'LA700')],
+        'Perú': [('México', 380, 'AM800')],
+        'México': [],
+    }
+    return adj, CSRGraph.from_adjacency(adj)
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.pasta.name, 'voos.csv')
+        with open(self.csv_path, 'w', encoding='utf-8') as f:
+            f.write('from_country,dest_country,flight_number,duration_minutes\n')
+            f.write('Brazil,Chile,G3200,210\n')
+        self.path = caminho_snapshot(self.csv_path)
+        self.adj, self.graph = sample_graph()
+
+    def tearDown(self):
+        self.pasta.cleanup()
+
+    def reescrever_csv(self, conteudo):
+        st = os.stat(self.csv_path)
+        with open(self.csv_path, 'w', encoding='utf-8') as f:
+            f.write(conteudo)
+        # Garante um mtime diferente mesmo em sistemas de arquivos com
+        # resolução grosseira.
+        os.utime(self.csv_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+    def mtime_gravado(self):
+        with open(self.path, 'rb') as f:
+            return CABECALHO.unpack(f.read(CABECALHO.size))[4]
+
+    def test_caminho_ao_lado_do_csv(self):
+        self.assertEqual(self.path, os.path.join(self.pasta.name, 'voos.grafo'))
+        self.assertEqual(caminho_snapshot(self.csv_path, simple=True), os.path.join(self.pasta.name, 'voos_simples.grafo'))
+
+    def test_ida_e_volta(self):
+        salvar_snapshot(self.graph, self.path, self.csv_path)
+        carregado = carregar_snapshot(self.path)
+
+        self.assertEqual(list(carregado.names), list(self.graph.names))
+        self.assertEqual(list(carregado.offsets), list(self.graph.offsets))
+        self.assertEqual(list(carregado.targets), list(self.graph.targets))
+        self.assertEqual(list(carregado.weights), list(self.graph.weights))
+        self.assertEqual(list(carregado.flight_ids), list(self.graph.flight_ids))
+        self.assertEqual(list(carregado.flights), list(self.graph.flights))
+        self.assertEqual(carregado.to_adjacency(), self.adj)
+        self.assertFalse(os.path.exists(self.path + '.tmp'))
+
+    def test_pesos_fracionarios(self):
+        adj = {'A': [('B', 1.5, 'X1'), ('B', 2, 'X2')], 'B': []}
+        salvar_snapshot(CSRGraph.from_adjacency(adj), self.path, self.csv_path)
+        self.assertEqual(carregar_snapshot(self.path).to_adjacency(), adj)
+
+    def test_grafo_carregado_pode_ir_por_pickle(self):
+        salvar_snapshot(self.graph, self.path, self.csv_path)
+        copia = pickle.loads(pickle.dumps(carregar_snapshot(self.path)))
+        self.assertEqual(copia.to_adjacency(), self.adj)
+
+    def test_atualizado_com_csv_inalterado(self):
+        self.assertFalse(snapshot_atualizado(self.path, self.csv_path))
+        salvar_snapshot(self.graph, self.path, self.csv_path)
+        self.assertTrue(snapshot_atualizado(self.path, self.csv_path))
+        self.assertFalse(snapshot_atualizado(self.path, self.csv_path, simple=True))
+
+    def test_desatualizado_quando_o_tamanho_muda(self):
+        salvar_snapshot(self.graph, self.path, self.csv_path)
+        with open(self.csv_path, encoding='utf-8') as f:
+            conteudo = f.read()
+        self.reescrever_csv(conteudo + 'Chile,Peru,LA500,150\n')
+        self.assertFalse(snapshot_atualizado(self.path, self.csv_path))
+
+    def test_desatualizado_quando_o_conteudo_muda_com_mesmo_tamanho(self):
+        salvar_snapshot(self.graph, self.path, self.csv_path)
+        with open(self.csv_path, encoding='utf-8') as f:
+            conteudo = f.read()
+        self.reescrever_csv(conteudo.replace('210', '999'))
+        self.assertEqual(os.path.getsize(self.csv_path), len(conteudo.encode('utf-8')))
+        self.assertFalse(snapshot_atualizado(self.path, self.csv_path))
+
+    def test_so_o_mtime_muda_e_o_cabecalho_e_regravado(self):
+        salvar_snapshot(self.graph, self.path, self.csv_path)
+        with open(self.csv_path, encoding='utf-8') as f:
+            conteudo = f.read()
+        self.reescrever_csv(conteudo)
+        novo_mtime = os.stat(self.csv_path).st_mtime_ns
+        self.assertNotEqual(self.mtime_gravado(), novo_mtime)
+
+        self.assertTrue(snapshot_atualizado(self.path, self.csv_path))
+        self.assertEqual(self.mtime_gravado(), novo_mtime)
+        self.assertEqual(carregar_snapshot(self.path).to_adjacency(), self.adj)
+
+    def test_arquivo_truncado_nao_vale(self):
+        with open(self.path, 'wb') as f:
+            f.write(MAGIC)
+        self.assertFalse(snapshot_atualizado(self.path, self.csv_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
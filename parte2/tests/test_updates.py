@@ -0,0 +1,355 @@
+import copy
+import hashlib
+import heapq
+import json
+import os
+import random
+import tempfile
+import unittest
+
+VERSAO_ESTADO = 1
+
+
+def dijkstra_tree(adj, src, dst=None):
+    dist = {n: float('inf') for n in adj}
+    prev = {n: None for n in adj}
+    prev_log = {n: None for n in adj}
+    prev_weight = {n: None for n in adj}
+
+    dist[src] = 0
+    pq = [(0, src)]
+
+    while pq:
+        d, u = heapq.heappop(pq)
+
+        if u == dst:
+            break
+        if d > dist[u]:
+            continue
+
+        for v, w, log in adj[u]:
+            nd = d + w
+
+            if nd < dist[v]:
+                dist[v] = nd
+                prev[v] = u
+                prev_log[v] = log
+                prev_weight[v] = w
+                heapq.heappush(pq, (nd, v))
+
+    return dist, prev, prev_log, prev_weight
+
+
+def caminho_da_arvore(tree, dst):
+    dist, prev, prev_log, prev_weight = tree
+
+    if dist[dst] == float('inf'):
+        return float('inf'), [], [], []
+
+    path, logs, weights = [], [], []
+    cur = dst
+
+    while cur:
+        path.append(cur)
+        if prev_log[cur]:
+            logs.append(prev_log[cur])
+            weights.append(prev_weight[cur])
+        cur = prev[cur]
+
+    path.reverse()
+    logs.reverse()
+    weights.reverse()
+
+    return dist[dst], path, logs, weights
+
+
+class DynamicRoutes:
+    # Mantém uma árvore de Dijkstra por origem sobre uma lista de adjacência
+    # que pode ser alterada voo a voo. Cada alteração só invalida as origens
+    # cuja árvore ela pode mudar; refresh() recalcula apenas essas. Árvores
+    # já conhecidas (de um estado salvo) podem ser passadas em trees: só as
+    # origens sem árvore são calculadas na criação.
+    def __init__(self, adj, sources, trees=None):
+        self.adj = adj
+        self.sources = list(sources)
+        self.trees = dict(trees or {})
+        self.dirty = {src for src in self.sources if src not in self.trees}
+        self.refresh()
+
+    def _garantir_no(self, node):
+        if node in self.adj:
+            return
+        self.adj[node] = []
+        for dist, prev, prev_log, prev_weight in self.trees.values():
+            dist[node] = float('inf')
+            prev[node] = None
+            prev_log[node] = None
+            prev_weight[node] = None
+
+    def _invalidar_se_melhora(self, u, v, w):
+        # Uma aresta nova (ou mais barata) só muda a árvore se alcançar v com
+        # custo menor ou igual ao atual; no empate o Dijkstra pode escolhê-la.
+        for src in self.sources:
+            if src in self.dirty:
+                continue
+            dist = self.trees[src][0]
+            if dist[u] != float('inf') and dist[u] + w <= dist[v]:
+                self.dirty.add(src)
+
+    def _invalidar_se_aresta_da_arvore(self, u, v, w, voo):
+        # Remover (ou encarecer) uma aresta fora da árvore não muda nenhuma distância.
+        for src in self.sources:
+            if src in self.dirty:
+                continue
+            _, prev, prev_log, prev_weight = self.trees[src]
+            if prev[v] == u and prev_log[v] == voo and prev_weight[v] == w:
+                self.dirty.add(src)
+
+    def add_flight(self, orig, dest, weight, voo):
+        if weight < 0:
+            raise ValueError(f"Peso negativo não é suportado pelo Dijkstra: {orig} -> {dest} ({voo})")
+        self._garantir_no(orig)
+        self._garantir_no(dest)
+        self.adj[orig].append((dest, weight, voo))
+        self._invalidar_se_melhora(orig, dest, weight)
+
+    def remove_flight(self, orig, dest, voo):
+        arestas = self.adj.get(orig, [])
+        mantidas = [a for a in arestas if a[0] != dest or a[2] != voo]
+        if len(mantidas) == len(arestas):
+            return 0
+
+        self.adj[orig] = mantidas
+        for v, w, log in arestas:
+            if v == dest and log == voo:
+                self._invalidar_se_aresta_da_arvore(orig, dest, w, voo)
+        return len(arestas) - len(mantidas)
+
+    def reweight_flight(self, orig, dest, voo, weight):
+        if weight < 0:
+            raise ValueError(f"Peso negativo não é suportado pelo Dijkstra: {orig} -> {dest} ({voo})")
+
+        alteradas = 0
+        arestas = self.adj.get(orig, [])
+        for i, (v, w, log) in enumerate(arestas):
+            if v != dest or log != voo or w == weight:
+                continue
+            arestas[i] = (v, weight, log)
+            if weight < w:
+                self._invalidar_se_melhora(orig, dest, weight)
+            else:
+                self._invalidar_se_aresta_da_arvore(orig, dest, w, voo)
+            alteradas += 1
+        return alteradas
+
+    def refresh(self):
+        afetadas = [src for src in self.sources if src in self.dirty]
+        for src in afetadas:
+            self.trees[src] = dijkstra_tree(self.adj, src)
+        self.dirty.clear()
+        return afetadas
+
+    def route(self, src, dst):
+        return caminho_da_arvore(self.trees[src], dst)
+
+
+def sha256_arquivo(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for bloco in iter(lambda: f.read(1 << 20), b''):
+            h.update(bloco)
+    return h.digest()
+
+
+def caminho_estado(json_path):
+    base, _ = os.path.splitext(json_path)
+    return base + '.estado.json'
+
+
+def salvar_estado(routes, path, csv_path, json_path):
+    # Grafo com todas as alterações já aplicadas e a árvore de cada origem,
+    # marcados com o CSV de onde o grafo saiu e o JSON que corresponde a ele.
+    dados = {
+        'versao': VERSAO_ESTADO,
+        'csv_sha256': sha256_arquivo(csv_path).hex(),
+        'json_sha256': sha256_arquivo(json_path).hex(),
+        'adj': routes.adj,
+        'arvores': routes.trees,
+    }
+    # Mesmo esquema do snapshot: nunca deixa um arquivo pela metade.
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(dados, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def carregar_estado(path, csv_path, json_path):
+    # Devolve (adj, trees) do estado salvo, ou None se ele não existe ou se o
+    # CSV ou o JSON mudaram desde que ele foi gravado (dijkstra.py ou io.py
+    # rodaram de novo, por exemplo).
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding='utf-8') as f:
+            dados = json.load(f)
+        if (dados.get('versao') != VERSAO_ESTADO
+                or dados.get('csv_sha256') != sha256_arquivo(csv_path).hex()
+                or dados.get('json_sha256') != sha256_arquivo(json_path).hex()):
+            return None
+        adj = {u: [tuple(aresta) for aresta in arestas] for u, arestas in dados['adj'].items()}
+        trees = {src: tuple(arvore) for src, arvore in dados['arvores'].items()}
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    return adj, trees
+
+
+def sample_graph():
+    return {
+        'A': [('B', 4, 'AB1'), ('C', 1, 'AC1')],
+        'B': [('D', 1, 'BD1')],
+        'C': [('B', 2, 'CB1'), ('D', 5, 'CD1')],
+        'D': [],
+        'E': [('D', 1, 'ED1')],
+    }
+
+
+class TestDynamicRoutes(unittest.TestCase):
+
+    def assertIgualRecalculo(self, routes):
+        for src in routes.sources:
+            fresca = dijkstra_tree(routes.adj, src)
+            for dst in routes.adj:
+                self.assertEqual(routes.route(src, dst), caminho_da_arvore(fresca, dst))
+
+    def test_remover_aresta_fora_da_arvore_nao_invalida(self):
+        routes = DynamicRoutes(sample_graph(), ['A', 'E'])
+        self.assertEqual(routes.remove_flight('C', 'D', 'CD1'), 1)
+        self.assertEqual(routes.refresh(), [])
+
+    def test_remover_aresta_da_arvore_invalida_so_a_origem_afetada(self):
+        routes = DynamicRoutes(sample_graph(), ['A', 'E'])
+        routes.remove_flight('C', 'B', 'CB1')
+        self.assertEqual(routes.refresh(), ['A'])
+        self.assertEqual(routes.route('A', 'D'), (5, ['A', 'B', 'D'], ['AB1', 'BD1'], [4, 1]))
+
+    def test_adicionar_voo_com_no_novo(self):
+        routes = DynamicRoutes(sample_graph(), ['A', 'E'])
+        routes.add_flight('E', 'F', 3, 'EF1')
+        self.assertEqual(routes.refresh(), ['E'])
+        self.assertEqual(routes.route('A', 'F')[0], float('inf'))
+        self.assertEqual(routes.route('E', 'F'), (3, ['E', 'F'], ['EF1'], [3]))
+
+    def test_alteracoes_aleatorias_igual_recalculo(self):
+        rng = random.Random(3)
+        nodes = [f"N{i}" for i in range(40)]
+        adj = {u: [(rng.choice(nodes), rng.randint(1, 9), f"{u}-{k}") for k in range(3)] for u in nodes}
+        routes = DynamicRoutes(copy.deepcopy(adj), nodes[:10])
+
+        for passo in range(200):
+            u = rng.choice(nodes)
+            if passo % 3 == 0 and routes.adj[u]:
+                v, _, voo = rng.choice(routes.adj[u])
+                routes.remove_flight(u, v, voo)
+            elif passo % 3 == 1 and routes.adj[u]:
+                v, _, voo = rng.choice(routes.adj[u])
+                routes.reweight_flight(u, v, voo, rng.randint(1, 9))
+            else:
+                routes.add_flight(u, rng.choice(nodes), rng.randint(1, 9), f"novo-{passo}")
+            if passo % 10 == 0:
+                routes.refresh()
+                self.assertIgualRecalculo(routes)
+
+    def test_arvores_conhecidas_nao_sao_recalculadas(self):
+        routes = DynamicRoutes(sample_graph(), ['A', 'E'])
+        de_novo = DynamicRoutes(routes.adj, ['A', 'E'], routes.trees)
+        self.assertEqual(de_novo.refresh(), [])
+        self.assertEqual(de_novo.route('A', 'D'), routes.route('A', 'D'))
+
+        so_a = DynamicRoutes(routes.adj, ['A', 'E'], {'A': routes.trees['A']})
+        self.assertIs(so_a.trees['A'], routes.trees['A'])
+        self.assertEqual(so_a.route('E', 'D'), (1, ['E', 'D'], ['ED1'], [1]))
+
+
+class TestEstado(unittest.TestCase):
+
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.pasta.name, 'voos.csv')
+        self.json_path = os.path.join(self.pasta.name, 'rotas.json')
+        self.path = caminho_estado(self.json_path)
+        for path in (self.csv_path, self.json_path):
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write('original\n')
+
+    def tearDown(self):
+        self.pasta.cleanup()
+
+    def reescrever(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('alterado\n')
+
+    def test_caminho_ao_lado_do_json(self):
+        self.assertEqual(self.path, os.path.join(self.pasta.name, 'rotas.estado.json'))
+
+    def test_ida_e_volta(self):
+        routes = DynamicRoutes(sample_graph(), ['A', 'E'])
+        routes.add_flight('E', 'F', 2.5, 'EF1')
+        routes.refresh()
+        salvar_estado(routes, self.path, self.csv_path, self.json_path)
+
+        adj, trees = carregar_estado(self.path, self.csv_path, self.json_path)
+        self.assertEqual(adj, routes.adj)
+        self.assertEqual(trees, routes.trees)
+        self.assertEqual(trees['A'][0]['F'], float('inf'))
+        self.assertFalse(os.path.exists(self.path + '.tmp'))
+
+    def test_sem_estado(self):
+        self.assertIsNone(carregar_estado(self.path, self.csv_path, self.json_path))
+
+    def test_csv_ou_json_alterado_descarta_o_estado(self):
+        routes = DynamicRoutes(sample_graph(), ['A'])
+        for path in (self.csv_path, self.json_path):
+            salvar_estado(routes, self.path, self.csv_path, self.json_path)
+            self.reescrever(path)
+            self.assertIsNone(carregar_estado(self.path, self.csv_path, self.json_path))
+
+    def test_versao_diferente_descarta_o_estado(self):
+        salvar_estado(DynamicRoutes(sample_graph(), ['A']), self.path, self.csv_path, self.json_path)
+        with open(self.path, encoding='utf-8') as f:
+            dados = json.load(f)
+        dados['versao'] = VERSAO_ESTADO + 1
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(dados, f)
+        self.assertIsNone(carregar_estado(self.path, self.csv_path, self.json_path))
+
+    def test_atualizacoes_encadeadas_igual_recalculo(self):
+        # Cada lote parte do estado gravado pelo anterior, como em execuções
+        # diárias do updates.py.
+        rng = random.Random(5)
+        nodes = [f"N{i}" for i in range(30)]
+        adj = {u: [(rng.choice(nodes), rng.randint(1, 9), f"{u}-{k}") for k in range(3)] for u in nodes}
+        routes = DynamicRoutes(copy.deepcopy(adj), nodes[:8])
+        salvar_estado(routes, self.path, self.csv_path, self.json_path)
+
+        for lote in range(4):
+            adj_salvo, trees = carregar_estado(self.path, self.csv_path, self.json_path)
+            routes = DynamicRoutes(adj_salvo, nodes[:8], trees)
+            for passo in range(15):
+                u = rng.choice(nodes)
+                if passo % 2 and routes.adj[u]:
+                    v, _, voo = rng.choice(routes.adj[u])
+                    routes.remove_flight(u, v, voo)
+                else:
+                    routes.add_flight(u, rng.choice(nodes), rng.randint(1, 9), f"lote{lote}-{passo}")
+            routes.refresh()
+            salvar_estado(routes, self.path, self.csv_path, self.json_path)
+
+        adj_salvo, trees = carregar_estado(self.path, self.csv_path, self.json_path)
+        for src in nodes[:8]:
+            fresca = dijkstra_tree(adj_salvo, src)
+            for dst in adj_salvo:
+                self.assertEqual(caminho_da_arvore(trees[src], dst), caminho_da_arvore(fresca, dst))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import gzip
+import json
+import os
+import tempfile
+import textwrap
+import unittest
+
+FORMATOS = ['json', 'jsonl']
+
+
+class JsonStreamWriter:
+    # Grava cada registro assim que ele é produzido, sem manter a lista
+    # inteira em memória. No formato 'json' padrão (indent=4) o arquivo
+    # final é idêntico ao de json.dump(lista, indent=4, ensure_ascii=False).
+    def __init__(self, path, fmt='json', compact=False, compress=False):
+        if fmt not in FORMATOS:
+            raise ValueError(f"Formato de saída desconhecido: {fmt}")
+        if fmt == 'jsonl' and path.endswith('.json'):
+            path = path[:-len('.json')] + '.jsonl'
+        if compress:
+            path += '.gz'
+
+        self.path = path
+        self.fmt = fmt
+        self.compact = compact
+        self.count = 0
+
+        if compress:
+            self._file = gzip.open(path, 'wt', encoding='utf-8')
+        else:
+            self._file = open(path, 'w', encoding='utf-8')
+
+        if fmt == 'json':
+            self._file.write('[')
+
+    def write(self, record):
+        if self.fmt == 'jsonl':
+            self._file.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')))
+            self._file.write('\n')
+        elif self.compact:
+            if self.count:
+                self._file.write(',')
+            self._file.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')))
+        else:
+            self._file.write(',\n' if self.count else '\n')
+            self._file.write(textwrap.indent(json.dumps(record, ensure_ascii=False, indent=4), '    '))
+        self.count += 1
+
+    def close(self):
+        if self._file.closed:
+            return
+        if self.fmt == 'json':
+            self._file.write('\n]' if self.count and not self.compact else ']')
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+ROTAS = [
+    {"origem": "A", "destino": "B", "caminho": ["A", "B"], "etapas": [{"voo": "V1", "duration_minutes": 5}]},
+    {"origem": "Côte", "destino": "C", "caminho": [], "etapas": []},
+]
+
+
+class TestJsonStreamWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'rotas.json')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def escrever(self, registros, **kwargs):
+        with JsonStreamWriter(self.path, **kwargs) as writer:
+            for registro in registros:
+                writer.write(registro)
+        return writer
+
+    def test_igual_ao_json_dump_indentado(self):
+        for registros in ([], ROTAS[:1], ROTAS):
+            writer = self.escrever(registros)
+            with open(writer.path, encoding='utf-8') as f:
+                self.assertEqual(f.read(), json.dumps(registros, ensure_ascii=False, indent=4))
+
+    def test_compacto(self):
+        writer = self.escrever(ROTAS, compact=True)
+        with open(writer.path, encoding='utf-8') as f:
+            self.assertEqual(json.load(f), ROTAS)
+
+    def test_jsonl_gzip(self):
+        writer = self.escrever(ROTAS, fmt='jsonl', compress=True)
+        self.assertTrue(writer.path.endswith('rotas.jsonl.gz'))
+        self.assertEqual(writer.count, 2)
+        with gzip.open(writer.path, 'rt', encoding='utf-8') as f:
+            self.assertEqual([json.loads(line) for line in f], ROTAS)
+
+
+if __name__ == '__main__':
+    unittest.main()